@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# GT4Py - GridTools4Py - GridTools for Python
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+"""Autotuning of the OIR pass configuration of stencils.
+
+The OIR passes which pay off depend on the stencil, the backend and the domain size. The
+:py:func:`autotune` function builds variants of a stencil with different ``skip_passes`` and
+``cost_model`` backend options, times them on a representative domain and stores the fastest
+configuration in the stencil cache. Later builds of the stencil with the same backend and build
+options, where neither ``skip_passes`` nor ``cost_model`` are given, use the tuned configuration.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gt4py import backend as gt_backend
+from gt4py import frontend as gt_frontend
+from gt4py import gtscript
+from gt4py import storage as gt_storage
+from gt4py.definitions import BuildOptions
+from gt4py.stencil_builder import StencilBuilder
+from gt4py.type_hints import StencilFunc
+
+
+if TYPE_CHECKING:
+    from gt4py.stencil_object import StencilObject
+
+
+#: Backend options set by the tuned configurations
+TUNED_BACKEND_OPTS = ("skip_passes", "cost_model")
+
+#: Optimization passes which are worth trying to skip
+TUNABLE_PASSES = (
+    "graph_merge_horizontal_executions",
+    "GreedyMerging",
+    "OnTheFlyMerging",
+    "MaskStmtMerging",
+    "MaskInlining",
+    "CommonSubexpressionElimination",
+    "IJCacheDetection",
+    "KCacheDetection",
+    "HorizontalTiling",
+)
+
+#: Variants of the merge cost model parameters
+TUNABLE_COST_MODELS: Tuple[Dict[str, Any], ...] = (
+    {"max_registers": None},
+    {"max_registers": 64},
+    {"byte_cost": 1.0},
+    {"byte_cost": 16.0},
+)
+
+
+def default_configurations(backend: str) -> List[Dict[str, Any]]:
+    """Return the candidate configurations: the backend defaults, one pass skipped, cost models.
+
+    Passes already skipped by default by `backend` are not tried, their configurations would
+    repeat the backend defaults.
+    """
+    default_skip = {
+        getattr(step, "__name__", str(step))
+        for step in getattr(gt_backend.from_name(backend), "DEFAULT_SKIP_PASSES", ())
+    }
+    configurations: List[Dict[str, Any]] = [{"skip_passes": [], "cost_model": {}}]
+    configurations.extend(
+        {"skip_passes": [name], "cost_model": {}}
+        for name in TUNABLE_PASSES
+        if name not in default_skip
+    )
+    configurations.extend(
+        {"skip_passes": [], "cost_model": dict(cost_model)} for cost_model in TUNABLE_COST_MODELS
+    )
+    return configurations
+
+
+def _make_arguments(
+    stencil: "StencilObject", backend: str, domain: Tuple[int, ...]
+) -> Dict[str, Any]:
+    """Allocate random fields covering `domain` and its halo, parameters are set to 1."""
+    rng = np.random.default_rng(0)
+    arguments: Dict[str, Any] = {}
+    for name, info in stencil.field_info.items():
+        if info is None:
+            arguments[name] = None
+            continue
+        lower = [b[0] for b, m in zip(info.boundary, info.domain_mask) if m]
+        upper = [b[1] for b, m in zip(info.boundary, info.domain_mask) if m]
+        size = [d for d, m in zip(domain, info.domain_mask) if m]
+        shape = tuple(lo + s + up for lo, s, up in zip(lower, size, upper))
+        data = rng.random(shape + tuple(info.data_dims))
+        if info.dtype.kind in "iub":
+            # Integers may be used as variable offsets, any other value could access out of bounds
+            data = np.zeros_like(data)
+        arguments[name] = gt_storage.from_array(
+            data.astype(info.dtype),
+            backend=backend,
+            default_origin=tuple(lower),
+            shape=shape,
+            dtype=(info.dtype, info.data_dims) if info.data_dims else info.dtype,
+            mask=info.domain_mask,
+        )
+    for name, parameter_info in stencil.parameter_info.items():
+        arguments[name] = None if parameter_info is None else parameter_info.dtype.type(1)
+    return arguments
+
+
+def _run_time(
+    stencil: "StencilObject", arguments: Dict[str, Any], domain: Tuple[int, ...], repeat: int
+) -> float:
+    """Return the shortest run time of `repeat` calls, after a first warm-up call."""
+    run_times = []
+    for _ in range(repeat + 1):
+        exec_info: Dict[str, Any] = {}
+        stencil(**arguments, domain=domain, exec_info=exec_info)
+        run_times.append(exec_info["run_end_time"] - exec_info["run_start_time"])
+    return min(run_times[1:])
+
+
+def autotune(
+    definition: StencilFunc,
+    backend: str,
+    *,
+    domain: Sequence[int],
+    configurations: Optional[Sequence[Dict[str, Any]]] = None,
+    arguments: Optional[Dict[str, Any]] = None,
+    repeat: int = 3,
+    externals: Optional[Dict[str, Any]] = None,
+    name: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Find the fastest OIR pass configuration of a stencil and store it in the stencil cache.
+
+    Parameters
+    ----------
+        definition : `function`
+            Function object defining the stencil.
+
+        backend : `str`
+            Name of the implementation backend, must support the ``skip_passes`` and
+            ``cost_model`` options.
+
+        domain : `Sequence[int]`
+            Representative domain the variants are timed on.
+
+        configurations : `Sequence[dict]`, optional
+            Candidate values of the ``skip_passes`` and ``cost_model`` backend options
+            (:py:func:`default_configurations` by default).
+
+        arguments : `dict`, optional
+            Stencil arguments the variants are called with. By default fields are allocated to
+            cover `domain` with random floating point values and zero integers, parameters are 1.
+
+        repeat : `int`, optional
+            Number of timed calls of each variant, the shortest run time is used.
+
+        externals : `dict`, optional
+            Specify values for otherwise unbound symbols.
+
+        name : `str`, optional
+            The fully qualified name of the stencil, as given to :py:func:`gtscript.stencil`.
+
+        **kwargs: `dict`, optional
+            Other backend options the stencil is built with.
+
+    Returns
+    -------
+        `dict`
+            The tuning info stored in the cache: the ``domain``, the tuned ``backend_opts`` and the
+            ``run_times`` of all configurations.
+
+    Raises
+    -------
+        ValueError
+            If the backend does not support the tuned options or options are inconsistent.
+    """
+    backend_cls = gt_backend.from_name(backend)
+    if backend_cls is None:
+        raise ValueError(f"Unknown backend name ({backend})")
+    if not set(TUNED_BACKEND_OPTS) <= set(backend_cls.options):
+        raise ValueError(f"Backend '{backend}' does not support the tuned options.")
+    if set(TUNED_BACKEND_OPTS) & set(kwargs):
+        raise ValueError(f"Tuned options ({', '.join(TUNED_BACKEND_OPTS)}) can not be given.")
+
+    name = name or f"{definition.__module__}.{definition.__name__}"
+    domain = tuple(domain)
+    configurations = default_configurations(backend) if configurations is None else configurations
+
+    run_times: List[Tuple[Dict[str, Any], float]] = []
+    for configuration in configurations:
+        stencil = gtscript.stencil(
+            backend,
+            definition,
+            externals=externals,
+            name=name,
+            **kwargs,
+            **configuration,
+        )
+        if arguments is None:
+            arguments = _make_arguments(stencil, backend, domain)
+        run_times.append((configuration, _run_time(stencil, arguments, domain, repeat)))
+
+    module, _, stencil_name = name.rpartition(".")
+    builder = StencilBuilder(
+        definition,
+        backend=backend_cls,
+        # mypy attribkwclass bug
+        options=BuildOptions(name=stencil_name, module=module, backend_opts=kwargs),  # type: ignore
+        frontend=gt_frontend.from_name("gtscript"),
+    ).with_externals(externals or {})
+    tuning_info = {
+        "domain": domain,
+        "backend_opts": min(run_times, key=lambda item: item[1])[0],
+        "run_times": run_times,
+    }
+    builder.caching.update_tuning_info(tuning_info)
+    return tuning_info
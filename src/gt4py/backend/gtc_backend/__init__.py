@@ -20,6 +20,12 @@ from .gtcnumpy.backend import GTCNumpyBackend
 from .gtcpp.backend import GTCGTCpuIfirstBackend, GTCGTCpuKfirstBackend, GTCGTGpuBackend
 
 
+try:
+    from .gtcnumba.backend import GTCNumbaBackend  # noqa: F401
+except ImportError:
+    pass  # numba not installed
+
+
 __all__ = [
     "GTCCudaBackend",
     "GTCDaceBackend",
@@ -15,10 +15,81 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 
-from typing import Tuple
+import dataclasses
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 import gtc.utils as gtc_utils
 from eve.codegen import MakoTemplate as as_mako
+from gt4py import ir as gt_ir
+from gtc.common import DataType, NativeFunction
+
+
+if TYPE_CHECKING:
+    from gt4py.definitions import BuildOptions
+    from gtc.passes.oir_optimizations.cost_model import CostModel
+    from gtc.passes.oir_pipeline import PASS_T
+
+
+GTC_BACKEND_OPTS = {
+    "compute_dtype": {"versioning": True, "type": str},
+    "skip_passes": {"versioning": True, "type": list},
+    "cost_model": {"versioning": True, "type": dict},
+}
+
+
+def compute_dtype_from_options(options: "BuildOptions") -> Optional[DataType]:
+    """Return the dtype of the computations requested with the `compute_dtype` backend option."""
+    value = options.backend_opts.get("compute_dtype", None)
+    if value is None:
+        return None
+    return DataType(int(gt_ir.DataType.from_dtype(np.dtype(value)).value))
+
+
+def oir_skip_from_options(
+    options: "BuildOptions", steps: Sequence["PASS_T"], default: Sequence["PASS_T"] = ()
+) -> List["PASS_T"]:
+    """Return the OIR passes to skip: `default` plus the passes in the `skip_passes` backend option.
+
+    Passes in the option are given by name (e.g. ``"GreedyMerging"``) or as the pass itself and
+    must be one of the pipeline `steps`.
+    """
+    skip = list(default)
+    steps_by_name = {getattr(step, "__name__", str(step)): step for step in steps}
+    for item in options.backend_opts.get("skip_passes", ()):
+        if isinstance(item, str):
+            if item not in steps_by_name:
+                raise ValueError(
+                    f"Unknown OIR pass '{item}' in 'skip_passes' "
+                    f"(valid passes: {', '.join(steps_by_name)})."
+                )
+            item = steps_by_name[item]
+        if item not in skip:
+            skip.append(item)
+    return skip
+
+
+def oir_cost_model_from_options(options: "BuildOptions", default: "CostModel") -> "CostModel":
+    """Return `default` updated with the parameters in the `cost_model` backend option.
+
+    Native function costs are given by function name (e.g. ``{"function_costs": {"sin": 20}}``)
+    and are added to the costs of `default`.
+    """
+    value = dict(options.backend_opts.get("cost_model", {}))
+    valid_keys = {field.name for field in dataclasses.fields(default)}
+    unknown_keys = set(value) - valid_keys
+    if unknown_keys:
+        raise ValueError(
+            f"Unknown parameters {', '.join(sorted(unknown_keys))} in 'cost_model' "
+            f"(valid parameters: {', '.join(sorted(valid_keys))})."
+        )
+    if "function_costs" in value:
+        value["function_costs"] = {
+            **default.function_costs,
+            **{NativeFunction(func): cost for func, cost in value["function_costs"].items()},
+        }
+    return dataclasses.replace(default, **value)
 
 
 def _get_unit_stride_dim(backend, domain_dim_flags, data_ndim):
@@ -26,7 +26,14 @@ from gt4py.backend.gt_backends import (
     cuda_is_compatible_type,
     make_cuda_layout_map,
 )
-from gt4py.backend.gtc_backend.common import bindings_main_template, pybuffer_to_sid
+from gt4py.backend.gtc_backend.common import (
+    GTC_BACKEND_OPTS,
+    bindings_main_template,
+    compute_dtype_from_options,
+    oir_cost_model_from_options,
+    oir_skip_from_options,
+    pybuffer_to_sid,
+)
 from gt4py.backend.gtc_backend.defir_to_gtir import DefIRToGTIR
 from gtc import gtir_to_oir
 from gtc.common import DataType
@@ -36,7 +43,11 @@ from gtc.passes.oir_dace_optimizations.horizontal_execution_merging import (
     graph_merge_horizontal_executions,
 )
 from gtc.passes.oir_optimizations.caches import KCacheDetection
+from gtc.passes.oir_optimizations.cost_model import GPU_COST_MODEL
 from gtc.passes.oir_optimizations.pruning import NoFieldAccessPruning
+from gtc.passes.oir_optimizations.temporaries import TemporariesToPlanes
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+from gtc.passes.oir_optimizations.vertical_loop_merging import VerticalLoopFusion
 from gtc.passes.oir_pipeline import OirPipeline
 
 
@@ -51,9 +62,34 @@ class GTCCudaExtGenerator:
         self.backend = backend
 
     def __call__(self, definition_ir) -> Dict[str, Dict[str, str]]:
-        gtir = GtirPipeline(DefIRToGTIR.apply(definition_ir)).full()
-        oir = OirPipeline(gtir_to_oir.GTIRToOIR().visit(gtir)).full(
-            skip=[graph_merge_horizontal_executions, KCacheDetection, NoFieldAccessPruning]
+        gtir = GtirPipeline(
+            DefIRToGTIR.apply(definition_ir),
+            compute_dtype=compute_dtype_from_options(self.backend.builder.options),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        ).full()
+        oir_pipeline = OirPipeline(
+            gtir_to_oir.GTIRToOIR().visit(gtir),
+            cost_model=oir_cost_model_from_options(
+                self.backend.builder.options, self.backend.DEFAULT_COST_MODEL
+            ),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        )
+        oir = oir_pipeline.full(
+            skip=oir_skip_from_options(
+                self.backend.builder.options,
+                oir_pipeline.steps(),
+                default=[
+                    graph_merge_horizontal_executions,
+                    KCacheDetection,
+                    NoFieldAccessPruning,
+                    HorizontalTiling,
+                    # Temporaries are allocated over the full K domain
+                    TemporariesToPlanes,
+                    VerticalLoopFusion,
+                ],
+            )
         )
         cuir = oir_to_cuir.OIRToCUIR().visit(oir)
         cuir = kernel_fusion.FuseKernels().visit(cuir)
@@ -133,7 +169,12 @@ class GTCCudaBackend(BaseGTBackend, CLIBackendMixin):
     """CUDA backend using gtc."""
 
     name = "gtc:cuda"
-    options = {**BaseGTBackend.GT_BACKEND_OPTS, "device_sync": {"versioning": True, "type": bool}}
+    DEFAULT_COST_MODEL = GPU_COST_MODEL
+    options = {
+        **BaseGTBackend.GT_BACKEND_OPTS,
+        **GTC_BACKEND_OPTS,
+        "device_sync": {"versioning": True, "type": bool},
+    }
     languages = {"computation": "cuda", "bindings": ["python"]}
     storage_info = {
         "alignment": 32,
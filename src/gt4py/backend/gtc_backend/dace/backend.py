@@ -24,7 +24,14 @@ from gt4py import backend as gt_backend
 from gt4py import gt_src_manager
 from gt4py.backend import BaseGTBackend, CLIBackendMixin
 from gt4py.backend.gt_backends import make_x86_layout_map, x86_is_compatible_layout
-from gt4py.backend.gtc_backend.common import bindings_main_template, pybuffer_to_sid
+from gt4py.backend.gtc_backend.common import (
+    GTC_BACKEND_OPTS,
+    bindings_main_template,
+    compute_dtype_from_options,
+    oir_cost_model_from_options,
+    oir_skip_from_options,
+    pybuffer_to_sid,
+)
 from gt4py.backend.gtc_backend.defir_to_gtir import DefIRToGTIR
 from gt4py.backend.module_generator import compute_legacy_extents
 from gt4py.ir import StencilDefinition
@@ -33,8 +40,12 @@ from gtc.dace.oir_to_dace import OirSDFGBuilder
 from gtc.dace.utils import array_dimensions
 from gtc.passes.gtir_pipeline import GtirPipeline
 from gtc.passes.oir_optimizations.caches import FillFlushToLocalKCaches
+from gtc.passes.oir_optimizations.cost_model import CPU_COST_MODEL
 from gtc.passes.oir_optimizations.inlining import MaskInlining
 from gtc.passes.oir_optimizations.mask_stmt_merging import MaskStmtMerging
+from gtc.passes.oir_optimizations.temporaries import TemporariesToPlanes
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+from gtc.passes.oir_optimizations.vertical_loop_merging import VerticalLoopFusion
 from gtc.passes.oir_pipeline import OirPipeline
 
 
@@ -49,13 +60,34 @@ class GTCDaCeExtGenerator:
         self.backend = backend
 
     def __call__(self, definition_ir: StencilDefinition) -> Dict[str, Dict[str, str]]:
-        gtir = GtirPipeline(DefIRToGTIR.apply(definition_ir)).full()
-        oir = OirPipeline(gtir_to_oir.GTIRToOIR().visit(gtir)).full(
-            skip=[
-                MaskStmtMerging,
-                MaskInlining,
-                FillFlushToLocalKCaches,
-            ]
+        gtir = GtirPipeline(
+            DefIRToGTIR.apply(definition_ir),
+            compute_dtype=compute_dtype_from_options(self.backend.builder.options),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        ).full()
+        oir_pipeline = OirPipeline(
+            gtir_to_oir.GTIRToOIR().visit(gtir),
+            cost_model=oir_cost_model_from_options(
+                self.backend.builder.options, self.backend.DEFAULT_COST_MODEL
+            ),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        )
+        oir = oir_pipeline.full(
+            skip=oir_skip_from_options(
+                self.backend.builder.options,
+                oir_pipeline.steps(),
+                default=[
+                    MaskStmtMerging,
+                    MaskInlining,
+                    FillFlushToLocalKCaches,
+                    HorizontalTiling,
+                    # Temporaries are allocated over the full K domain
+                    TemporariesToPlanes,
+                    VerticalLoopFusion,
+                ],
+            )
         )
         sdfg = OirSDFGBuilder().visit(oir)
         sdfg.expand_library_nodes(recursive=True)
@@ -280,6 +312,7 @@ class GTCDaceBackend(BaseGTBackend, CLIBackendMixin):
 
     name = "gtc:dace"
     GT_BACKEND_T = "dace"
+    DEFAULT_COST_MODEL = CPU_COST_MODEL
     languages = {"computation": "c++", "bindings": ["python"]}
     storage_info = {
         "alignment": 1,
@@ -289,7 +322,7 @@ class GTCDaceBackend(BaseGTBackend, CLIBackendMixin):
         "is_compatible_type": x86_is_compatible_layout,
     }
 
-    options = BaseGTBackend.GT_BACKEND_OPTS
+    options = {**BaseGTBackend.GT_BACKEND_OPTS, **GTC_BACKEND_OPTS}
     PYEXT_GENERATOR_CLASS = GTCDaCeExtGenerator  # type: ignore
     USE_LEGACY_TOOLCHAIN = False
 
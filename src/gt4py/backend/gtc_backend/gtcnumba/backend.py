@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# GT4Py - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Type, Union
+
+import numba  # noqa: F401  # the backend is only registered if numba is installed
+
+from eve.codegen import format_source
+from gt4py.backend.base import BaseBackend, CLIBackendMixin, register
+from gt4py.backend.debug_backend import (
+    debug_is_compatible_layout,
+    debug_is_compatible_type,
+    debug_layout,
+)
+from gt4py.backend.gtc_backend.common import (
+    GTC_BACKEND_OPTS,
+    oir_cost_model_from_options,
+    oir_skip_from_options,
+)
+from gt4py.backend.gtc_backend.gtcnumpy.backend import GTCModuleGenerator, recursive_write
+from gtc import oir
+from gtc.gtir_to_oir import GTIRToOIR
+from gtc.numba.numba_codegen import NumbaCodegen
+from gtc.passes.oir_dace_optimizations.horizontal_execution_merging import (
+    graph_merge_horizontal_executions,
+)
+from gtc.passes.oir_optimizations.cost_model import CPU_COST_MODEL
+from gtc.passes.oir_pipeline import OirPipeline
+
+
+if TYPE_CHECKING:
+    from gt4py.stencil_object import StencilObject
+
+
+@register
+class GTCNumbaBackend(BaseBackend, CLIBackendMixin):
+    """Numba backend using gtc, compiling explicit loop nests of the OIR stencil."""
+
+    name = "gtc:numba"
+    options: ClassVar[Dict[str, Any]] = {**GTC_BACKEND_OPTS}
+    storage_info = {
+        "alignment": 1,
+        "device": "cpu",
+        "layout_map": debug_layout,
+        "is_compatible_layout": debug_is_compatible_layout,
+        "is_compatible_type": debug_is_compatible_type,
+    }
+    languages = {"computation": "python", "bindings": ["python"]}
+    MODULE_GENERATOR_CLASS = GTCModuleGenerator
+    USE_LEGACY_TOOLCHAIN = False
+    GTIR_KEY = "gtc:gtir"
+    DEFAULT_SKIP_PASSES = (graph_merge_horizontal_executions,)
+    DEFAULT_COST_MODEL = CPU_COST_MODEL
+
+    def generate_computation(self) -> Dict[str, Union[str, Dict]]:
+        computation_name = (
+            self.builder.caching.module_prefix
+            + "computation"
+            + self.builder.caching.module_postfix
+            + ".py"
+        )
+        return {computation_name: format_source("python", NumbaCodegen.apply(self.oir))}
+
+    def generate_bindings(self, language_name: str) -> Dict[str, Union[str, Dict]]:
+        super().generate_bindings(language_name)
+        return {self.builder.module_path.name: self.make_module_source()}
+
+    def generate(self) -> Type["StencilObject"]:
+        self.check_options(self.builder.options)
+        src_dir = self.builder.module_path.parent
+        if not self.builder.options._impl_opts.get("disable-code-generation", False):
+            src_dir.mkdir(parents=True, exist_ok=True)
+            recursive_write(src_dir, self.generate_computation())
+        return self.make_module()
+
+    def _make_oir(self) -> oir.Stencil:
+        pipeline = OirPipeline(
+            GTIRToOIR().visit(self.builder.gtir),
+            cost_model=oir_cost_model_from_options(self.builder.options, self.DEFAULT_COST_MODEL),
+            pass_cache=self.builder.pass_cache,
+            instrumentation=self.builder.pass_instrumentation,
+        )
+        return pipeline.full(
+            skip=oir_skip_from_options(
+                self.builder.options, pipeline.steps(), default=self.DEFAULT_SKIP_PASSES
+            )
+        )
+
+    @property
+    def oir(self) -> oir.Stencil:
+        key = "gtcnumba:oir"
+        if key not in self.builder.backend_data:
+            self.builder.with_backend_data({key: self._make_oir()})
+        return self.builder.backend_data[key]
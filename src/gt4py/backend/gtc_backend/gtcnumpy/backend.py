@@ -18,18 +18,45 @@ import pathlib
 from typing import TYPE_CHECKING, Any, ClassVar, Dict, Type, Union, cast
 
 from eve.codegen import format_source
-from gt4py.backend.base import BaseBackend, BaseModuleGenerator, CLIBackendMixin, register
+from gt4py import utils as gt_utils
+from gt4py.backend import pyext_builder
+from gt4py.backend.base import BaseModuleGenerator, BasePyExtBackend, CLIBackendMixin, register
 from gt4py.backend.debug_backend import (
     debug_is_compatible_layout,
     debug_is_compatible_type,
     debug_layout,
 )
+from gt4py.backend.gtc_backend.common import (
+    GTC_BACKEND_OPTS,
+    oir_cost_model_from_options,
+    oir_skip_from_options,
+)
+from gtc import oir
 from gtc.gtir_to_oir import GTIRToOIR
-from gtc.passes.gtir_legacy_extents import compute_legacy_extents
+from gtc.passes.oir_dace_optimizations.horizontal_execution_merging import (
+    graph_merge_horizontal_executions,
+)
+from gtc.passes.oir_optimizations.caches import (
+    FillFlushToLocalKCaches,
+    IJCacheDetection,
+    KCacheDetection,
+    PruneKCacheFills,
+    PruneKCacheFlushes,
+)
+from gtc.passes.oir_optimizations.cost_model import CPU_COST_MODEL
+from gtc.passes.oir_optimizations.horizontal_execution_merging import OnTheFlyMerging
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+from gtc.passes.oir_optimizations.utils import compute_extents
+from gtc.passes.oir_optimizations.vertical_loop_merging import VerticalLoopFusion
 from gtc.passes.oir_pipeline import OirPipeline
 from gtc.python import npir
+from gtc.python.array_api_gen import ArrayApiGen
 from gtc.python.npir_gen import NpirGen
 from gtc.python.oir_to_npir import OirToNpir
+from gtc.python.scratch_buffers import SplitUfuncExpressions
+from gtc.python.sequential_kernels import SequentialKernelGen, has_kernels
+from gtc.python.sequential_passes import VectorizeSequentialPasses
+from gtc.python.temporary_buffers import AllocateTemporaryBuffers
 
 
 if TYPE_CHECKING:
@@ -47,6 +74,7 @@ class GTCModuleGenerator(BaseModuleGenerator):
                 "import sys",
                 "import pathlib",
                 "import numpy",
+                *(["import array_api_compat"] if self.array_api else []),
                 "path_backup = sys.path.copy()",
                 "sys.path.append(str(pathlib.Path(__file__).parent))",
                 f"import {comp_pkg} as computation",
@@ -55,6 +83,18 @@ class GTCModuleGenerator(BaseModuleGenerator):
             ]
         )
 
+    def generate_class_members(self) -> str:
+        if not self.array_api:
+            return super().generate_class_members()
+        # Fields may be arrays of any array API library, not only NumPy arrays
+        return "\n".join(
+            [
+                "",
+                "def _is_compatible_type(self, field):",
+                "    return array_api_compat.is_array_api_obj(field)",
+            ]
+        )
+
     def generate_implementation(self) -> str:
         params = [f"{p.name}={p.name}" for p in self.builder.gtir.params]
         params.extend(["_domain_=_domain_", "_origin_=_origin_"])
@@ -64,6 +104,11 @@ class GTCModuleGenerator(BaseModuleGenerator):
     def backend(self) -> "GTCNumpyBackend":
         return cast(GTCNumpyBackend, self.builder.backend)
 
+    @property
+    def array_api(self) -> bool:
+        # The module generator is shared with backends without the `array_api` option
+        return self.builder.options.backend_opts.get("array_api", False)
+
 
 def recursive_write(root_path: pathlib.Path, tree: Dict[str, Union[str, dict]]):
     root_path.mkdir(parents=True, exist_ok=True)
@@ -76,11 +121,32 @@ def recursive_write(root_path: pathlib.Path, tree: Dict[str, Union[str, dict]]):
 
 
 @register
-class GTCNumpyBackend(BaseBackend, CLIBackendMixin):
-    """NumPy backend using gtc."""
+class GTCNumpyBackend(BasePyExtBackend, CLIBackendMixin):
+    """
+    NumPy backend using gtc.
+
+    With the `compile_sequential_passes` option, the forward and backward vertical passes which
+    cannot be vectorized are computed by a small C++ extension instead (see
+    :class:`SequentialKernelGen`), parallel passes stay in NumPy.
+
+    With `num_threads` greater than one, stencils whose tiles do not depend on each other (see
+    :func:`is_tileable`) split the horizontal domain into one tile per thread and compute the
+    tiles on a thread pool, NumPy releases the GIL inside the ufuncs.
+
+    With `array_api`, the computation is generated against the array API namespace of the fields
+    (see :class:`ArrayApiGen`) and runs on any conforming array library with mutable arrays. This
+    requires the `array-api-compat` package and leaves out the NumPy specific optimizations.
+    """
 
     name = "gtc:numpy"
-    options: ClassVar[Dict[str, Any]] = {}
+    options: ClassVar[Dict[str, Any]] = {
+        **GTC_BACKEND_OPTS,
+        "compile_sequential_passes": {"versioning": True, "type": bool},
+        "debug_mode": {"versioning": True, "type": bool},
+        "num_threads": {"versioning": True, "type": int},
+        "array_api": {"versioning": True, "type": bool},
+        "verbose": {"versioning": False, "type": bool},
+    }
     storage_info = {
         "alignment": 1,
         "device": "cpu",
@@ -92,6 +158,39 @@ class GTCNumpyBackend(BaseBackend, CLIBackendMixin):
     MODULE_GENERATOR_CLASS = GTCModuleGenerator
     USE_LEGACY_TOOLCHAIN = False
     GTIR_KEY = "gtc:gtir"
+    # Vectorized code has no use for caches or tiles, `OnTheFlyMerging` trades temporaries for
+    # redundant whole-array computations, `VerticalLoopFusion` trades K-vectorized parallel loops
+    # for loops over levels
+    DEFAULT_SKIP_PASSES = (
+        graph_merge_horizontal_executions,
+        OnTheFlyMerging,
+        IJCacheDetection,
+        KCacheDetection,
+        PruneKCacheFills,
+        PruneKCacheFlushes,
+        FillFlushToLocalKCaches,
+        HorizontalTiling,
+        VerticalLoopFusion,
+    )
+    DEFAULT_COST_MODEL = CPU_COST_MODEL
+
+    @property
+    def array_api(self) -> bool:
+        return self.builder.options.backend_opts.get("array_api", False)
+
+    @property
+    def compiles_kernels(self) -> bool:
+        return (
+            self.builder.options.backend_opts.get("compile_sequential_passes", False)
+            and not self.array_api
+            and has_kernels(self.npir)
+        )
+
+    @property
+    def kernels_module_name(self) -> str:
+        if self.builder.stencil_id:
+            return self.pyext_module_name
+        return f"{self.builder.options.name}_pyext"
 
     def generate_computation(self) -> Dict[str, Union[str, Dict]]:
         computation_name = (
@@ -100,12 +199,24 @@ class GTCNumpyBackend(BaseBackend, CLIBackendMixin):
             + self.builder.caching.module_postfix
             + ".py"
         )
-        return {
+        field_extents = compute_extents(self.oir)[0]
+        kernels_module = self.kernels_module_name if self.compiles_kernels else None
+        sources: Dict[str, Union[str, Dict]] = {
             computation_name: format_source(
                 "python",
-                NpirGen.apply(self.npir, field_extents=compute_legacy_extents(self.builder.gtir)),
+                (ArrayApiGen if self.array_api else NpirGen).apply(
+                    self.npir,
+                    field_extents=field_extents,
+                    kernels_module=kernels_module,
+                    num_threads=self.builder.options.backend_opts.get("num_threads", None),
+                ),
             ),
         }
+        if kernels_module is not None:
+            sources[f"{kernels_module}.cpp"] = SequentialKernelGen.apply(
+                self.npir, module_name=kernels_module, field_extents=field_extents
+            )
+        return sources
 
     def generate_bindings(self, language_name: str) -> Dict[str, Union[str, Dict]]:
         super().generate_bindings(language_name)
@@ -114,16 +225,54 @@ class GTCNumpyBackend(BaseBackend, CLIBackendMixin):
     def generate(self) -> Type["StencilObject"]:
         self.check_options(self.builder.options)
         src_dir = self.builder.module_path.parent
+        kernels_source = f"{self.kernels_module_name}.cpp"
         if not self.builder.options._impl_opts.get("disable-code-generation", False):
             src_dir.mkdir(parents=True, exist_ok=True)
-            recursive_write(src_dir, self.generate_computation())
+            sources = self.generate_computation()
+            kernels_sources = {kernels_source: sources.pop(kernels_source, gt_utils.NOTHING)}
+            recursive_write(src_dir, sources)
+        else:
+            kernels_sources = {kernels_source: gt_utils.NOTHING}
+        if self.compiles_kernels:
+            pyext_opts: Dict[str, Any] = {
+                "verbose": self.builder.options.backend_opts.get("verbose", False),
+                **pyext_builder.get_gt_pyext_build_opts(
+                    debug_mode=self.builder.options.backend_opts.get("debug_mode", False),
+                    uses_openmp=False,
+                ),
+            }
+            self.build_extension_module(kernels_sources, pyext_opts)
         return self.make_module()
 
-    def _make_npir(self) -> npir.Computation:
-        return OirToNpir().visit(
-            # TODO (ricoh) apply optimizations, skip only the ones that fail
-            OirPipeline(GTIRToOIR().visit(self.builder.gtir)).apply([])
+    def _make_oir(self) -> oir.Stencil:
+        pipeline = OirPipeline(
+            GTIRToOIR().visit(self.builder.gtir),
+            cost_model=oir_cost_model_from_options(self.builder.options, self.DEFAULT_COST_MODEL),
+            pass_cache=self.builder.pass_cache,
+            instrumentation=self.builder.pass_instrumentation,
         )
+        return pipeline.full(
+            skip=oir_skip_from_options(
+                self.builder.options, pipeline.steps(), default=self.DEFAULT_SKIP_PASSES
+            )
+        )
+
+    def _make_npir(self) -> npir.Computation:
+        field_extents, block_extents = compute_extents(self.oir)
+        computation = OirToNpir().visit(self.oir, block_extents=block_extents)
+        if self.array_api:
+            # Accumulations, cached buffers and `out=` arguments are specific to NumPy
+            return computation
+        computation = VectorizeSequentialPasses().visit(computation)
+        computation = AllocateTemporaryBuffers().visit(computation, field_extents=field_extents)
+        return SplitUfuncExpressions().visit(computation)
+
+    @property
+    def oir(self) -> oir.Stencil:
+        key = "gtcnumpy:oir"
+        if key not in self.builder.backend_data:
+            self.builder.with_backend_data({key: self._make_oir()})
+        return self.builder.backend_data[key]
 
     @property
     def npir(self) -> npir.Computation:
@@ -31,7 +31,14 @@ from gt4py.backend.gt_backends import (
     mc_is_compatible_layout,
     x86_is_compatible_layout,
 )
-from gt4py.backend.gtc_backend.common import bindings_main_template, pybuffer_to_sid
+from gt4py.backend.gtc_backend.common import (
+    GTC_BACKEND_OPTS,
+    bindings_main_template,
+    compute_dtype_from_options,
+    oir_cost_model_from_options,
+    oir_skip_from_options,
+    pybuffer_to_sid,
+)
 from gt4py.backend.gtc_backend.defir_to_gtir import DefIRToGTIR
 from gtc import gtir_to_oir
 from gtc.common import DataType
@@ -41,6 +48,10 @@ from gtc.passes.oir_dace_optimizations.horizontal_execution_merging import (
     graph_merge_horizontal_executions,
 )
 from gtc.passes.oir_optimizations.caches import FillFlushToLocalKCaches, KCacheDetection
+from gtc.passes.oir_optimizations.cost_model import CPU_COST_MODEL, GPU_COST_MODEL
+from gtc.passes.oir_optimizations.temporaries import TemporariesToPlanes
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+from gtc.passes.oir_optimizations.vertical_loop_merging import VerticalLoopFusion
 from gtc.passes.oir_pipeline import OirPipeline
 
 
@@ -55,13 +66,35 @@ class GTCGTExtGenerator:
         self.backend = backend
 
     def __call__(self, definition_ir) -> Dict[str, Dict[str, str]]:
-        gtir = GtirPipeline(DefIRToGTIR.apply(definition_ir)).full()
-        oir = OirPipeline(gtir_to_oir.GTIRToOIR().visit(gtir)).full(
-            skip=[
-                graph_merge_horizontal_executions,
-                KCacheDetection,
-                FillFlushToLocalKCaches,
-            ]
+        gtir = GtirPipeline(
+            DefIRToGTIR.apply(definition_ir),
+            compute_dtype=compute_dtype_from_options(self.backend.builder.options),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        ).full()
+        oir_pipeline = OirPipeline(
+            gtir_to_oir.GTIRToOIR().visit(gtir),
+            cost_model=oir_cost_model_from_options(
+                self.backend.builder.options, self.backend.DEFAULT_COST_MODEL
+            ),
+            pass_cache=self.backend.builder.pass_cache,
+            instrumentation=self.backend.builder.pass_instrumentation,
+        )
+        oir = oir_pipeline.full(
+            skip=oir_skip_from_options(
+                self.backend.builder.options,
+                oir_pipeline.steps(),
+                default=[
+                    graph_merge_horizontal_executions,
+                    KCacheDetection,
+                    FillFlushToLocalKCaches,
+                    HorizontalTiling,
+                    # Temporaries are allocated over the full K domain
+                    TemporariesToPlanes,
+                    # Sequential loops are not parallelized along K on GPUs
+                    *([VerticalLoopFusion] if self.backend.GT_BACKEND_T == "gpu" else []),
+                ],
+            )
         )
         gtcpp = oir_to_gtcpp.OIRToGTCpp().visit(oir)
         implementation = gtcpp_codegen.GTCppCodegen.apply(
@@ -137,9 +170,10 @@ class GTCppBindingsCodegen(codegen.TemplatedGenerator):
 
 
 class GTCGTBaseBackend(BaseGTBackend, CLIBackendMixin):
-    options = BaseGTBackend.GT_BACKEND_OPTS
+    options = {**BaseGTBackend.GT_BACKEND_OPTS, **GTC_BACKEND_OPTS}
     PYEXT_GENERATOR_CLASS = GTCGTExtGenerator  # type: ignore
     USE_LEGACY_TOOLCHAIN = False
+    DEFAULT_COST_MODEL = CPU_COST_MODEL
 
     def _generate_extension(self, uses_cuda: bool) -> Tuple[str, str]:
         return self.make_extension(gt_version=2, ir=self.builder.definition_ir, uses_cuda=uses_cuda)
@@ -210,7 +244,12 @@ class GTCGTGpuBackend(GTCGTBaseBackend):
     name = "gtc:gt:gpu"
     GT_BACKEND_T = "gpu"
     languages = {"computation": "cuda", "bindings": ["python"]}
-    options = {**BaseGTBackend.GT_BACKEND_OPTS, "device_sync": {"versioning": True, "type": bool}}
+    DEFAULT_COST_MODEL = GPU_COST_MODEL
+    options = {
+        **BaseGTBackend.GT_BACKEND_OPTS,
+        **GTC_BACKEND_OPTS,
+        "device_sync": {"versioning": True, "type": bool},
+    }
     storage_info = {
         "alignment": 32,
         "device": "gpu",
@@ -108,8 +108,13 @@ def get_unused_params_from_gtir(
     field_names = {
         param.name for param in node.params if isinstance(param, (gtir.FieldDecl, gtir.ScalarDecl))
     }
+    # Parameters can become unused by the pipeline, e.g. when only read in a pruned branch
     used_field_names = (
-        node.iter_tree().if_isinstance(gtir.FieldAccess, gtir.ScalarAccess).getattr("name").to_set()
+        pipeline.full()
+        .iter_tree()
+        .if_isinstance(gtir.FieldAccess, gtir.ScalarAccess)
+        .getattr("name")
+        .to_set()
     )
     return [
         param for param in node.params if param.name in field_names.difference(used_field_names)
@@ -110,27 +110,21 @@ class NumPySourceGenerator(PythonSourceGenerator):
         ]
         parallel_axes_dims = [self.impl_node.domain.index(axis) for axis in parallel_axes_names]
 
-        args = []
+        starts = []
+        stops = []
         for fd, d in enumerate(parallel_axes_dims):
             start_expr = " {:+d}".format(lower_extent[d]) if lower_extent[d] != 0 else ""
             size_expr = "{dom}[{d}]".format(dom=self.domain_arg_name, d=d)
             size_expr += " {:+d}".format(upper_extent[d]) if upper_extent[d] != 0 else ""
-            arange = "np.arange({name}{marker}[{fd}]{start}, {name}{marker}[{fd}] + {size})".format(
-                name=name,
-                start=start_expr,
-                marker=self.origin_marker,
-                fd=fd,
-                size=size_expr,
-            )
-            args.append(
-                f"{arange}["
-                + ", ".join(":" if fd == i else "None" for i in range(len(parallel_axes_dims)))
-                + "]"
-            )
+            origin = "{name}{marker}[{fd}]".format(name=name, marker=self.origin_marker, fd=fd)
+            starts.append(f"{origin}{start_expr}")
+            stops.append(f"{origin} + {size_expr}")
 
         ret_vals = ", ".join([f"{axis_name.upper()}_{name}" for axis_name in parallel_axes_names])
 
-        return f"{ret_vals} = {self.numpy_prefix}.broadcast_arrays({', '.join(args)})"
+        # The index arrays only depend on the origin, domain and extent: they are built once
+        # and looked up in the module level cache on subsequent calls and iterations
+        return f"{ret_vals} = _index_arrays(({', '.join(starts)},), ({', '.join(stops)},))"
 
     def _make_regional_computation(
         self, iteration_order, interval_definition, body_sources
@@ -565,7 +559,24 @@ class NumPyModuleGenerator(BaseModuleGenerator):
         )
 
     def generate_module_members(self) -> str:
-        return ""
+        return textwrap.dedent(
+            """\
+            import functools
+
+
+            @functools.lru_cache(maxsize=16)
+            def _index_arrays(starts, stops):
+                ndims = len(starts)
+                aranges = [
+                    np.arange(start, stop)[tuple(slice(None) if d == dim else None for d in range(ndims))]
+                    for dim, (start, stop) in enumerate(zip(starts, stops))
+                ]
+                index_arrays = tuple(np.broadcast_arrays(*aranges))
+                for array in index_arrays:
+                    array.flags.writeable = False
+                return index_arrays
+            """
+        )
 
     def generate_implementation(self) -> str:
         block = gt_text.TextBlock(indent_size=self.TEMPLATE_INDENT_SIZE)
@@ -159,6 +159,36 @@ class CachingStrategy(abc.ABC):
         """Check if this cache is deferred."""
         return False
 
+    @property
+    def tuning_info_path(self) -> Optional[pathlib.Path]:
+        """Calculate the file path where the tuned build options of the stencil are stored."""
+        return None
+
+    @property
+    def tuning_info(self) -> Dict[str, Any]:
+        """
+        Read the tuned build options of the stencil (see :py:mod:`gt4py.autotuning`).
+
+        Empty if the stencil was never tuned or no caching is intended.
+        """
+        if not self.tuning_info_path or not self.tuning_info_path.exists():
+            return {}
+        with self.tuning_info_path.open("rb") as tuning_info_file:
+            return pickle.load(tuning_info_file)
+
+    @property
+    def pass_cache_path(self) -> Optional[pathlib.Path]:
+        """Calculate the directory where the results of IR passes, shared by stencils, are stored."""
+        return None
+
+    def update_tuning_info(self, tuning_info: Dict[str, Any]) -> None:
+        """Store the tuned build options of the stencil, replacing previous ones."""
+        if not self.tuning_info_path:
+            return
+        self.tuning_info_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.tuning_info_path.open("wb") as tuning_info_file:
+            pickle.dump(tuning_info, tuning_info_file)
+
 
 class JITCachingStrategy(CachingStrategy):
     """
@@ -300,6 +330,17 @@ class JITCachingStrategy(CachingStrategy):
             gt4py.utils.shashed_id(gt4py.utils.shashed_id(fingerprint), self.options_id),
         )
 
+    @property
+    def tuning_info_path(self) -> Optional[pathlib.Path]:
+        """Get the tuning info file path from the stencil fingerprint."""
+        name, version = self.stencil_id
+        return self.backend_root_path / "tuning" / f"{name}__{version}.tuninginfo"
+
+    @property
+    def pass_cache_path(self) -> Optional[pathlib.Path]:
+        """Get the pass cache path next to the caches of the backends, passes are shared by them."""
+        return self.backend_root_path.parent / "passes"
+
     @property
     def module_prefix(self) -> str:
         return "m_"
@@ -5,7 +5,18 @@ import importlib
 import pathlib
 import sys
 from types import ModuleType
-from typing import Any, Callable, Dict, Generator, KeysView, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    KeysView,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import click
 import tabulate
@@ -14,6 +25,7 @@ import gt4py
 from gt4py import gtscript_imports
 from gt4py.backend.base import CLIBackendMixin
 from gt4py.lazy_stencil import LazyStencil
+from gtc.passes.pass_instrumentation import PassRecord
 
 
 class BackendChoice(click.Choice):
@@ -147,6 +159,23 @@ class Reporter:
         pass
 
 
+def pass_table(records: Sequence[PassRecord]) -> str:
+    """Build a string with a table of the statistics of IR passes and their total time."""
+    headers = ["pass", "time [s]", "nodes before", "nodes after", "peak memory [MiB]"]
+    data = [
+        [
+            record.name,
+            record.time,
+            record.nodes_before,
+            record.nodes_after,
+            None if record.peak_memory is None else record.peak_memory / 2**20,
+        ]
+        for record in records
+    ]
+    data.append(["total", sum(record.time for record in records), None, None, None])
+    return tabulate.tabulate(data, headers=headers, floatfmt=".3f", missingval="-")
+
+
 def get_param_by_name(ctx: click.Context, name: str) -> click.Parameter:
     params = ctx.command.params
     by_name = {param.name: param for param in params}
@@ -216,15 +245,23 @@ class GTScriptBuilder:
     def generate_stencils(
         self,
         build_options: Optional[Dict[str, Any]] = None,
+        *,
+        report_passes: bool = False,
+        trace_memory: bool = False,
     ) -> None:
         for proto_stencil in self.iterate_stencils():
             self.reporter.echo(f"Building stencil {proto_stencil.builder.options.name}")
             builder = proto_stencil.builder.with_backend(self.backend_cls.name)
             if build_options:
                 builder.with_changed_options(impl_opts=build_options)
+            if report_passes:
+                builder.with_changed_options(build_info={"trace_memory": trace_memory})
             builder.with_caching("nocaching", output_path=self.output_path)
             computation_src = builder.generate_computation()
             self.write_computation_src(builder.caching.root_path, computation_src)
+            if report_passes:
+                records = builder.options.build_info.get("passes", [])
+                self.reporter.echo(f"\n{pass_table(records)}\n")
 
     def report_stencil_names(self) -> None:
         stencils = list(self.iterate_stencils())
@@ -276,6 +313,16 @@ def list_backends() -> None:
     help="Backend option (multiple allowed), format: -O key=value",
 )
 @click.option("--silent", "-s", is_flag=True, help="suppress console output")
+@click.option(
+    "--report-passes",
+    is_flag=True,
+    help="report the wall time, IR size and memory of the IR passes of each stencil",
+)
+@click.option(
+    "--trace-memory",
+    is_flag=True,
+    help="trace the memory of the reported IR passes (slows them down)",
+)
 @click.argument(
     "input_path", required=True, type=click.Path(file_okay=True, dir_okay=True, exists=True)
 )
@@ -285,6 +332,8 @@ def gen(
     options: Dict[str, Any],
     input_path: str,
     silent: bool,
+    report_passes: bool,
+    trace_memory: bool,
 ) -> None:
     """Generate stencils from gtscript modules or packages."""
     GTScriptBuilder(
@@ -292,4 +341,6 @@ def gen(
         output_path=output_path,
         backend=backend,
         silent=silent,
-    ).generate_stencils(build_options=dict(options))
+    ).generate_stencils(
+        build_options=dict(options), report_passes=report_passes, trace_memory=trace_memory
+    )
@@ -68,8 +68,20 @@ build_settings: Dict[str, Any] = {
 cache_settings: Dict[str, Any] = {
     "dir_name": os.environ.get("GT_CACHE_DIR_NAME", ".gt_cache"),
     "root_path": os.environ.get("GT_CACHE_ROOT", os.path.abspath(".")),
+    # Reuse results of GTIR and OIR passes across stencils (see `gtc.passes.pass_cache`)
+    "pass_cache": os.environ.get("GT_PASS_CACHE", "0").lower() in ("1", "true", "yes"),
 }
 
 code_settings: Dict[str, Any] = {"root_package_name": "_GT_"}
 
+storage_settings: Dict[str, Any] = {
+    # Parallel first-touch initialization of CPU storages in `empty`, `zeros` and `ones`
+    "first_touch": os.environ.get("GT_STORAGE_FIRST_TOUCH", "0").lower() in ("1", "true", "yes"),
+    # Same number of threads as the OpenMP kernels of the CPU backends
+    "first_touch_threads": int(os.environ.get("OMP_NUM_THREADS", "0").split(",")[0] or 0)
+    or multiprocessing.cpu_count(),
+    # Smaller storages are initialized serially
+    "first_touch_min_bytes": 2**22,
+}
+
 os.environ.setdefault("DACE_CONFIG", os.path.join(os.path.abspath("."), ".dace.conf"))
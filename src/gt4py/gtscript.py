@@ -162,7 +162,10 @@ def stencil(
             Function object defining the stencil.
 
         build_info : `dict`, optional
-            Dictionary used to store information about the stencil generation.
+            Dictionary used to store information about the stencil generation, like the
+            wall time, IR size and memory of the IR passes in ``"passes"``
+            (see :class:`gtc.passes.pass_instrumentation.PassRecord`). The memory is only
+            traced if ``"trace_memory"`` is set, since tracing slows down the passes.
             (`None` by default).
 
         dtypes: `dict`[`str`, dtype_definition], optional
@@ -296,7 +299,10 @@ def lazy_stencil(
             Function object defining the stencil.
 
         build_info : `dict`, optional
-            Dictionary used to store information about the stencil generation.
+            Dictionary used to store information about the stencil generation, like the
+            wall time, IR size and memory of the IR passes in ``"passes"``
+            (see :class:`gtc.passes.pass_instrumentation.PassRecord`). The memory is only
+            traced if ``"trace_memory"`` is set, since tracing slows down the passes.
             (`None` by default).
 
         dtypes: `dict`[`str`, dtype_definition], optional
@@ -3,11 +3,14 @@ import pathlib
 from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
 
 import gt4py
+from gt4py.backend.gtc_backend.common import compute_dtype_from_options
 from gt4py.backend.gtc_backend.defir_to_gtir import DefIRToGTIR
 from gt4py.definitions import BuildOptions, StencilID
 from gt4py.type_hints import AnnotatedStencilFunc, StencilFunc
 from gtc import gtir
 from gtc.passes.gtir_pipeline import GtirPipeline
+from gtc.passes.pass_cache import PassCache
+from gtc.passes.pass_instrumentation import PassInstrumentation
 
 
 if TYPE_CHECKING:
@@ -67,6 +70,7 @@ class StencilBuilder:
 
     def build(self) -> Type["StencilObject"]:
         """Generate, compile and/or load everything necessary to provide a usable stencil class."""
+        self.with_tuned_options()
         # load, defer, or generate
         if self.caching.is_deferred():
             stencil_class = self.caching.defer()
@@ -84,7 +88,7 @@ class StencilBuilder:
         """Generate ``target_language`` bindings source, fail if backend does not support CLI."""
         return self.cli_backend.generate_bindings(targe_language)
 
-    def get_caching_strategy(self, options: BuildOptions) -> Type["CachingStrategy"]:
+    def get_caching_strategy(self, options: BuildOptions) -> "CachingStrategy":
         strategy_name = "jit"
         strategy_opts = {}
         if options and "defer_function" in options.backend_opts:
@@ -147,6 +151,24 @@ class StencilBuilder:
         old_options["impl_opts"] = old_options.pop("_impl_opts")
         return self.with_options(**{**old_options, **kwargs})
 
+    def with_tuned_options(self: "StencilBuilder") -> "StencilBuilder":
+        """
+        Fluidly apply the tuned backend options stored in the cache, if any.
+
+        Notes
+        -----
+        Tuned options are ignored if any of them is set explicitly or if the backend does not
+        support them. Resets all cached build data when options are changed.
+        """
+        tuned_opts = self.caching.tuning_info.get("backend_opts", {})
+        if (
+            tuned_opts
+            and not set(tuned_opts) & set(self.options.backend_opts)
+            and set(tuned_opts) <= set(self.backend.options)
+        ):
+            self.with_changed_options(backend_opts={**self.options.backend_opts, **tuned_opts})
+        return self
+
     def with_backend(self: "StencilBuilder", backend_name: str) -> "StencilBuilder":
         """
         Fluidly set the backend type from backend name.
@@ -263,10 +285,42 @@ class StencilBuilder:
             "iir", gt4py.analysis.transform(self.definition_ir, self.options)
         )
 
+    @property
+    def pass_cache(self) -> Optional[PassCache]:
+        """Get the cache of the results of IR passes if enabled in the cache settings."""
+        path = self.caching.pass_cache_path
+        if not gt4py.config.cache_settings["pass_cache"] or path is None:
+            return None
+        return PassCache(path)
+
+    @property
+    def pass_instrumentation(self) -> Optional[PassInstrumentation]:
+        """
+        Get the recorder of the statistics of the IR passes if build info is requested.
+
+        The records of the passes are stored in ``build_info["passes"]``, their peak memory is
+        only traced if ``build_info["trace_memory"]`` is set.
+        """
+        if self.options.build_info is None:
+            return None
+        if "pass_instrumentation" not in self._build_data:
+            instrumentation = PassInstrumentation(
+                trace_memory=bool(self.options.build_info.get("trace_memory", False))
+            )
+            self.options.build_info["passes"] = instrumentation.records
+            self._build_data["pass_instrumentation"] = instrumentation
+        return self._build_data["pass_instrumentation"]
+
     @property
     def gtir_pipeline(self) -> GtirPipeline:
         return self._build_data.get("gtir_pipeline") or self._build_data.setdefault(
-            "gtir_pipeline", GtirPipeline(DefIRToGTIR.apply(self.definition_ir))
+            "gtir_pipeline",
+            GtirPipeline(
+                DefIRToGTIR.apply(self.definition_ir),
+                compute_dtype=compute_dtype_from_options(self.options),
+                pass_cache=self.pass_cache,
+                instrumentation=self.pass_instrumentation,
+            ),
         )
 
     @property
@@ -136,6 +136,10 @@ class StencilObject(abc.ABC):
 
         raise ValueError("Invalid 'origin' value ({})".format(origin))
 
+    def _is_compatible_type(self, field: Any) -> bool:
+        """Check if the type of `field` is supported by the backend of the stencil."""
+        return gt_backend.from_name(self.backend).storage_info["is_compatible_type"](field)
+
     def _get_max_domain(
         self,
         field_args: Dict[str, Any],
@@ -234,7 +238,7 @@ class StencilObject(abc.ABC):
                         f"The layout of the field {name} is not compatible with the backend."
                     )
 
-                if not gt_backend.from_name(self.backend).storage_info["is_compatible_type"](field):
+                if not self._is_compatible_type(field):
                     raise ValueError(
                         f"Field '{name}' has type '{type(field)}', which is not compatible with the '{self.backend}' backend."
                     )
@@ -17,6 +17,7 @@
 """GridTools storages classes."""
 
 
+from .halo import HaloPacker, halo_slices
 from .storage import Storage, empty, from_array, ones, zeros
 
 
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+# GT4Py - GridTools4Py - GridTools for Python
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Packing and unpacking of halo regions into contiguous communication buffers."""
+
+import numbers
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+import gt4py.utils as gt_util
+
+from .storage import Storage
+
+
+def halo_slices(shape, halo, axis, *, upper=False, interior=False, corners=False):
+    """Compute the index region of a halo slab along one axis.
+
+    Parameters
+    ----------
+    shape: tuple of ints
+        the full shape of the storage, including halo points
+
+    halo: tuple of ints
+        halo width for each dimension. Missing trailing dimensions have no halo.
+
+    axis: int
+        the dimension along which the slab is taken
+
+    upper: bool
+        if ``True``, the slab is taken at the upper end of `axis`, otherwise at the lower end
+
+    interior: bool
+        if ``True``, return the compute domain points adjacent to the halo (i.e. the points to
+        be sent to a neighbor), otherwise return the halo points themselves (i.e. the points
+        to be received from a neighbor)
+
+    corners: bool
+        if ``True``, the slab spans the full extent (including halo) of all the other
+        dimensions, otherwise only their compute domain
+
+    Returns
+    -------
+    tuple of slices
+    """
+    if not gt_util.is_iterable_of(shape, numbers.Integral):
+        raise TypeError("shape must be an iterable of ints.")
+    if not gt_util.is_iterable_of(halo, numbers.Integral):
+        raise TypeError("halo must be an iterable of ints.")
+    if len(halo) > len(shape):
+        raise ValueError(f"Halo ({halo}) has more dimensions than shape ({shape}).")
+    halo = (*halo, *((0,) * (len(shape) - len(halo))))
+    if not 0 <= axis < len(shape):
+        raise ValueError(f"Invalid axis ({axis}) for shape ({shape}).")
+    if any(2 * h > s for h, s in zip(halo, shape)):
+        raise ValueError(f"Halo ({halo}) too large for shape ({shape}).")
+
+    region = []
+    for dim, (size, width) in enumerate(zip(shape, halo)):
+        if dim == axis:
+            start = width if interior else 0
+            if upper:
+                start = size - width - start
+            region.append(slice(start, start + width))
+        elif corners:
+            region.append(slice(0, size))
+        else:
+            region.append(slice(width, size - width))
+
+    return tuple(region)
+
+
+class _SlabCopy(NamedTuple):
+    field_index: int
+    view: np.ndarray
+    offset: int
+    size: int
+    buffer_shape: Tuple[int, ...]
+    buffer_axes: Tuple[int, ...]
+
+
+class HaloPacker:
+    """Pack and unpack regions of a set of storages into a contiguous buffer.
+
+    The index plan (buffer offsets, slab views and copy order) is computed once at construction
+    so that :meth:`pack` and :meth:`unpack` only perform one copy per field and region. Each
+    slab is stored in the buffer following the memory layout of its field, which makes both
+    sides of the copy traverse memory in the same order.
+
+    The buffer is ordered by region first and by field second, so all the data for the
+    i-th region (e.g. the message for one neighbor) is contiguous and can be accessed without
+    copies with :meth:`region_buffer`. Buffers are plain NumPy arrays and can be passed to any
+    communication library.
+
+    Parameters
+    ----------
+    fields: sequence of storages or numpy arrays
+        the fields to pack or unpack
+
+    regions: sequence of tuples of slices
+        the regions (e.g. generated with :func:`halo_slices`) applied to every field
+
+    dtype: data type compatible with numpy dtypes, optional
+        the dtype of the communication buffer. Required if the fields have different dtypes.
+    """
+
+    def __init__(self, fields, regions, *, dtype=None):
+        if not fields:
+            raise ValueError("At least one field is required.")
+        if not regions:
+            raise ValueError("At least one region is required.")
+
+        arrays = [self._host_array(field) for field in fields]
+        if dtype is None:
+            dtype = arrays[0].dtype
+            if any(array.dtype != dtype for array in arrays):
+                raise TypeError("Fields have different dtypes, a buffer dtype must be provided.")
+
+        self._fields = list(fields)
+        self._regions = [tuple(region) for region in regions]
+        self._dtype = np.dtype(dtype)
+
+        self._copies: List[_SlabCopy] = []
+        self._region_bounds: List[Tuple[int, int]] = []
+        offset = 0
+        for region in self._regions:
+            start = offset
+            for index, array in enumerate(arrays):
+                view = array[region]
+                if isinstance(view, np.ndarray) and view.size == 0:
+                    # Zero-width regions (e.g. along axes without halo) have nothing to copy
+                    continue
+                if not isinstance(view, np.ndarray) or not np.may_share_memory(view, array):
+                    raise ValueError(f"Region {region} is not a basic slicing of the field.")
+                # Buffer axes ordered by decreasing stride, i.e. following the field layout
+                order = sorted(range(view.ndim), key=lambda dim: -abs(view.strides[dim]))
+                self._copies.append(
+                    _SlabCopy(
+                        field_index=index,
+                        view=view,
+                        offset=offset,
+                        size=view.size,
+                        buffer_shape=tuple(view.shape[dim] for dim in order),
+                        buffer_axes=tuple(int(i) for i in np.argsort(order)),
+                    )
+                )
+                offset += view.size
+            self._region_bounds.append((start, offset))
+
+        self._size = offset
+        self._buffer: Optional[np.ndarray] = None
+        self._buffer_views: Optional[List[np.ndarray]] = None
+
+    @staticmethod
+    def _host_array(field):
+        if not isinstance(field, np.ndarray):
+            raise TypeError(f"Fields must be storages or numpy arrays (got '{type(field)}').")
+        return field.view(np.ndarray)
+
+    @property
+    def fields(self) -> List:
+        return list(self._fields)
+
+    @property
+    def regions(self) -> List[Tuple[slice, ...]]:
+        return list(self._regions)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def size(self) -> int:
+        """Number of elements of the communication buffer."""
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the communication buffer."""
+        return self._size * self._dtype.itemsize
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """Preallocated communication buffer used when no buffer is passed explicitly."""
+        if self._buffer is None:
+            self._buffer = self.empty_buffer()
+            self._buffer_views = self._make_buffer_views(self._buffer)
+        return self._buffer
+
+    def empty_buffer(self) -> np.ndarray:
+        """Allocate a new, uninitialized communication buffer."""
+        return np.empty((self._size,), dtype=self._dtype)
+
+    def region_buffer(self, index: int, buffer: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the contiguous part of the buffer containing the data of one region."""
+        buffer = self.buffer if buffer is None else buffer
+        start, stop = self._region_bounds[index]
+        return buffer[start:stop]
+
+    def pack(self, buffer: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copy the regions of all fields into the communication buffer and return it."""
+        buffer, views = self._get_buffer_views(buffer)
+        for field in self._fields:
+            if isinstance(field, Storage):
+                field.device_to_host()
+        for copy, buffer_view in zip(self._copies, views):
+            np.copyto(buffer_view, copy.view, casting="unsafe")
+        return buffer
+
+    def unpack(self, buffer: Optional[np.ndarray] = None) -> None:
+        """Copy the content of the communication buffer into the regions of all fields."""
+        buffer, views = self._get_buffer_views(buffer)
+        for field in self._fields:
+            if isinstance(field, Storage):
+                field.device_to_host()
+        for copy, buffer_view in zip(self._copies, views):
+            np.copyto(copy.view, buffer_view, casting="unsafe")
+        for field in self._fields:
+            if hasattr(field, "_set_host_modified"):
+                field._set_host_modified()
+
+    def _make_buffer_views(self, buffer: np.ndarray) -> List[np.ndarray]:
+        return [
+            buffer[copy.offset : copy.offset + copy.size]
+            .reshape(copy.buffer_shape)
+            .transpose(copy.buffer_axes)
+            for copy in self._copies
+        ]
+
+    def _get_buffer_views(
+        self, buffer: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, Sequence[np.ndarray]]:
+        if buffer is None or buffer is self._buffer:
+            buffer = self.buffer
+            assert self._buffer_views is not None
+            return buffer, self._buffer_views
+
+        if not isinstance(buffer, np.ndarray):
+            raise TypeError("The communication buffer must be a numpy array.")
+        if buffer.shape != (self._size,) or not buffer.flags["C_CONTIGUOUS"]:
+            raise ValueError(
+                f"The communication buffer must be a contiguous 1D array of size {self._size}."
+            )
+        if buffer.dtype != self._dtype:
+            raise TypeError(
+                f"The communication buffer dtype ({buffer.dtype}) does not match '{self._dtype}'."
+            )
+        return buffer, self._make_buffer_views(buffer)
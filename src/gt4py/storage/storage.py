@@ -25,11 +25,43 @@ except ImportError:
     cp = None
 
 from gt4py import backend as gt_backend
+from gt4py import config as gt_config
 
+from . import tracking
 from . import utils as storage_utils
 
 
-def empty(backend, default_origin, shape, dtype, mask=None, *, managed_memory=False):
+def _first_touch_threads(storage, first_touch):
+    """Number of threads for the first-touch initialization of `storage` (0 if serial)."""
+    if first_touch is None:
+        first_touch = gt_config.storage_settings["first_touch"]
+    if (
+        not first_touch
+        or not isinstance(storage, CPUStorage)
+        or storage.nbytes < gt_config.storage_settings["first_touch_min_bytes"]
+    ):
+        return 0
+    return gt_config.storage_settings["first_touch_threads"]
+
+
+def _fill(storage, value, first_touch):
+    num_threads = _first_touch_threads(storage, first_touch)
+    if num_threads > 1:
+        storage_utils.first_touch_fill(storage.view(np.ndarray), value, num_threads=num_threads)
+    else:
+        storage[...] = value
+
+
+def empty(
+    backend, default_origin, shape, dtype, mask=None, *, managed_memory=False, first_touch=None
+):
+    """Allocate a storage without initializing its values.
+
+    If `first_touch` is ``True`` (default: ``gt4py.config.storage_settings["first_touch"]``), the
+    memory of large CPU storages is touched in parallel by threads partitioning the I and J
+    dimensions like the OpenMP kernels of the CPU backends, so that on NUMA systems the pages
+    are placed on the memory node of the threads computing on them. The values are then zero.
+    """
     if gt_backend.from_name(backend).storage_info["device"] == "gpu":
         if managed_memory:
             storage_t = GPUStorage
@@ -38,12 +70,17 @@ def empty(backend, default_origin, shape, dtype, mask=None, *, managed_memory=Fa
     else:
         storage_t = CPUStorage
 
-    return storage_t(
+    storage = storage_t(
         shape=shape, dtype=dtype, backend=backend, default_origin=default_origin, mask=mask
     )
+    if _first_touch_threads(storage, first_touch) > 1:
+        _fill(storage, 0, first_touch)
+    return storage
 
 
-def ones(backend, default_origin, shape, dtype, mask=None, *, managed_memory=False):
+def ones(
+    backend, default_origin, shape, dtype, mask=None, *, managed_memory=False, first_touch=None
+):
     storage = empty(
         shape=shape,
         dtype=dtype,
@@ -51,12 +88,15 @@ def ones(backend, default_origin, shape, dtype, mask=None, *, managed_memory=Fal
         default_origin=default_origin,
         mask=mask,
         managed_memory=managed_memory,
+        first_touch=False,
     )
-    storage[...] = 1
+    _fill(storage, 1, first_touch)
     return storage
 
 
-def zeros(backend, default_origin, shape, dtype, mask=None, *, managed_memory=False):
+def zeros(
+    backend, default_origin, shape, dtype, mask=None, *, managed_memory=False, first_touch=None
+):
     storage = empty(
         shape=shape,
         dtype=dtype,
@@ -64,8 +104,9 @@ def zeros(backend, default_origin, shape, dtype, mask=None, *, managed_memory=Fa
         default_origin=default_origin,
         mask=mask,
         managed_memory=managed_memory,
+        first_touch=False,
     )
-    storage[...] = 0
+    _fill(storage, 0, first_touch)
     return storage
 
 
@@ -92,6 +133,10 @@ def from_array(
             tmp[...] = data
         else:
             storage[...] = cp.asnumpy(data)
+    elif (
+        isinstance(storage, CPUStorage) and type(data) is np.ndarray and data.shape == storage.shape
+    ):
+        storage_utils.blocked_copy(storage.view(np.ndarray), data)
     else:
         storage[...] = data
 
@@ -148,6 +193,8 @@ class Storage(np.ndarray):
         obj.is_stencil_view = True
         obj._mask = mask
         obj._check_data()
+        if tracking.is_enabled():
+            tracking.register(obj, alignment=alignment, layout_map=layout_map)
 
         return obj
 
@@ -192,6 +239,46 @@ class Storage(np.ndarray):
         res.is_stencil_view = self.is_stencil_view
         return res
 
+    def to_backend(self, backend, *, out=None, managed_memory=False):
+        """
+        Return a copy of the storage with the memory layout and alignment of another backend.
+
+        Parameters
+        ----------
+
+        backend: string, backend identifier
+            the backend of the new storage
+
+        out: :class:`Storage`, optional
+            a preallocated storage of `backend` with the same shape, dtype and mask, where the
+            data is copied instead of allocating a new storage (e.g. to reuse a pool of buffers)
+
+        managed_memory: bool
+            use managed memory for the new storage if `backend` is a GPU backend
+        """
+
+        if out is None:
+            out = empty(
+                shape=self.shape,
+                dtype=self.dtype,
+                backend=backend,
+                default_origin=self.default_origin,
+                mask=self.mask,
+                managed_memory=managed_memory,
+            )
+        elif not isinstance(out, Storage) or out.backend != backend:
+            raise ValueError(f"The output storage must be a storage of the '{backend}' backend.")
+        elif out.shape != self.shape or out.dtype != self.dtype or out.mask != self.mask:
+            raise ValueError(
+                "The output storage must have the same shape, dtype and mask as the storage."
+            )
+
+        self.device_to_host()
+        out.device_to_host()
+        storage_utils.blocked_copy(out.view(np.ndarray), self.view(np.ndarray))
+        out._set_host_modified()
+        return out
+
     def __array_finalize__(self, obj):
         if obj is None:
             # constructor called previously
@@ -246,6 +333,9 @@ class Storage(np.ndarray):
     def device_to_host(self, force=False):
         pass
 
+    def _set_host_modified(self):
+        pass
+
     def __iconcat__(self, other):
         raise NotImplementedError("Concatenation of Storages is not supported")
 
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# GT4Py - GridTools4Py - GridTools for Python
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Registry of live storages for memory statistics and leak detection.
+
+Tracking is disabled by default (it can be enabled at import time setting the ``GT_TRACK_STORAGES``
+environment variable to ``1``). When enabled, every new storage is recorded with its size, padding
+overhead and allocation site. Records are removed automatically when the memory of the storage is
+released, so the registry only contains storages which are still reachable from some reference.
+
+Example
+-------
+>>> from gt4py.storage import tracking
+>>> tracking.enable()
+>>> ...  # allocate storages and run stencils
+>>> tracking.dump(group_by="function")  # doctest: +SKIP
+"""
+
+import collections
+import itertools
+import os
+import sys
+import threading
+import traceback
+import weakref
+from typing import Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+import numpy as np
+
+from . import utils as storage_utils
+
+
+GROUP_KEYS = ("backend", "module", "function", "location")
+
+
+class StorageRecord(NamedTuple):
+    """Allocation information of a live storage."""
+
+    #: Sequential allocation number
+    serial: int
+    backend: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+    #: Bytes of the logical (unpadded) shape
+    nbytes: int
+    #: Bytes of the shape padded for alignment (see :func:`utils.compute_padded_shape`)
+    padded_nbytes: int
+    #: Bytes of the allocated buffer, including the slack needed to align the default origin
+    allocated_nbytes: int
+    #: Module, function and ``"filename:lineno"`` of the first frame outside of gt4py.storage
+    module: str
+    function: str
+    location: str
+    traceback: traceback.StackSummary
+
+    @property
+    def padding_nbytes(self) -> int:
+        """Bytes allocated in addition to the logical size of the storage."""
+        return self.allocated_nbytes - self.nbytes
+
+
+class _Registry:
+    def __init__(self):
+        self.enabled = False
+        self.traceback_limit = 8
+        self.records: Dict[int, StorageRecord] = {}
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+
+_registry = _Registry()
+
+_STORAGE_PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+def enable(*, traceback_limit: int = 8) -> None:
+    """Start recording new storage allocations.
+
+    Storages allocated before tracking is enabled are not recorded. `traceback_limit` is the
+    maximum number of frames stored for each allocation site.
+    """
+    _registry.traceback_limit = traceback_limit
+    _registry.enabled = True
+
+
+def disable() -> None:
+    """Stop recording new storage allocations (storages already recorded remain tracked)."""
+    _registry.enabled = False
+
+
+def is_enabled() -> bool:
+    return _registry.enabled
+
+
+def clear() -> None:
+    """Forget all the recorded storages."""
+    with _registry.lock:
+        _registry.records.clear()
+
+
+def _allocation_frame():
+    frame = sys._getframe(1)
+    while (
+        frame is not None
+        and os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == _STORAGE_PACKAGE_PATH
+    ):
+        frame = frame.f_back
+    return frame
+
+
+def register(storage, *, alignment: int, layout_map) -> None:
+    """Record a newly allocated storage (called by the :class:`Storage` constructor).
+
+    The record lives as long as the buffer owning the memory of the storage, which is also kept
+    alive by views of the storage.
+    """
+    order_idx = storage_utils.idx_from_order([i for i in layout_map if i is not None])
+    padded_shape = storage_utils.compute_padded_shape(storage.shape, alignment, order_idx)
+    itemsize = storage.dtype.itemsize
+    allocated_nbytes = storage._raw_buffer.nbytes
+
+    frame = _allocation_frame()
+    if frame is not None:
+        module = frame.f_globals.get("__name__", "<unknown>")
+        function = frame.f_code.co_name
+        location = f"{frame.f_code.co_filename}:{frame.f_lineno}"
+        stack = traceback.extract_stack(frame, limit=_registry.traceback_limit)
+    else:
+        module = function = location = "<unknown>"
+        stack = traceback.StackSummary()
+
+    serial = next(_registry.counter)
+    record = StorageRecord(
+        serial=serial,
+        backend=storage.backend,
+        shape=tuple(storage.shape),
+        dtype=storage.dtype,
+        nbytes=int(np.prod(storage.shape)) * itemsize,
+        padded_nbytes=int(np.prod(padded_shape)) * itemsize,
+        allocated_nbytes=allocated_nbytes,
+        module=module,
+        function=function,
+        location=location,
+        traceback=stack,
+    )
+
+    try:
+        weakref.finalize(storage._raw_buffer, _registry.records.pop, serial, None)
+    except TypeError:
+        # Buffer types without weak reference support
+        weakref.finalize(storage, _registry.records.pop, serial, None)
+    with _registry.lock:
+        _registry.records[serial] = record
+
+
+def live_storages(*, backend: Optional[str] = None) -> List[StorageRecord]:
+    """Return the records of the tracked storages which are still alive, oldest first."""
+    with _registry.lock:
+        records = list(_registry.records.values())
+    if backend is not None:
+        records = [record for record in records if record.backend == backend]
+    return sorted(records, key=lambda record: record.serial)
+
+
+def memory_summary(group_by: str = "module") -> Dict[str, Dict[str, int]]:
+    """Aggregate the live storages by one of the keys in :data:`GROUP_KEYS`.
+
+    Returns
+    -------
+    dict
+        for each group, the number of storages (``count``), their logical size (``nbytes``) and
+        the allocated size (``allocated_nbytes``), sorted by decreasing allocated size
+    """
+    if group_by not in GROUP_KEYS:
+        raise ValueError(f"Invalid group key '{group_by}', must be one of {GROUP_KEYS}.")
+
+    summary: Dict[str, Dict[str, int]] = collections.defaultdict(
+        lambda: {"count": 0, "nbytes": 0, "allocated_nbytes": 0}
+    )
+    for record in live_storages():
+        group = summary[getattr(record, group_by)]
+        group["count"] += 1
+        group["nbytes"] += record.nbytes
+        group["allocated_nbytes"] += record.allocated_nbytes
+
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["allocated_nbytes"]))
+
+
+def padding_summary() -> Dict[str, Dict[str, int]]:
+    """Report the memory overhead of alignment padding of the live storages for each backend.
+
+    Returns
+    -------
+    dict
+        for each backend, the number of storages (``count``), their logical size (``nbytes``), the
+        size of the padded shapes (``padded_nbytes``), the allocated size (``allocated_nbytes``)
+        and the bytes allocated in excess of the logical size (``padding_nbytes``)
+    """
+    summary: Dict[str, Dict[str, int]] = collections.defaultdict(
+        lambda: {
+            "count": 0,
+            "nbytes": 0,
+            "padded_nbytes": 0,
+            "allocated_nbytes": 0,
+            "padding_nbytes": 0,
+        }
+    )
+    for record in live_storages():
+        group = summary[record.backend]
+        group["count"] += 1
+        group["nbytes"] += record.nbytes
+        group["padded_nbytes"] += record.padded_nbytes
+        group["allocated_nbytes"] += record.allocated_nbytes
+        group["padding_nbytes"] += record.padding_nbytes
+
+    return dict(summary)
+
+
+def _format_bytes(nbytes: int) -> str:
+    if abs(nbytes) < 1024:
+        return f"{nbytes} B"
+    size = nbytes / 1024
+    for unit in ("KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def dump(
+    group_by: str = "module", *, file: Optional[TextIO] = None, tracebacks: bool = False
+) -> None:
+    """Print a report of the live storages grouped by `group_by` and of the padding overhead.
+
+    If `tracebacks` is ``True``, the allocation traceback of every live storage is also printed.
+    """
+    file = sys.stdout if file is None else file
+    summary = memory_summary(group_by)
+    total = sum(group["allocated_nbytes"] for group in summary.values())
+
+    print(f"Live storages by {group_by} (total: {_format_bytes(total)}):", file=file)
+    for key, group in summary.items():
+        print(
+            f"  {_format_bytes(group['allocated_nbytes']):>12}  {group['count']:>6} storages  {key}",
+            file=file,
+        )
+
+    print("Alignment padding by backend:", file=file)
+    for backend, group in padding_summary().items():
+        ratio = (
+            group["padding_nbytes"] / group["allocated_nbytes"] if group["allocated_nbytes"] else 0
+        )
+        print(
+            f"  {_format_bytes(group['padding_nbytes']):>12}  ({ratio:6.1%} of allocated)  {backend}",
+            file=file,
+        )
+
+    if tracebacks:
+        for record in live_storages():
+            print(
+                f"\nStorage #{record.serial} ({record.backend}, shape={record.shape}, "
+                f"dtype={record.dtype}, {_format_bytes(record.allocated_nbytes)}) allocated at:",
+                file=file,
+            )
+            print("".join(record.traceback.format()), end="", file=file)
+
+
+if os.environ.get("GT_TRACK_STORAGES", "0").lower() in ("1", "true", "yes"):
+    enable()
@@ -15,8 +15,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import collections.abc
+import concurrent.futures
+import itertools
 import math
 import numbers
+import os
 from typing import Optional, Sequence
 
 import numpy as np
@@ -165,6 +168,104 @@ def allocate(default_origin, shape, layout_map, dtype, alignment_bytes, allocate
     return raw_buffer, field
 
 
+def blocked_copy(dst, src, *, block_edge=64, block_bytes=2**17):
+    """Copy `src` into `dst` using cache blocking if their memory layouts differ.
+
+    If the unit-stride dimensions of both arrays differ (i.e. the copy is a transposition),
+    the copy is split in blocks spanning `block_edge` elements along both unit-stride
+    dimensions and at most `block_bytes` bytes in total, so that both source and destination
+    blocks stay in cache while they are traversed in different orders.
+    """
+    if dst.shape != src.shape:
+        raise ValueError(f"Shape mismatch in copy (dst: {dst.shape}, src: {src.shape}).")
+
+    def unit_stride_dim(array):
+        return min(
+            (dim for dim in range(array.ndim) if array.shape[dim] > 1),
+            key=lambda dim: abs(array.strides[dim]),
+            default=None,
+        )
+
+    dst_dim, src_dim = unit_stride_dim(dst), unit_stride_dim(src)
+    if dst.ndim < 2 or dst_dim is None or src_dim is None or dst_dim == src_dim:
+        dst[...] = src
+        return
+
+    block_shape = [1] * dst.ndim
+    block_shape[dst_dim] = block_shape[src_dim] = block_edge
+    remaining_items = max(block_bytes // (block_edge * block_edge * dst.itemsize), 1)
+    for dim in reversed(range(dst.ndim)):
+        if dim not in (dst_dim, src_dim):
+            block_shape[dim] = min(remaining_items, dst.shape[dim])
+            remaining_items = max(remaining_items // block_shape[dim], 1)
+
+    for block_start in itertools.product(
+        *(range(0, size, block) for size, block in zip(dst.shape, block_shape))
+    ):
+        block = tuple(slice(start, start + block) for start, block in zip(block_start, block_shape))
+        dst[block] = src[block]
+
+
+def first_touch_regions(shape, num_threads):
+    """Statically partition the first two dimensions of `shape` among `num_threads` threads.
+
+    The flattened index space of the first two dimensions (I and J for storages) is split in
+    contiguous chunks of the same size, as done by ``schedule(static)`` OpenMP loops collapsing
+    the I and J loops. Returns, for each thread, a list of index tuples covering its chunk.
+    """
+    if len(shape) == 0:
+        return [[()]] + [[] for _ in range(num_threads - 1)]
+    if len(shape) == 1:
+        return [
+            [(slice(thread * shape[0] // num_threads, (thread + 1) * shape[0] // num_threads),)]
+            for thread in range(num_threads)
+        ]
+
+    inner = shape[1]
+    size = shape[0] * inner
+    regions = []
+    for thread in range(num_threads):
+        start, stop = thread * size // num_threads, (thread + 1) * size // num_threads
+        thread_regions = []
+        if start < stop and start % inner:
+            i, j = divmod(start, inner)
+            j_stop = min(inner, j + stop - start)
+            thread_regions.append((slice(i, i + 1), slice(j, j_stop)))
+            start += j_stop - j
+        if stop - start >= inner:
+            rows = (stop - start) // inner
+            thread_regions.append((slice(start // inner, start // inner + rows),))
+            start += rows * inner
+        if start < stop:
+            thread_regions.append(
+                (slice(start // inner, start // inner + 1), slice(0, stop - start))
+            )
+        regions.append(thread_regions)
+    return regions
+
+
+def first_touch_fill(array, value, *, num_threads):
+    """Fill `array` with `value` from `num_threads` threads, each one writing its own chunk.
+
+    Memory pages are placed on the NUMA node of the thread which first writes them, so if `array`
+    has just been allocated, each chunk of :func:`first_touch_regions` ends up local to the
+    thread of the CPU backends computing on it. Worker threads are pinned to CPUs spread over
+    the affinity set of the process (as with ``OMP_PROC_BIND=spread``) if the platform allows it.
+    """
+    regions = first_touch_regions(array.shape, num_threads)
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+
+    def touch(thread):
+        if cpus:
+            os.sched_setaffinity(0, {cpus[thread * len(cpus) // len(regions)]})
+        for region in regions[thread]:
+            array[region] = value
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(regions)) as executor:
+        for future in [executor.submit(touch, thread) for thread in range(len(regions))]:
+            future.result()
+
+
 def allocate_gpu_unmanaged(default_origin, shape, layout_map, dtype, alignment_bytes):
     dtype = np.dtype(dtype)
     assert (
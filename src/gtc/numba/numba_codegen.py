@@ -0,0 +1,520 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import textwrap
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple, Union
+
+from eve.codegen import FormatTemplate, JinjaTemplate, TemplatedGenerator
+from gtc import common, oir
+from gtc.passes.oir_optimizations.utils import AccessCollector, compute_extents
+
+
+__all__ = ["NumbaCodegen"]
+
+
+BOUNDARY_T = Tuple[Tuple[int, int], Tuple[int, int]]
+
+#: Names of the loop indices and of the domain sizes along I, J and K
+INDICES = ("_i_", "_j_", "_k_")
+SIZES = ("_dI_", "_dJ_", "_dK_")
+#: Names of the start indices of horizontal tiles along I and J
+TILE_STARTS = ("_ti_", "_tj_")
+
+NATIVE_FUNCTIONS = {
+    common.NativeFunction.MIN: "minimum",
+    common.NativeFunction.MAX: "maximum",
+    common.NativeFunction.POW: "power",
+}
+
+
+def _plus(expr: str, value: int) -> str:
+    if value == 0:
+        return expr
+    return f"{expr} {'+' if value > 0 else '-'} {abs(value)}"
+
+
+def _axis_bound(bound: common.AxisBound, size: str, delta: int = 0) -> str:
+    if bound.level == common.LevelMarker.START:
+        return str(bound.offset + delta)
+    return _plus(size, bound.offset + delta)
+
+
+def _nest(headers: List[str], body: str) -> str:
+    """Nest `body` in the blocks opened by `headers` (e.g. `for` or `if` statements)."""
+    lines = [textwrap.indent(header, "    " * depth) for depth, header in enumerate(headers)]
+    lines.append(textwrap.indent(body.strip("\n") or "pass", "    " * len(headers)))
+    return "\n".join(lines)
+
+
+def _loop_headers(boundary: BOUNDARY_T) -> List[str]:
+    """Return the headers of the loops over a horizontal region, parallel along I."""
+    (i_lower, i_upper), (j_lower, j_upper) = boundary
+    return [
+        f"for _i_ in numba.prange({-i_lower}, {_plus(SIZES[0], i_upper)}):",
+        f"for _j_ in range({-j_lower}, {_plus(SIZES[1], j_upper)}):",
+    ]
+
+
+def _tile_loop_headers(boundary: BOUNDARY_T, tile_size: Tuple[int, int]) -> List[str]:
+    """Return the headers of the loops over a horizontal region within the current tile."""
+    return [
+        f"for {index} in range({start} - {lower}, min({start} + {size}, {domain}) + {upper}):"
+        for index, start, domain, size, (lower, upper) in zip(
+            INDICES, TILE_STARTS, SIZES, tile_size, boundary
+        )
+    ]
+
+
+def _k_cache_name(name: str, offset: int) -> str:
+    return f"_{name}_{'m' if offset < 0 else 'p' if offset > 0 else ''}{abs(offset)}_"
+
+
+def columns_are_independent(node: oir.VerticalLoop) -> bool:
+    """Check if no field written in a vertical loop is read at a horizontal offset in the loop."""
+    accesses = AccessCollector.apply(node)
+    written = accesses.write_fields()
+    return all(
+        offset[0] == 0 and offset[1] == 0
+        for name, offsets in accesses.read_offsets().items()
+        if name in written
+        for offset in offsets
+    )
+
+
+def k_cache_windows(
+    node: oir.VerticalLoop, *, loop_counts: Dict[str, int], temporaries: Set[str]
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Return the range of K offsets of the k-cached temporaries that can be kept in scalars.
+
+    These are the temporaries accessed in no other vertical loop (`loop_counts` is the number of
+    vertical loops accessing each field), only at constant K offsets and only in their own column.
+    """
+    accesses = node.iter_tree().if_isinstance(oir.FieldAccess).to_list()
+    windows: Dict[str, Tuple[int, int]] = {}
+    for cache in node.caches:
+        name = str(cache.name)
+        if not isinstance(cache, oir.KCache) or name not in temporaries or loop_counts[name] > 1:
+            continue
+        cache_accesses = [access for access in accesses if access.name == name]
+        if not cache_accesses or any(
+            isinstance(access.offset, common.VariableOffset)
+            or access.offset.i != 0
+            or access.offset.j != 0
+            or access.data_index
+            for access in cache_accesses
+        ):
+            continue
+        k_offsets = [access.offset.k for access in cache_accesses]
+        windows[name] = (min(k_offsets), max(k_offsets))
+    return windows
+
+
+class NumbaCodegen(TemplatedGenerator):
+    """
+    Generate a module computing an OIR stencil in a Numba `njit` kernel with explicit loops.
+
+    Each horizontal execution is a loop nest over its extent, parallel along I. Parallel vertical
+    loops compute each horizontal execution on all its levels before the next one. Sequential
+    vertical loops iterate over the levels in the outermost loop, unless their columns are
+    independent (see :func:`columns_are_independent`): a single thread then computes all levels of
+    a column, without any synchronization between levels, and keeps the local k-caches of the loop
+    in scalars which are rotated after each level (see :func:`k_cache_windows`).
+
+    The `run` function of the module has the signature of the `gtc:numpy` computation modules.
+    """
+
+    def visit_DataType(self, node: common.DataType, **kwargs: Any) -> str:
+        if node == common.DataType.BOOL:
+            return "np.bool_"
+        return f"np.{node.name.lower()}"
+
+    def visit_BuiltInLiteral(
+        self, node: common.BuiltInLiteral, *, dtype: common.DataType, **kwargs: Any
+    ) -> str:
+        if node in (common.BuiltInLiteral.TRUE, common.BuiltInLiteral.FALSE):
+            return str(node == common.BuiltInLiteral.TRUE)
+        if node in (common.BuiltInLiteral.ZERO, common.BuiltInLiteral.ONE):
+            return str(int(node == common.BuiltInLiteral.ONE))
+        info = "finfo" if dtype in (common.DataType.FLOAT32, common.DataType.FLOAT64) else "iinfo"
+        return f"np.{info}({self.visit(dtype)}).{node}"
+
+    def visit_Literal(self, node: oir.Literal, **kwargs: Any) -> str:
+        return f"{self.visit(node.dtype)}({self.visit(node.value, dtype=node.dtype)})"
+
+    ScalarAccess = FormatTemplate("{name}")
+
+    def visit_FieldAccess(
+        self,
+        node: oir.FieldAccess,
+        *,
+        symtable: Dict[str, Any],
+        temporaries: Dict[str, BOUNDARY_T],
+        k_caches: Dict[str, Tuple[int, int]],
+        **kwargs: Any,
+    ) -> str:
+        if node.name in k_caches:
+            return _k_cache_name(node.name, node.offset.k)
+
+        kwargs = {**kwargs, "symtable": symtable, "temporaries": temporaries, "k_caches": k_caches}
+        # The K expression of variable offsets is left in GTIR by the lowering to OIR
+        variable_k = node.offset.k if isinstance(node.offset, common.VariableOffset) else None
+        indices = []
+        for axis, offset in enumerate(
+            (node.offset.i, node.offset.j, 0 if variable_k is not None else node.offset.k)
+        ):
+            if not symtable[node.name].dimensions[axis]:
+                continue
+            index = INDICES[axis]
+            if axis == 2 and variable_k is not None:
+                index = f"{index} + int({self.visit(variable_k, **kwargs)})"
+            if node.name in temporaries:
+                origin = temporaries[node.name][axis][0] if axis < 2 else 0
+                if node.name in kwargs.get("tile_temporaries", ()) and axis < 2:
+                    index = f"{index} - {TILE_STARTS[axis]}"
+                index = _plus(index, origin + offset)
+                if axis == 2 and (k_planes := symtable[node.name].k_planes) is not None:
+                    index = f"({index}) % {k_planes}"
+                indices.append(index)
+            else:
+                field_origin = f"_{node.name}_origin_[{len(indices)}]"
+                indices.append(_plus(f"{index} + {field_origin}", offset))
+        indices.extend(self.visit(node.data_index, **kwargs))
+        return f"{node.name}[{', '.join(indices)}]"
+
+    UnaryOp = FormatTemplate("({op} {expr})")
+
+    BinaryOp = FormatTemplate("({left} {op} {right})")
+
+    TernaryOp = FormatTemplate("({true_expr} if {cond} else {false_expr})")
+
+    Cast = FormatTemplate("{dtype}({expr})")
+
+    def visit_NativeFunction(self, node: common.NativeFunction, **kwargs: Any) -> str:
+        return NATIVE_FUNCTIONS.get(node, str(node))
+
+    NativeFuncCall = FormatTemplate("np.{func}({', '.join(args)})")
+
+    def visit_AxisIndex(self, node: oir.AxisIndex, **kwargs: Any) -> str:
+        return INDICES["IJK".index(node.axis.upper())]
+
+    def visit_HorizontalMask(self, node: oir.HorizontalMask, **kwargs: Any) -> str:
+        conditions = []
+        for index, size, interval in zip(INDICES, SIZES, node.intervals):
+            if interval.start is not None:
+                conditions.append(f"{_axis_bound(interval.start, size)} <= {index}")
+            if interval.end is not None:
+                conditions.append(f"{index} < {_axis_bound(interval.end, size)}")
+        return f"({' and '.join(conditions)})" if conditions else "True"
+
+    def visit_HorizontalSwitch(self, node: oir.HorizontalSwitch, **kwargs: Any) -> str:
+        result = self.visit(node.default, **kwargs)
+        for value in reversed(node.values):
+            mask, expr = self.visit(value.mask, **kwargs), self.visit(value.expr, **kwargs)
+            result = f"({expr} if {mask} else {result})"
+        return result
+
+    AssignStmt = FormatTemplate("{left} = {right}")
+
+    def visit_MaskStmt(self, node: oir.MaskStmt, **kwargs: Any) -> str:
+        header = f"{'while' if node.is_loop else 'if'} {self.visit(node.mask, **kwargs)}:"
+        return _nest([header], "\n".join(self.visit(node.body, **kwargs)))
+
+    def visit_For(self, node: oir.For, **kwargs: Any) -> str:
+        start, end = (
+            _axis_bound(bound, SIZES[2])
+            if isinstance(bound, common.AxisBound)
+            else self.visit(bound, **kwargs)
+            for bound in (node.start, node.end)
+        )
+        header = f"for {node.target_name} in range({start}, {end}, {node.inc}):"
+        return _nest([header], "\n".join(self.visit(node.body, **kwargs)))
+
+    LocalScalar = FormatTemplate("{name} = {dtype}(0)")
+
+    def visit_HorizontalExecution(
+        self,
+        node: oir.HorizontalExecution,
+        *,
+        block_extents: Dict[int, BOUNDARY_T],
+        headers: List[str],
+        columns: Optional[BOUNDARY_T] = None,
+        tile_size: Optional[Tuple[int, int]] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Render a horizontal execution within the loops over K given by `headers`.
+
+        Inside of the loops over the `columns` of a sequential vertical loop, the loops over the
+        extent of the horizontal execution are replaced by a check of the extent if it is smaller.
+        Inside of the loop over the tiles of a tiled vertical loop, the loops run over the current
+        tile of size `tile_size` extended by the extent of the horizontal execution.
+        """
+        extent = block_extents[id(node)]
+        if tile_size is not None:
+            headers = [*_tile_loop_headers(extent, tile_size), *headers]
+        elif columns is None:
+            headers = [*_loop_headers(extent), *headers]
+        else:
+            conditions = [
+                condition
+                for index, size, own, outer in zip(INDICES, SIZES, extent, columns)
+                for condition, guarded in (
+                    (f"{-own[0]} <= {index}", own[0] < outer[0]),
+                    (f"{index} < {_plus(size, own[1])}", own[1] < outer[1]),
+                )
+                if guarded
+            ]
+            if conditions:
+                headers = [*headers, f"if {' and '.join(conditions)}:"]
+        body = [*self.visit(node.declarations, **kwargs), *self.visit(node.body, **kwargs)]
+        return _nest(headers, "\n".join(body))
+
+    def visit_Interval(
+        self, node: oir.Interval, *, loop_order: common.LoopOrder, **kwargs: Any
+    ) -> str:
+        if loop_order == common.LoopOrder.BACKWARD:
+            start, end = _axis_bound(node.end, SIZES[2], -1), _axis_bound(node.start, SIZES[2], -1)
+            return f"for _k_ in range({start}, {end}, -1):"
+        start, end = _axis_bound(node.start, SIZES[2]), _axis_bound(node.end, SIZES[2])
+        return f"for _k_ in range({start}, {end}):"
+
+    def visit_VerticalLoop(
+        self,
+        node: oir.VerticalLoop,
+        *,
+        block_extents: Dict[int, BOUNDARY_T],
+        k_caches: Dict[int, Dict[str, Tuple[int, int]]],
+        **kwargs: Any,
+    ) -> str:
+        kwargs["block_extents"] = block_extents
+        loop_order = node.loop_order
+        if loop_order == common.LoopOrder.PARALLEL and node.tiling is not None:
+            return self._tiled_vertical_loop(node, **kwargs)
+        if loop_order == common.LoopOrder.PARALLEL:
+            return "\n".join(
+                self.visit(
+                    horizontal_execution,
+                    headers=[self.visit(section.interval, loop_order=loop_order)],
+                    k_caches={},
+                    **kwargs,
+                )
+                for section in node.sections
+                for horizontal_execution in section.horizontal_executions
+            )
+
+        if not columns_are_independent(node):
+            return "\n".join(
+                _nest(
+                    [self.visit(section.interval, loop_order=loop_order)],
+                    "\n".join(
+                        self.visit(section.horizontal_executions, headers=[], k_caches={}, **kwargs)
+                    ),
+                )
+                for section in node.sections
+            )
+
+        extents = [
+            block_extents[id(horizontal_execution)]
+            for horizontal_execution in node.iter_tree().if_isinstance(oir.HorizontalExecution)
+        ]
+        columns = (
+            (max(extent[0][0] for extent in extents), max(extent[0][1] for extent in extents)),
+            (max(extent[1][0] for extent in extents), max(extent[1][1] for extent in extents)),
+        )
+        loop_caches = k_caches[id(node)]
+        declarations: List[str] = []
+        rotations: List[str] = []
+        for name, (lower, upper) in loop_caches.items():
+            dtype = self.visit(kwargs["symtable"][name].dtype)
+            scalars = [_k_cache_name(name, offset) for offset in range(lower, upper + 1)]
+            declarations.extend(f"{scalar} = {dtype}(0)" for scalar in scalars)
+            if len(scalars) > 1:
+                # The value at offset `o` on the next level is the value at `o + 1` on this level
+                # in forward loops, at `o - 1` in backward loops
+                if loop_order == common.LoopOrder.FORWARD:
+                    targets, values = scalars[:-1], scalars[1:]
+                else:
+                    targets, values = scalars[1:], scalars[:-1]
+                rotations.append(f"{', '.join(targets)} = {', '.join(values)}")
+
+        sections = [
+            _nest(
+                [self.visit(section.interval, loop_order=loop_order)],
+                "\n".join(
+                    [
+                        *self.visit(
+                            section.horizontal_executions,
+                            headers=[],
+                            columns=columns,
+                            k_caches=loop_caches,
+                            **kwargs,
+                        ),
+                        *rotations,
+                    ]
+                ),
+            )
+            for section in node.sections
+        ]
+        return _nest(_loop_headers(columns), "\n".join([*declarations, *sections]))
+
+    def _tiled_vertical_loop(self, node: oir.VerticalLoop, **kwargs: Any) -> str:
+        """Render a tiled parallel vertical loop, the tiles are computed in parallel."""
+        assert node.tiling is not None
+        tile_size = node.tiling.tile_size
+        counts = [f"(({size} + {tile} - 1) // {tile})" for size, tile in zip(SIZES[:2], tile_size)]
+        headers = [f"for _t_ in numba.prange({counts[0]} * {counts[1]}):"]
+        starts = [
+            f"{TILE_STARTS[0]} = (_t_ // {counts[1]}) * {tile_size[0]}",
+            f"{TILE_STARTS[1]} = (_t_ % {counts[1]}) * {tile_size[1]}",
+        ]
+        # Temporaries accessed only in this loop are allocated per tile, halo included
+        tile_temporaries = [
+            decl
+            for decl in kwargs["symtable"].values()
+            if isinstance(decl, oir.Temporary)
+            and decl.name in kwargs["tiled_temporaries"].get(id(node), ())
+        ]
+        declarations = [
+            self.visit(decl, tile_size=tile_size, **kwargs) for decl in tile_temporaries
+        ]
+        kwargs["tile_temporaries"] = {decl.name for decl in tile_temporaries}
+        body = [
+            self.visit(
+                horizontal_execution,
+                headers=[self.visit(section.interval, loop_order=node.loop_order)],
+                k_caches={},
+                tile_size=tile_size,
+                **kwargs,
+            )
+            for section in node.sections
+            for horizontal_execution in section.horizontal_executions
+        ]
+        return _nest(headers, "\n".join([*starts, *declarations, *body]))
+
+    def visit_Temporary(
+        self,
+        node: oir.Temporary,
+        *,
+        temporaries: Dict[str, BOUNDARY_T],
+        tile_size: Optional[Tuple[int, int]] = None,
+        **kwargs: Any,
+    ) -> Union[str, Collection[str]]:
+        if node.name not in temporaries:
+            return ""
+        tiled_temporaries = kwargs["tiled_temporaries"]
+        if tile_size is None and any(node.name in names for names in tiled_temporaries.values()):
+            return ""
+        boundary = temporaries[node.name]
+        k_size = SIZES[2] if node.k_planes is None else node.k_planes
+        sizes = (*(SIZES[:2] if tile_size is None else tile_size), k_size)
+        shape = [
+            _plus(str(size), sum(boundary[axis]) if axis < 2 else 0)
+            for axis, size in enumerate(sizes)
+            if node.dimensions[axis]
+        ] + [str(dim) for dim in node.data_dims]
+        return self.generic_visit(node, shape=", ".join(shape) + "," * (len(shape) == 1), **kwargs)
+
+    Temporary = FormatTemplate("{name} = np.zeros(({shape}), dtype={dtype})")
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> Union[str, Collection[str]]:
+        field_extents, block_extents = compute_extents(node)
+        temporaries: Dict[str, BOUNDARY_T] = {}
+        for decl in node.declarations:
+            (i_lower, i_upper), (j_lower, j_upper) = field_extents[decl.name].to_boundary()[:2]
+            temporaries[decl.name] = ((i_lower, i_upper), (j_lower, j_upper))
+        loop_counts: Dict[str, int] = {}
+        for vertical_loop in node.vertical_loops:
+            for name in AccessCollector.apply(vertical_loop).fields():
+                loop_counts[name] = loop_counts.get(name, 0) + 1
+        k_caches = {
+            id(vertical_loop): k_cache_windows(
+                vertical_loop, loop_counts=loop_counts, temporaries=set(temporaries)
+            )
+            if vertical_loop.loop_order != common.LoopOrder.PARALLEL
+            and columns_are_independent(vertical_loop)
+            else {}
+            for vertical_loop in node.vertical_loops
+        }
+        for loop_caches in k_caches.values():
+            for name in loop_caches:
+                del temporaries[name]
+        tiled_temporaries = {
+            id(vertical_loop): {
+                name
+                for name in AccessCollector.apply(vertical_loop).fields()
+                if name in temporaries and loop_counts[name] == 1
+            }
+            for vertical_loop in node.vertical_loops
+            if vertical_loop.tiling is not None
+        }
+
+        # Including the GTIR accesses of the K expressions of variable offsets
+        accessed = {
+            *node.iter_tree().if_isinstance(common.FieldAccess).getattr("name"),
+            *node.iter_tree().if_isinstance(common.ScalarAccess).getattr("name"),
+        }
+        kernel_params: List[str] = []
+        kernel_args: List[str] = []
+        for decl in node.params:
+            if decl.name not in accessed:
+                continue
+            if isinstance(decl, oir.FieldDecl):
+                kernel_params.extend([decl.name, f"_{decl.name}_origin_"])
+                kernel_args.extend([f"np.asarray({decl.name})", f'tuple(_origin_["{decl.name}"])'])
+            else:
+                kernel_params.append(decl.name)
+                kernel_args.append(f"{self.visit(decl.dtype)}({decl.name})")
+
+        return self.generic_visit(
+            node,
+            signature=", ".join(
+                ["*", *(decl.name for decl in node.params), "_domain_", "_origin_"]
+            ),
+            kernel_params=", ".join([*kernel_params, "_domain_"]),
+            kernel_args=", ".join([*kernel_args, "tuple(_domain_)"]),
+            symtable=node.symtable_,
+            temporaries=temporaries,
+            block_extents={
+                key: tuple(tuple(axis) for axis in extent.to_boundary())
+                for key, extent in block_extents.items()
+            },
+            k_caches=k_caches,
+            tiled_temporaries=tiled_temporaries,
+            **kwargs,
+        )
+
+    Stencil = JinjaTemplate(
+        textwrap.dedent(
+            """\
+            import numba
+            import numpy as np
+
+
+            @numba.njit(parallel=True, cache=True, error_model="numpy")
+            def _kernel_({{ kernel_params }}):
+                _dI_, _dJ_, _dK_ = _domain_
+                {% for decl in declarations if decl %}{{ decl }}
+                {% endfor %}
+                {% for vertical_loop in vertical_loops %}{{ vertical_loop | indent(4) }}
+                {% endfor %}
+
+
+            def run({{ signature }}):
+                _kernel_({{ kernel_args }})
+            """
+        )
+    )
@@ -22,7 +22,7 @@ e.g. stage merging, staged computations to compute-on-the-fly, cache annotations
 """
 
 import sys
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pydantic import root_validator, validator
 
@@ -122,7 +122,8 @@ class LocalScalar(Decl):
 
 
 class Temporary(FieldDecl):
-    pass
+    #: Number of vertical levels stored, level `k` in plane `k % k_planes`, `None` for all levels
+    k_planes: Optional[int] = None
 
 
 class Interval(LocNode):
@@ -271,10 +272,24 @@ class VerticalLoopSection(LocNode):
     horizontal_executions: List[HorizontalExecution]
 
 
+class Tiling(LocNode):
+    """
+    Computation of a vertical loop by horizontal tiles.
+
+    Each tile of `tile_size` points is computed by all horizontal executions of the loop in turn,
+    each of them on the tile extended by its own extent. `halo` is the largest of these extents,
+    the region around a tile where values are recomputed.
+    """
+
+    tile_size: Tuple[int, int]
+    halo: common.IJExtent
+
+
 class VerticalLoop(LocNode):
     loop_order: common.LoopOrder
     sections: List[VerticalLoopSection]
     caches: List[CacheDesc]
+    tiling: Optional[Tiling] = None
 
     @validator("sections")
     def nonempty_loop(cls, v: List[VerticalLoopSection]) -> List[VerticalLoopSection]:
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import Any, Set, Union
+
+from eve import NodeTranslator
+from gtc import gtir
+from gtc.common import DataType
+
+
+FLOATING_POINT_DTYPES = (DataType.FLOAT32, DataType.FLOAT64)
+
+
+class _GTIRComputeDtype(NodeTranslator):
+    """
+    Sets the floating point precision of all computations, independently of the field precision.
+
+    Temporaries, literals and reads of floating point fields and scalars are converted to the
+    compute dtype, stores to API fields keep the dtype of the field declaration.
+
+    Precondition: all dtypes are resolved (no `None`, `Auto`, `Default`)
+    Postcondition: floating point expressions have the compute dtype, `upcast` is required to
+    make the conversion on assignment to API fields explicit
+    """
+
+    def visit_Stencil(self, node: gtir.Stencil, **kwargs: Any) -> gtir.Stencil:
+        temporaries = {tmp.name for loop in node.vertical_loops for tmp in loop.temporaries}
+        return self.generic_visit(node, temporaries=temporaries, **kwargs)
+
+    def visit_FieldDecl(
+        self, node: gtir.FieldDecl, *, temporaries: Set[str], compute_dtype: DataType, **kwargs: Any
+    ) -> gtir.FieldDecl:
+        if node.name in temporaries and node.dtype in FLOATING_POINT_DTYPES:
+            return node.copy(update={"dtype": compute_dtype})
+        return node
+
+    def visit_ParAssignStmt(self, node: gtir.ParAssignStmt, **kwargs: Any) -> gtir.ParAssignStmt:
+        return gtir.ParAssignStmt(
+            left=self.visit(node.left, is_lvalue=True, **kwargs),
+            right=self.visit(node.right, **kwargs),
+            loc=node.loc,
+        )
+
+    def visit_FieldAccess(
+        self,
+        node: gtir.FieldAccess,
+        *,
+        temporaries: Set[str],
+        compute_dtype: DataType,
+        is_lvalue: bool = False,
+        **kwargs: Any,
+    ) -> Union[gtir.FieldAccess, gtir.Cast]:
+        node = self.generic_visit(
+            node, temporaries=temporaries, compute_dtype=compute_dtype, **kwargs
+        )
+        if node.dtype not in FLOATING_POINT_DTYPES or node.dtype == compute_dtype:
+            return node
+        if node.name in temporaries:
+            return node.copy(update={"dtype": compute_dtype})
+        if is_lvalue:
+            return node
+        return gtir.Cast(dtype=compute_dtype, expr=node)
+
+    def visit_ScalarAccess(
+        self, node: gtir.ScalarAccess, *, compute_dtype: DataType, **kwargs: Any
+    ) -> Union[gtir.ScalarAccess, gtir.Cast]:
+        if node.dtype not in FLOATING_POINT_DTYPES or node.dtype == compute_dtype:
+            return node
+        return gtir.Cast(dtype=compute_dtype, expr=node)
+
+    def visit_Literal(
+        self, node: gtir.Literal, *, compute_dtype: DataType, **kwargs: Any
+    ) -> gtir.Literal:
+        if node.dtype not in FLOATING_POINT_DTYPES:
+            return node
+        return node.copy(update={"dtype": compute_dtype})
+
+
+def set_compute_dtype(node: gtir.Stencil, compute_dtype: DataType) -> gtir.Stencil:
+    if compute_dtype not in FLOATING_POINT_DTYPES:
+        raise ValueError(f"Invalid compute dtype '{compute_dtype}', must be a floating point type.")
+    return _GTIRComputeDtype().visit(node, compute_dtype=compute_dtype)
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import operator
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from eve import NodeTranslator
+from gtc import gtir
+from gtc.common import (
+    ArithmeticOperator,
+    BuiltInLiteral,
+    ComparisonOperator,
+    DataType,
+    ExprKind,
+    LogicalOperator,
+    NativeFunction,
+    UnaryOperator,
+    data_type_to_typestr,
+)
+
+
+#: Operations folded on literals, all of them are correctly rounded in IEEE arithmetic and thus
+#: give the same result at compile time as at run time. Integer division and modulo are not
+#: folded as their semantics differ between backends.
+_BINARY_OPS: Dict[Any, Callable[[Any, Any], Any]] = {
+    ArithmeticOperator.ADD: operator.add,
+    ArithmeticOperator.SUB: operator.sub,
+    ArithmeticOperator.MUL: operator.mul,
+    ArithmeticOperator.DIV: operator.truediv,
+    ComparisonOperator.GT: operator.gt,
+    ComparisonOperator.LT: operator.lt,
+    ComparisonOperator.GE: operator.ge,
+    ComparisonOperator.LE: operator.le,
+    ComparisonOperator.EQ: operator.eq,
+    ComparisonOperator.NE: operator.ne,
+    LogicalOperator.AND: np.logical_and,
+    LogicalOperator.OR: np.logical_or,
+}
+
+_UNARY_OPS: Dict[UnaryOperator, Callable[[Any], Any]] = {
+    UnaryOperator.POS: operator.pos,
+    UnaryOperator.NEG: operator.neg,
+    UnaryOperator.NOT: np.logical_not,
+}
+
+_NATIVE_FUNCTIONS: Dict[NativeFunction, Callable[..., Any]] = {
+    NativeFunction.ABS: np.abs,
+    NativeFunction.MIN: np.minimum,
+    NativeFunction.MAX: np.maximum,
+    NativeFunction.SQRT: np.sqrt,
+    NativeFunction.FLOOR: np.floor,
+    NativeFunction.CEIL: np.ceil,
+    NativeFunction.TRUNC: np.trunc,
+    NativeFunction.ISFINITE: np.isfinite,
+    NativeFunction.ISINF: np.isinf,
+    NativeFunction.ISNAN: np.isnan,
+}
+
+#: Largest integer exponent of `pow` expanded into multiplications
+MAX_POW_EXPANSION = 4
+
+
+def _scalar_type(dtype: DataType) -> type:
+    return np.dtype(data_type_to_typestr(dtype)).type
+
+
+def _value(node: gtir.Expr) -> Optional[Any]:
+    """Return the value of a literal as a NumPy scalar of its dtype, `None` if it is not known."""
+    if not isinstance(node, gtir.Literal):
+        return None
+    if node.dtype == DataType.BOOL:
+        return {
+            BuiltInLiteral.TRUE: np.bool_(True),
+            BuiltInLiteral.FALSE: np.bool_(False),
+            "True": np.bool_(True),
+            "False": np.bool_(False),
+        }.get(node.value)
+    if isinstance(node.value, BuiltInLiteral):
+        return None
+    try:
+        return _scalar_type(node.dtype)(node.value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _literal(value: Any, dtype: Optional[DataType]) -> Optional[gtir.Literal]:
+    """Return a literal of `value` converted to `dtype`, `None` if it can not be represented."""
+    if value is None or dtype is None:
+        return None
+    if dtype == DataType.BOOL:
+        return gtir.Literal(
+            value=BuiltInLiteral.TRUE if value else BuiltInLiteral.FALSE, dtype=dtype
+        )
+    value = _scalar_type(dtype)(value)
+    if not np.isfinite(value):
+        return None
+    return gtir.Literal(
+        value=repr(float(value)) if np.issubdtype(type(value), np.floating) else str(int(value)),
+        dtype=dtype,
+    )
+
+
+def _evaluate(func: Callable[..., Any], *values: Any) -> Optional[Any]:
+    with np.errstate(all="raise"):
+        try:
+            return func(*values)
+        except ArithmeticError:
+            return None
+
+
+def _is_integer(node: gtir.Expr) -> bool:
+    return node.dtype is not None and node.dtype < DataType.FLOAT32
+
+
+def _is(node: gtir.Expr, value: int) -> bool:
+    literal_value = _value(node)
+    return literal_value is not None and node.dtype != DataType.BOOL and literal_value == value
+
+
+def _fold_binary_op(node: gtir.BinaryOp) -> Optional[gtir.Expr]:
+    """Evaluate an operation on two literals."""
+    left_value, right_value = _value(node.left), _value(node.right)
+    if left_value is None or right_value is None or node.op not in _BINARY_OPS:
+        return None
+    if node.op == ArithmeticOperator.DIV and _is_integer(node.left):
+        return None
+    return _literal(_evaluate(_BINARY_OPS[node.op], left_value, right_value), node.dtype)
+
+
+def _simplify_logical_op(node: gtir.BinaryOp) -> Optional[gtir.Expr]:
+    """Simplify a logical operation with a literal operand."""
+    left_value, right_value = _value(node.left), _value(node.right)
+    if node.op == LogicalOperator.AND:
+        if left_value is not None:
+            return node.right if left_value else node.left
+        if right_value is not None:
+            return node.left if right_value else node.right
+    elif node.op == LogicalOperator.OR:
+        if left_value is not None:
+            return node.left if left_value else node.right
+        if right_value is not None:
+            return node.right if right_value else node.left
+    return None
+
+
+def _simplify_multiplicative_op(node: gtir.BinaryOp) -> Optional[gtir.Expr]:
+    """Simplify a multiplication or a division by one."""
+    if node.op == ArithmeticOperator.MUL:
+        if _is(node.left, 1):
+            return node.right
+        if _is(node.right, 1):
+            return node.left
+    elif node.op == ArithmeticOperator.DIV and _is(node.right, 1):
+        return node.left
+    return None
+
+
+def _simplify_additive_op(node: gtir.BinaryOp) -> Optional[gtir.Expr]:
+    """Simplify an addition or a subtraction of zero."""
+    if node.op == ArithmeticOperator.SUB and _is(node.right, 0):
+        return node.left
+    # x + 0.0 is not an identity for floating point numbers, -0.0 + 0.0 == 0.0
+    if node.op == ArithmeticOperator.ADD and _is_integer(node):
+        if _is(node.left, 0):
+            return node.right
+        if _is(node.right, 0):
+            return node.left
+    return None
+
+
+class _GTIRConstantFolding(NodeTranslator):
+    """
+    Folds operations on literals and simplifies algebraic identities.
+
+    Precondition: all dtype transitions are explicit via a `Cast` node (see `upcast`)
+    Postcondition: no operation with only literal operands remains for operations which give the
+    same result at compile time as at run time, if statements and while loops with literal
+    conditions are resolved
+    """
+
+    def visit_UnaryOp(self, node: gtir.UnaryOp, **kwargs: Any) -> gtir.Expr:
+        expr = self.visit(node.expr, **kwargs)
+        value = _value(expr)
+        if value is not None:
+            folded = _literal(_evaluate(_UNARY_OPS[node.op], value), node.dtype)
+            if folded is not None:
+                return folded
+        if node.op == UnaryOperator.POS:
+            return expr
+        if isinstance(expr, gtir.UnaryOp) and expr.op == node.op:
+            return expr.expr
+        return gtir.UnaryOp(op=node.op, expr=expr, loc=node.loc)
+
+    def visit_BinaryOp(self, node: gtir.BinaryOp, **kwargs: Any) -> gtir.Expr:
+        left = self.visit(node.left, **kwargs)
+        right = self.visit(node.right, **kwargs)
+        result = gtir.BinaryOp(op=node.op, left=left, right=right, loc=node.loc)
+        for simplify in (
+            _fold_binary_op,
+            _simplify_logical_op,
+            _simplify_multiplicative_op,
+            _simplify_additive_op,
+        ):
+            simplified = simplify(result)
+            if simplified is not None:
+                return simplified
+        return result
+
+    def visit_TernaryOp(self, node: gtir.TernaryOp, **kwargs: Any) -> gtir.Expr:
+        cond = self.visit(node.cond, **kwargs)
+        true_expr = self.visit(node.true_expr, **kwargs)
+        false_expr = self.visit(node.false_expr, **kwargs)
+        value = _value(cond)
+        if value is not None:
+            return true_expr if value else false_expr
+        return gtir.TernaryOp(cond=cond, true_expr=true_expr, false_expr=false_expr, loc=node.loc)
+
+    def visit_Cast(self, node: gtir.Cast, **kwargs: Any) -> gtir.Expr:
+        expr = self.visit(node.expr, **kwargs)
+        if expr.dtype == node.dtype:
+            return expr
+        value = _value(expr)
+        if value is not None and node.dtype != DataType.BOOL:
+            folded = _literal(_evaluate(_scalar_type(node.dtype), value), node.dtype)
+            if folded is not None:
+                return folded
+        return gtir.Cast(dtype=node.dtype, expr=expr, loc=node.loc)
+
+    def visit_NativeFuncCall(self, node: gtir.NativeFuncCall, **kwargs: Any) -> gtir.Expr:
+        args = self.visit(node.args, **kwargs)
+        result = gtir.NativeFuncCall(func=node.func, args=args, loc=node.loc)
+        values = [_value(arg) for arg in args]
+
+        if node.func in _NATIVE_FUNCTIONS and all(value is not None for value in values):
+            value = _evaluate(_NATIVE_FUNCTIONS[node.func], *values)
+            folded = _literal(value, result.dtype)
+            if folded is not None:
+                return folded
+
+        if node.func == NativeFunction.POW and values[1] is not None:
+            exponent = values[1]
+            if exponent in range(1, MAX_POW_EXPANSION + 1):
+                # The repeated base is computed only once by common subexpression elimination
+                product = args[0]
+                for _ in range(int(exponent) - 1):
+                    product = gtir.BinaryOp(
+                        op=ArithmeticOperator.MUL, left=product, right=args[0], loc=node.loc
+                    )
+                return self.visit(product, **kwargs)
+        return result
+
+    def _visit_stmts(self, stmts: List[gtir.Stmt], **kwargs: Any) -> List[gtir.Stmt]:
+        result: List[gtir.Stmt] = []
+        for stmt in stmts:
+            folded = self.visit(stmt, **kwargs)
+            result.extend(folded if isinstance(folded, list) else [folded])
+        return result
+
+    def _visit_if_stmt(
+        self, node: Union[gtir.FieldIfStmt, gtir.ScalarIfStmt], **kwargs: Any
+    ) -> Union[gtir.Stmt, List[gtir.Stmt]]:
+        cond = self.visit(node.cond, **kwargs)
+        true_branch = self.visit(node.true_branch, **kwargs)
+        false_branch = self.visit(node.false_branch, **kwargs)
+        value = _value(cond)
+        if value is not None:
+            branch = true_branch if value else false_branch
+            return branch.body if branch is not None else []
+        # A field condition reduced to a scalar expression no longer depends on the grid point
+        if_stmt_type: Callable[..., gtir.Stmt] = gtir.ScalarIfStmt
+        if cond.kind == ExprKind.FIELD:
+            if_stmt_type = gtir.FieldIfStmt
+        return if_stmt_type(
+            cond=cond, true_branch=true_branch, false_branch=false_branch, loc=node.loc
+        )
+
+    def visit_FieldIfStmt(
+        self, node: gtir.FieldIfStmt, **kwargs: Any
+    ) -> Union[gtir.Stmt, List[gtir.Stmt]]:
+        return self._visit_if_stmt(node, **kwargs)
+
+    def visit_ScalarIfStmt(
+        self, node: gtir.ScalarIfStmt, **kwargs: Any
+    ) -> Union[gtir.Stmt, List[gtir.Stmt]]:
+        return self._visit_if_stmt(node, **kwargs)
+
+    def visit_While(self, node: gtir.While, **kwargs: Any) -> Union[gtir.Stmt, List[gtir.Stmt]]:
+        cond = self.visit(node.cond, **kwargs)
+        if _value(cond) is not None and not _value(cond):
+            return []
+        return node.copy(update={"cond": cond, "body": self._visit_stmts(node.body, **kwargs)})
+
+    def visit_BlockStmt(self, node: gtir.BlockStmt, **kwargs: Any) -> gtir.BlockStmt:
+        return node.copy(update={"body": self._visit_stmts(node.body, **kwargs)})
+
+    def visit_For(self, node: gtir.For, **kwargs: Any) -> gtir.For:
+        return node.copy(
+            update={
+                "start": self.visit(node.start, **kwargs),
+                "end": self.visit(node.end, **kwargs),
+                "body": self._visit_stmts(node.body, **kwargs),
+            }
+        )
+
+    def visit_VerticalLoop(self, node: gtir.VerticalLoop, **kwargs: Any) -> gtir.VerticalLoop:
+        return node.copy(update={"body": self._visit_stmts(node.body, **kwargs)})
+
+
+def fold_constants(node: gtir.Stencil) -> gtir.Stencil:
+    return _GTIRConstantFolding().visit(node)
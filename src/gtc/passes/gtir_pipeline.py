@@ -14,13 +14,19 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import functools
 from typing import Callable, Dict, Optional, Sequence, Tuple
 
 from gtc import gtir
+from gtc.common import DataType
 from gtc.passes.gtir_check_single_iteration import check_single_iteration
+from gtc.passes.gtir_compute_dtype import set_compute_dtype
+from gtc.passes.gtir_constant_folding import fold_constants
 from gtc.passes.gtir_dtype_resolver import resolve_dtype
 from gtc.passes.gtir_prune_unused_parameters import prune_unused_parameters
 from gtc.passes.gtir_upcaster import upcast
+from gtc.passes.pass_cache import PassCache, step_id
+from gtc.passes.pass_instrumentation import PassInstrumentation, pass_name
 
 
 PASS_T = Callable[[gtir.Stencil], gtir.Stencil]
@@ -30,20 +36,61 @@ class GtirPipeline:
     """
     GTIR passes pipeline runs passes in order and allows skipping.
 
-    May only call existing passes and may not contain any pass logic itself.
+    May only call existing passes and may not contain any pass logic itself. Results of the
+    passes are reused from and stored in `pass_cache` if it is set. Statistics of the passes
+    are recorded by `instrumentation` if it is set.
     """
 
-    def __init__(self, node: gtir.Stencil):
+    def __init__(
+        self,
+        node: gtir.Stencil,
+        *,
+        compute_dtype: Optional[DataType] = None,
+        pass_cache: Optional[PassCache] = None,
+        instrumentation: Optional[PassInstrumentation] = None,
+    ):
         self.gtir = node
+        self.compute_dtype = compute_dtype
+        self.pass_cache = pass_cache
+        self.instrumentation = instrumentation
         self._cache: Dict[Tuple[PASS_T, ...], gtir.Stencil] = {}
+        self._set_compute_dtype: Optional[PASS_T] = (
+            functools.partial(set_compute_dtype, compute_dtype=compute_dtype)
+            if compute_dtype is not None
+            else None
+        )
 
     def steps(self) -> Sequence[PASS_T]:
-        return [prune_unused_parameters, resolve_dtype, upcast, check_single_iteration]
+        if self._set_compute_dtype:
+            return [
+                resolve_dtype,
+                self._set_compute_dtype,
+                upcast,
+                fold_constants,
+                prune_unused_parameters,
+                check_single_iteration,
+            ]
+        return [
+            resolve_dtype,
+            upcast,
+            fold_constants,
+            prune_unused_parameters,
+            check_single_iteration,
+        ]
+
+    def _instrumented(self, step: PASS_T) -> PASS_T:
+        if self.instrumentation is None:
+            return step
+        return functools.partial(self.instrumentation.apply, pass_name(step), step)
 
     def apply(self, steps: Sequence[PASS_T]) -> gtir.Stencil:
+        if self.pass_cache is not None:
+            return self.pass_cache.apply(
+                self.gtir, [(step_id(step), self._instrumented(step)) for step in steps]
+            )
         result = self.gtir
         for step in steps:
-            result = step(result)
+            result = self._instrumented(step)(result)
         return result
 
     def _get_cached(self, steps: Sequence[PASS_T]) -> Optional[gtir.Stencil]:
@@ -151,6 +151,7 @@ class PruneKCacheFills(NodeTranslator):
     A fill is classified as required if at least one of the two following conditions holds in any of the loop sections:
     * There is a read with offset in the direction of looping.
     * The first centered access is a read access.
+    * The field is written conditionally, i.e. in a mask statement.
     If none of the conditions holds for any loop section, the fill is considered as unneeded.
     """
 
@@ -169,10 +170,17 @@ class PruneKCacheFills(NodeTranslator):
             accesses = AccessCollector.apply(section)
             offsets = accesses.offsets()
             center_accesses = [a for a in accesses.ordered_accesses() if a.offset == (0, 0, 0)]
+            conditional_writes = {
+                field
+                for mask_stmt in section.iter_tree().if_isinstance(oir.MaskStmt)
+                for field in AccessCollector.apply(mask_stmt).write_fields()
+            }
 
             def requires_fill(field: str) -> bool:
                 if field not in offsets:
                     return False
+                if field in conditional_writes:
+                    return True
                 k_offsets = (o[2] for o in offsets[field])
                 if node.loop_order == common.LoopOrder.FORWARD and max(k_offsets) > 0:
                     return True
@@ -308,6 +316,8 @@ class FillFlushToLocalKCaches(NodeTranslator):
         Returns:
             A dict, mapping field names to min and max read offsets relative to loop order (i.e., positive means in the direction of the loop order).
 
+        Conditional writes keep the previous value where the condition does not hold, they are
+        thus treated like reads.
         """
 
         def directional_k_offset(offset: Tuple[int, int, int]) -> int:
@@ -315,6 +325,9 @@ class FillFlushToLocalKCaches(NodeTranslator):
             return offset[2] if loop_order == common.LoopOrder.FORWARD else -offset[2]
 
         read_offsets = AccessCollector.apply(section).read_offsets()
+        for mask_stmt in section.iter_tree().if_isinstance(oir.MaskStmt):
+            for field, offsets in AccessCollector.apply(mask_stmt).write_offsets().items():
+                read_offsets.setdefault(field, set()).update(offsets)
         return {
             field: (
                 min(directional_k_offset(o) for o in offsets),
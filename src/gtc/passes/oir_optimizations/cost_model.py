@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from eve import Node
+from gtc import common, oir
+
+
+__all__ = ["CostModel", "CPU_COST_MODEL", "GPU_COST_MODEL"]
+
+
+_NodeOrNodes = Union[Node, List[Node]]
+
+
+def _iter_tree(node: _NodeOrNodes) -> Iterator[Node]:
+    if isinstance(node, list):
+        for item in node:
+            yield from item.iter_tree()
+    else:
+        yield from node.iter_tree()
+
+
+def _itemsize(dtype: Optional[common.DataType]) -> int:
+    assert dtype is not None
+    return np.dtype(common.data_type_to_typestr(dtype)).itemsize
+
+
+def _default_function_costs() -> Dict[common.NativeFunction, float]:
+    nf = common.NativeFunction
+    return {
+        nf.SIN: 40.0,
+        nf.COS: 40.0,
+        nf.TAN: 40.0,
+        nf.ARCSIN: 40.0,
+        nf.ARCCOS: 40.0,
+        nf.ARCTAN: 40.0,
+        nf.EXP: 40.0,
+        nf.LOG: 40.0,
+        nf.POW: 40.0,
+        nf.SQRT: 10.0,
+    }
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Per grid point cost estimate of horizontal executions.
+
+    The cost of a horizontal execution is the weighted sum of its floating point operations and
+    of the bytes of the fields it streams from and to memory. Every field read or written is
+    counted once per horizontal execution, whatever the number of offsets it is accessed at: the
+    neighbouring points are assumed to be in cache. Native functions are weighted by their
+    `function_costs` (1 if not given).
+
+    Register pressure is estimated as the number of distinct values a point needs: local
+    scalars plus field values at distinct offsets. Horizontal executions above
+    `max_registers` are not created by merging, `None` disables the limit.
+
+    Horizontal tiles are sized such that their working set fits in `cache_size` bytes.
+    """
+
+    #: Cost of a floating point operation
+    flop_cost: float = 1.0
+    #: Cost of streaming a byte from or to memory
+    byte_cost: float = 4.0
+    #: Cost of native functions in floating point operations
+    function_costs: Dict[common.NativeFunction, float] = field(
+        default_factory=_default_function_costs
+    )
+    #: Largest number of values of a point in a horizontal execution
+    max_registers: Optional[int] = 256
+    #: Bytes of cache available to the working set of a core
+    cache_size: int = 1 << 20
+
+    def flops(self, node: _NodeOrNodes) -> float:
+        """Count the floating point operations per point."""
+        result = 0.0
+        for child in _iter_tree(node):
+            if isinstance(child, (oir.UnaryOp, oir.BinaryOp, oir.TernaryOp)):
+                result += 1.0
+            elif isinstance(child, oir.NativeFuncCall):
+                result += self.function_costs.get(child.func, 1.0)
+        return result
+
+    def loads(self, node: _NodeOrNodes) -> int:
+        """Count the bytes read from memory per point."""
+        lefts = {id(child.left) for child in _iter_tree(node) if isinstance(child, oir.AssignStmt)}
+        reads = {
+            child.name: _itemsize(child.dtype)
+            for child in _iter_tree(node)
+            if isinstance(child, oir.FieldAccess) and id(child) not in lefts
+        }
+        return sum(reads.values())
+
+    def stores(self, node: _NodeOrNodes) -> int:
+        """Count the bytes written to memory per point."""
+        writes = {
+            child.left.name: _itemsize(child.left.dtype)
+            for child in _iter_tree(node)
+            if isinstance(child, oir.AssignStmt) and isinstance(child.left, oir.FieldAccess)
+        }
+        return sum(writes.values())
+
+    def register_pressure(self, node: oir.HorizontalExecution) -> int:
+        """Count the distinct values of a point."""
+        field_values = {
+            (child.name, *child.offset.to_dict().values())
+            for child in node.iter_tree().if_isinstance(oir.FieldAccess)
+        }
+        return len(node.declarations) + len(field_values)
+
+    def fits(self, node: oir.HorizontalExecution) -> bool:
+        """Check that the register pressure of `node` is within the limit."""
+        return self.max_registers is None or self.register_pressure(node) <= self.max_registers
+
+    def cost(self, horizontal_executions: List[oir.HorizontalExecution]) -> float:
+        """Estimate the cost per point of executing `horizontal_executions` in turn."""
+        return sum(
+            self.flop_cost * self.flops(he) + self.byte_cost * (self.loads(he) + self.stores(he))
+            for he in horizontal_executions
+        )
+
+
+#: Cost model of a multicore CPU, about 4 floating point operations per byte of bandwidth
+CPU_COST_MODEL = CostModel()
+
+#: Cost model of a GPU: higher arithmetic intensity, fewer registers per thread for occupancy
+GPU_COST_MODEL = CostModel(byte_cost=10.0, max_registers=128)
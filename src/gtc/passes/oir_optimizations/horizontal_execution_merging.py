@@ -14,30 +14,56 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from eve import NodeTranslator
 from gtc import common, oir
 from gtc.common import GTCPostconditionError, GTCPreconditionError
 
-from .utils import AccessCollector, symbol_name_creator
+from .cost_model import CostModel
+from .utils import AccessCollector, compute_extents, symbol_name_creator
 
 
+if TYPE_CHECKING:
+    from gt4py.definitions import Extent
+
+
+@dataclass
 class GreedyMerging(NodeTranslator):
     """Merges consecutive horizontal executions if there are no write/read conflicts.
 
+    When applied to a whole stencil, only horizontal executions with the same extent are merged,
+    so that no field is computed on a larger region than before (in particular, API fields are
+    never written outside of their compute domain). Merges that would exceed the register
+    pressure limit of the cost model are not done.
+
     Preconditions: All vertical loops are non-empty.
     Postcondition: The number of horizontal executions is equal or smaller than before.
     """
 
+    cost_model: CostModel = field(default_factory=CostModel)
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        _, block_extents = compute_extents(node)
+        return self.generic_visit(node, block_extents=block_extents, **kwargs)
+
     def visit_VerticalLoopSection(
-        self, node: oir.VerticalLoopSection, **kwargs: Any
+        self,
+        node: oir.VerticalLoopSection,
+        *,
+        block_extents: Optional[Dict[int, "Extent"]] = None,
+        **kwargs: Any,
     ) -> oir.VerticalLoopSection:
         if not node.horizontal_executions:
             raise GTCPreconditionError(expected="non-empty vertical loop")
+        extents = [
+            block_extents[id(horizontal_execution)] if block_extents is not None else None
+            for horizontal_execution in node.horizontal_executions
+        ]
         result = self.generic_visit(node, **kwargs)
         horizontal_executions = [result.horizontal_executions[0]]
+        previous_extent = extents[0]
         accesses = AccessCollector.apply(horizontal_executions[-1])
 
         def ij_offsets(
@@ -49,7 +75,7 @@ class GreedyMerging(NodeTranslator):
 
         previous_reads = ij_offsets(accesses.read_offsets())
         previous_writes = ij_offsets(accesses.write_offsets())
-        for horizontal_execution in result.horizontal_executions[1:]:
+        for horizontal_execution, extent in zip(result.horizontal_executions[1:], extents[1:]):
             accesses = AccessCollector.apply(horizontal_execution)
             current_reads = ij_offsets(accesses.read_offsets())
             current_writes = ij_offsets(accesses.write_offsets())
@@ -64,14 +90,20 @@ class GreedyMerging(NodeTranslator):
                 if field in previous_reads
                 and any(o[:2] != (0, 0) for o in offsets ^ previous_reads[field])
             }
-            if not conflicting:
+            merged = oir.HorizontalExecution(
+                body=horizontal_executions[-1].body + horizontal_execution.body,
+                declarations=horizontal_executions[-1].declarations
+                + horizontal_execution.declarations,
+            )
+            if not conflicting and extent == previous_extent and self.cost_model.fits(merged):
                 horizontal_executions[-1].body += horizontal_execution.body
-                for field, writes in current_writes.items():
-                    previous_writes.setdefault(field, set()).update(writes)
-                for field, reads in current_reads.items():
-                    previous_reads.setdefault(field, set()).update(reads)
+                for name, writes in current_writes.items():
+                    previous_writes.setdefault(name, set()).update(writes)
+                for name, reads in current_reads.items():
+                    previous_reads.setdefault(name, set()).update(reads)
             else:
                 horizontal_executions.append(horizontal_execution)
+                previous_extent = extent
                 previous_writes = current_writes
                 previous_reads = current_reads
         result.horizontal_executions = horizontal_executions
@@ -86,13 +118,16 @@ class GreedyMerging(NodeTranslator):
 class OnTheFlyMerging(NodeTranslator):
     """Merges consecutive horizontal executions inside parallel vertical loops by introducing redundant computations.
 
+    A horizontal execution is merged into the following ones only if the cost model predicts a
+    gain: the memory traffic saved by not storing and loading its outputs must be worth more than
+    the computations added by evaluating its body once per offset its outputs are read at. The
+    merged horizontal executions must also fit the register pressure limit of the cost model.
+
     Limitations:
     * Works on the level of whole horizontal executions, no full dependency analysis is performed (common subexpression and dead code eliminitation at a later stage can work around this limitation).
-    * The chosen default merge limits are totally arbitrary.
     """
 
-    max_horizontal_execution_body_size: int = 100
-    allow_expensive_function_duplication: bool = False
+    cost_model: CostModel = field(default_factory=CostModel)
 
     def visit_CartesianOffset(
         self,
@@ -143,32 +178,13 @@ class OnTheFlyMerging(NodeTranslator):
         def first_fields_rewritten_later() -> bool:
             return bool(first_accesses.fields() & other_accesses.write_fields())
 
-        def first_has_large_body() -> bool:
-            return len(first.body) > self.max_horizontal_execution_body_size
-
-        def first_has_expensive_function_call() -> bool:
-            if self.allow_expensive_function_duplication:
-                return False
-            nf = common.NativeFunction
-            expensive_calls = {
-                nf.SIN,
-                nf.COS,
-                nf.TAN,
-                nf.ARCSIN,
-                nf.ARCCOS,
-                nf.ARCTAN,
-                nf.SQRT,
-                nf.EXP,
-                nf.LOG,
-            }
-            calls = first.iter_tree().if_isinstance(oir.NativeFuncCall).getattr("func")
-            return any(call in expensive_calls for call in calls)
+        def first_writes_api_fields() -> bool:
+            return any(
+                not isinstance(symtable[name], oir.Temporary)
+                for name in first_accesses.write_fields()
+            )
 
-        if (
-            first_fields_rewritten_later()
-            or first_has_large_body()
-            or first_has_expensive_function_call()
-        ):
+        if first_fields_rewritten_later() or first_writes_api_fields():
             return [first] + self._merge(others, symtable, new_symbol_name)
 
         writes = first_accesses.write_fields()
@@ -209,6 +225,12 @@ class OnTheFlyMerging(NodeTranslator):
                 )
             others_otf.append(merged)
 
+        if self.cost_model.cost(others_otf) >= self.cost_model.cost(
+            horizontal_executions
+        ) or not all(
+            self.cost_model.fits(horizontal_execution) for horizontal_execution in others_otf
+        ):
+            return [first] + self._merge(others, symtable, new_symbol_name)
         return self._merge(others_otf, symtable, new_symbol_name)
 
     def visit_VerticalLoopSection(
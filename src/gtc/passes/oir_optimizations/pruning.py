@@ -14,9 +14,9 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import Any
+from typing import Any, List, Set
 
-from eve import NOTHING, NodeTranslator
+from eve import NOTHING, Node, NodeTranslator
 from gtc import oir
 
 
@@ -41,3 +41,126 @@ class NoFieldAccessPruning(NodeTranslator):
         if not sections:
             return NOTHING
         return oir.VerticalLoop(loop_order=node.loop_order, sections=sections, caches=node.caches)
+
+
+def _read_names(node: Node) -> Set[str]:
+    """Names of all fields and scalars read in `node`, including reads in offsets of writes."""
+    lefts = {id(left) for left in node.iter_tree().if_isinstance(oir.AssignStmt).getattr("left")}
+    return (
+        node.iter_tree()
+        .if_isinstance(oir.FieldAccess, oir.ScalarAccess)
+        .filter(lambda access: id(access) not in lefts)
+        .getattr("name")
+        .to_set()
+    )
+
+
+def _prune_dead_stmts(
+    stmts: List[oir.Stmt], *, live: Set[str], local_scalars: Set[str], conditional: bool
+) -> List[oir.Stmt]:
+    """Remove assignments to local scalars which are not read afterwards and empty statements.
+
+    Walks `stmts` backwards and updates `live` to the names read before `stmts`. Assignments in
+    conditional blocks do not end the liveness of a local scalar.
+    """
+    result: List[oir.Stmt] = []
+    for stmt in reversed(stmts):
+        if isinstance(stmt, oir.AssignStmt):
+            if isinstance(stmt.left, oir.ScalarAccess) and stmt.left.name in local_scalars:
+                if stmt.left.name not in live:
+                    continue
+                if not conditional:
+                    live.discard(stmt.left.name)
+            live |= _read_names(stmt)
+            result.append(stmt)
+        elif isinstance(stmt, (oir.MaskStmt, oir.For)):
+            if isinstance(stmt, oir.For) or stmt.is_loop:
+                # Values written in one iteration can be read in the next one
+                live |= _read_names(stmt)
+            body = _prune_dead_stmts(
+                stmt.body, live=live, local_scalars=local_scalars, conditional=True
+            )
+            if not body:
+                continue
+            live |= _read_names(stmt.copy(update={"body": []}))
+            result.append(stmt.copy(update={"body": body}))
+        else:
+            live |= _read_names(stmt)
+            result.append(stmt)
+    return result[::-1]
+
+
+class DeadCodeElimination(NodeTranslator):
+    """Removes computations whose results are never used.
+
+    Assignments to temporaries which are never read and assignments to local scalars which are
+    not read before being overwritten or going out of scope are removed, as are the declarations
+    and caches of such variables. Mask statements, loops, horizontal executions, sections and
+    vertical loops left empty are removed as well. Removing a store can make others dead, the
+    pass is thus iterated to a fixed point.
+    """
+
+    def visit_AssignStmt(
+        self, node: oir.AssignStmt, *, dead_temporaries: Set[str], **kwargs: Any
+    ) -> Any:
+        if isinstance(node.left, oir.FieldAccess) and node.left.name in dead_temporaries:
+            return NOTHING
+        return node
+
+    def visit_HorizontalExecution(self, node: oir.HorizontalExecution, **kwargs: Any) -> Any:
+        body = _prune_dead_stmts(
+            self.visit(node.body, **kwargs),
+            live=set(),
+            local_scalars={decl.name for decl in node.declarations},
+            conditional=False,
+        )
+        if not body:
+            return NOTHING
+        used_names = {
+            name
+            for stmt in body
+            for name in stmt.iter_tree().if_isinstance(oir.ScalarAccess).getattr("name")
+        }
+        return oir.HorizontalExecution(
+            body=body,
+            declarations=[decl for decl in node.declarations if decl.name in used_names],
+            loc=node.loc,
+        )
+
+    def visit_VerticalLoopSection(self, node: oir.VerticalLoopSection, **kwargs: Any) -> Any:
+        horizontal_executions = self.visit(node.horizontal_executions, **kwargs)
+        if not horizontal_executions:
+            return NOTHING
+        return oir.VerticalLoopSection(
+            interval=node.interval, horizontal_executions=horizontal_executions, loc=node.loc
+        )
+
+    def visit_VerticalLoop(
+        self, node: oir.VerticalLoop, *, dead_temporaries: Set[str], **kwargs: Any
+    ) -> Any:
+        sections = self.visit(node.sections, dead_temporaries=dead_temporaries, **kwargs)
+        if not sections:
+            return NOTHING
+        return oir.VerticalLoop(
+            loop_order=node.loop_order,
+            sections=sections,
+            caches=[cache for cache in node.caches if cache.name not in dead_temporaries],
+            loc=node.loc,
+        )
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        while True:
+            reads = {name for loop in node.vertical_loops for name in _read_names(loop)}
+            dead_temporaries = {str(decl.name) for decl in node.declarations} - reads
+            vertical_loops = self.visit(node.vertical_loops, dead_temporaries=dead_temporaries)
+            if vertical_loops == node.vertical_loops and not dead_temporaries:
+                return node
+            node = oir.Stencil(
+                name=node.name,
+                params=node.params,
+                vertical_loops=vertical_loops,
+                declarations=[
+                    decl for decl in node.declarations if decl.name not in dead_temporaries
+                ],
+                loc=node.loc,
+            )
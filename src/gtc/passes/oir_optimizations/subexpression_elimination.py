@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import collections
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from eve import Node, NodeTranslator
+from gtc import common, oir
+
+from .utils import symbol_name_creator
+
+
+#: Expressions worth computing once, accesses and literals are as cheap as reading a scalar
+_COMPUTED_EXPRS = (oir.UnaryOp, oir.BinaryOp, oir.TernaryOp, oir.NativeFuncCall, oir.Cast)
+
+#: Backends lower horizontal regions from the statement they are used in, they are never hoisted
+_HORIZONTAL_EXPRS = (oir.HorizontalMask, oir.HorizontalSpecialization, oir.HorizontalSwitch)
+
+
+def expr_key(node: Any) -> Hashable:
+    """Return a hashable key of an expression tree, equal for structurally equal expressions."""
+    if isinstance(node, Node):
+        return (
+            type(node).__name__,
+            *((name, expr_key(value)) for name, value in node.iter_children() if name != "loc"),
+        )
+    if isinstance(node, (list, tuple)):
+        return tuple(expr_key(value) for value in node)
+    return node
+
+
+def _subexpressions(node: oir.Expr) -> Iterator[oir.Expr]:
+    """Yield the computed subexpressions of `node` which are evaluated unconditionally."""
+    if (
+        isinstance(node, _COMPUTED_EXPRS)
+        and node.kind == common.ExprKind.FIELD
+        and not node.iter_tree().if_isinstance(*_HORIZONTAL_EXPRS).to_list()
+    ):
+        yield node
+    if isinstance(node, oir.TernaryOp):
+        yield from _subexpressions(node.cond)
+    elif isinstance(node, (oir.UnaryOp, oir.Cast)):
+        yield from _subexpressions(node.expr)
+    elif isinstance(node, oir.BinaryOp):
+        yield from _subexpressions(node.left)
+        yield from _subexpressions(node.right)
+    elif isinstance(node, oir.NativeFuncCall):
+        for arg in node.args:
+            yield from _subexpressions(arg)
+
+
+def _evaluated_expr(stmt: oir.Stmt) -> Optional[oir.Expr]:
+    """Return the expression evaluated once, before any write, by a statement of a block."""
+    if isinstance(stmt, oir.AssignStmt):
+        return stmt.right
+    if isinstance(stmt, oir.MaskStmt) and not stmt.is_loop:
+        return stmt.mask
+    return None
+
+
+def _written_names(stmt: oir.Stmt) -> Set[str]:
+    names = stmt.iter_tree().if_isinstance(oir.AssignStmt).getattr("left").getattr("name").to_set()
+    if isinstance(stmt, oir.For):
+        names.add(stmt.target_name)
+    return names
+
+
+def _read_names(expr: oir.Expr) -> Set[str]:
+    return (
+        expr.iter_tree().if_isinstance(oir.FieldAccess, oir.ScalarAccess).getattr("name").to_set()
+    )
+
+
+class _ReplaceSubexpression(NodeTranslator):
+    def visit_Expr(self, node: oir.Expr, *, key: Hashable, access: oir.ScalarAccess) -> oir.Expr:
+        if isinstance(node, _COMPUTED_EXPRS) and expr_key(node) == key:
+            return access
+        if isinstance(node, oir.TernaryOp):
+            return oir.TernaryOp(
+                cond=self.visit(node.cond, key=key, access=access),
+                true_expr=node.true_expr,
+                false_expr=node.false_expr,
+            )
+        if isinstance(node, _COMPUTED_EXPRS):
+            return self.generic_visit(node, key=key, access=access)
+        return node
+
+
+class CommonSubexpressionElimination(NodeTranslator):
+    """Computes repeated expressions once into local scalars.
+
+    Within the statements of each block of a horizontal execution, an expression computed by
+    several statements (or several times in one statement) is assigned to a new local scalar
+    before its first use and replaced by the scalar. Two expressions are only merged if they are
+    structurally equal, offsets of field accesses included, and if none of the fields or scalars
+    they read is written in between. Bodies of mask statements and loops are separate blocks.
+
+    Only expressions which are evaluated unconditionally and have field kind are considered, the
+    branches of ternary operators and horizontal switches are left untouched.
+    """
+
+    def _eliminate(
+        self,
+        stmts: List[oir.Stmt],
+        *,
+        new_symbol_name: Callable[[str], str],
+        declarations: List[oir.LocalScalar],
+    ) -> List[oir.Stmt]:
+        while True:
+            occurrences: Dict[Tuple[Hashable, Tuple], List[int]] = collections.defaultdict(list)
+            exprs: Dict[Tuple[Hashable, Tuple], oir.Expr] = {}
+            versions: Dict[str, int] = collections.Counter()
+            for index, stmt in enumerate(stmts):
+                evaluated = _evaluated_expr(stmt)
+                if evaluated is not None:
+                    for expr in _subexpressions(evaluated):
+                        reads = tuple(sorted((name, versions[name]) for name in _read_names(expr)))
+                        key = (expr_key(expr), reads)
+                        occurrences[key].append(index)
+                        exprs.setdefault(key, expr)
+                for name in _written_names(stmt):
+                    versions[name] += 1
+
+            repeated = [key for key, indices in occurrences.items() if len(indices) > 1]
+            if not repeated:
+                break
+            key = max(repeated, key=lambda key: len(list(exprs[key].iter_tree())))
+            expr = exprs[key]
+
+            name = new_symbol_name("_cse")
+            declarations.append(oir.LocalScalar(name=name, dtype=expr.dtype))
+            access = oir.ScalarAccess(name=name, dtype=expr.dtype)
+            indices = set(occurrences[key])
+            replaced = []
+            for index, stmt in enumerate(stmts):
+                if index == min(indices):
+                    replaced.append(oir.AssignStmt(left=access, right=expr))
+                if index in indices:
+                    if isinstance(stmt, oir.AssignStmt):
+                        stmt = oir.AssignStmt(
+                            left=stmt.left,
+                            right=_ReplaceSubexpression().visit(
+                                stmt.right, key=key[0], access=access
+                            ),
+                        )
+                    else:
+                        stmt = oir.MaskStmt(
+                            mask=_ReplaceSubexpression().visit(
+                                stmt.mask, key=key[0], access=access
+                            ),
+                            body=stmt.body,
+                            is_loop=stmt.is_loop,
+                        )
+                replaced.append(stmt)
+            stmts = replaced
+
+        return [
+            self.visit(stmt, new_symbol_name=new_symbol_name, declarations=declarations)
+            for stmt in stmts
+        ]
+
+    def visit_AssignStmt(self, node: oir.AssignStmt, **kwargs: Any) -> oir.AssignStmt:
+        return node
+
+    def visit_MaskStmt(self, node: oir.MaskStmt, **kwargs: Any) -> oir.MaskStmt:
+        return oir.MaskStmt(
+            mask=node.mask,
+            body=self._eliminate(node.body, **kwargs),
+            is_loop=node.is_loop,
+            loc=node.loc,
+        )
+
+    def visit_For(self, node: oir.For, **kwargs: Any) -> oir.For:
+        return oir.For(
+            target_name=node.target_name,
+            start=node.start,
+            end=node.end,
+            inc=node.inc,
+            body=self._eliminate(node.body, **kwargs),
+            loc=node.loc,
+        )
+
+    def visit_HorizontalExecution(
+        self, node: oir.HorizontalExecution, **kwargs: Any
+    ) -> oir.HorizontalExecution:
+        declarations = list(node.declarations)
+        body = self._eliminate(node.body, declarations=declarations, **kwargs)
+        return oir.HorizontalExecution(body=body, declarations=declarations, loc=node.loc)
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        return self.generic_visit(node, new_symbol_name=symbol_name_creator(set(node.symtable_)))
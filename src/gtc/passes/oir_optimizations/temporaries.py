@@ -15,12 +15,12 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import collections
-from typing import Any, Callable, Dict, Set, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from eve import NodeTranslator
-from gtc import oir
+from gtc import common, oir
 
-from .utils import AccessCollector, symbol_name_creator
+from .utils import Access, AccessCollector, symbol_name_creator
 
 
 class TemporariesToScalarsBase(NodeTranslator):
@@ -117,6 +117,18 @@ class LocalTemporariesToScalars(TemporariesToScalarsBase):
         return super().visit_Stencil(node, tmps_to_replace=local_tmps)
 
 
+def _write_before_read(
+    tmp: str,
+    offsets: Dict[str, Set[Tuple[int, int, int]]],
+    ordered_accesses: List[Access],
+) -> bool:
+    if tmp not in offsets:
+        return True
+    if offsets[tmp] != {(0, 0, 0)}:
+        return False
+    return next(o.is_write for o in ordered_accesses if o.field == tmp)
+
+
 class WriteBeforeReadTemporariesToScalars(TemporariesToScalarsBase):
     """Replaces temporay fields that are always written before read by scalars."""
 
@@ -130,16 +142,111 @@ class WriteBeforeReadTemporariesToScalars(TemporariesToScalarsBase):
             accesses = AccessCollector.apply(horizontal_execution)
             offsets = accesses.offsets()
             ordered_accesses = accesses.ordered_accesses()
-
-            def write_before_read(tmp: str) -> bool:
-                if tmp not in offsets:
-                    return True
-                if offsets[tmp] != {(0, 0, 0)}:
-                    return False
-                return next(o.is_write for o in ordered_accesses if o.field == tmp)
-
             write_before_read_tmps = {
-                tmp for tmp in write_before_read_tmps if write_before_read(tmp)
+                tmp
+                for tmp in write_before_read_tmps
+                if _write_before_read(tmp, offsets, ordered_accesses)
             }
 
         return super().visit_Stencil(node, tmps_to_replace=write_before_read_tmps)
+
+
+def _stored_levels(node: oir.VerticalLoop, name: str) -> Optional[int]:
+    """Return how many levels of temporary `name` each level of `node` reads, `None` if unknown."""
+    if node.loop_order == common.LoopOrder.PARALLEL or any(c.name == name for c in node.caches):
+        return None
+
+    def accesses_current_level(stmt_or_expr: Union[oir.Stmt, oir.Expr]) -> bool:
+        return any(
+            access.name == name and access.offset.to_dict()["k"] == 0
+            for access in stmt_or_expr.iter_tree().if_isinstance(oir.FieldAccess)
+        )
+
+    backward = node.loop_order == common.LoopOrder.BACKWARD
+    first = node.sections[0].interval
+    distance = 0
+    for section in node.sections:
+        stmts = [stmt for he in section.horizontal_executions for stmt in he.body]
+        # The current level has to be written before any access on every level
+        current = [stmt for stmt in stmts if accesses_current_level(stmt)]
+        if (
+            not current
+            or not isinstance(current[0], oir.AssignStmt)
+            or current[0].left.name != name
+            or accesses_current_level(current[0].right)
+        ):
+            return None
+
+        lefts = {id(stmt.left) for stmt in section.iter_tree().if_isinstance(oir.AssignStmt)}
+        for access in section.iter_tree().if_isinstance(oir.FieldAccess):
+            if access.name != name:
+                continue
+            # The levels read at variable offsets are unknown
+            if isinstance(access.offset, common.VariableOffset):
+                return None
+            levels_behind = access.offset.k if backward else -access.offset.k
+            if levels_behind < 0 or (levels_behind and id(access) in lefts):
+                return None
+            # The levels read have to be computed by the loop
+            if backward:
+                bound, start = section.interval.end, first.end
+                outside = bound.offset + levels_behind > start.offset
+            else:
+                bound, start = section.interval.start, first.start
+                outside = bound.offset - levels_behind < start.offset
+            if levels_behind and bound.level == start.level and outside:
+                return None
+            distance = max(distance, levels_behind)
+    return distance + 1
+
+
+class TemporariesToPlanes(NodeTranslator):
+    """Stores temporaries of sequential vertical loops in as few IJ planes as needed.
+
+    A temporary accessed in a single forward or backward vertical loop, which is written at the
+    current level before any other access to that level on every level, is only read on the levels
+    the loop has just computed. A temporary only read at the current level becomes an IJ field,
+    a temporary read at most `n - 1` levels behind stores `n` levels cyclically (`k_planes`).
+
+    Accesses are left unchanged: code generators index the K axis of temporaries with `k_planes`
+    modulo `k_planes`.
+    """
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        loops: Dict[str, List[oir.VerticalLoop]] = collections.defaultdict(list)
+        for vertical_loop in node.vertical_loops:
+            names = vertical_loop.iter_tree().if_isinstance(oir.FieldAccess).getattr("name")
+            for name in names.to_set():
+                loops[name].append(vertical_loop)
+
+        declarations = []
+        for decl in node.declarations:
+            levels = None
+            if decl.dimensions[2] and decl.k_planes is None and len(loops[decl.name]) == 1:
+                levels = _stored_levels(loops[decl.name][0], decl.name)
+            if levels == 1:
+                decl = oir.Temporary(
+                    name=decl.name,
+                    dtype=decl.dtype,
+                    dimensions=(*decl.dimensions[:2], False),
+                    data_dims=decl.data_dims,
+                    loc=decl.loc,
+                )
+            elif levels is not None:
+                decl = oir.Temporary(
+                    name=decl.name,
+                    dtype=decl.dtype,
+                    dimensions=decl.dimensions,
+                    data_dims=decl.data_dims,
+                    k_planes=levels,
+                    loc=decl.loc,
+                )
+            declarations.append(decl)
+
+        return oir.Stencil(
+            name=node.name,
+            params=node.params,
+            vertical_loops=node.vertical_loops,
+            declarations=declarations,
+            loc=node.loc,
+        )
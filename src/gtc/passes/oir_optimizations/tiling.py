@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Set
+
+import numpy as np
+
+from eve import NodeTranslator
+from gtc import common, oir
+
+from .cost_model import CostModel
+from .utils import AccessCollector, compute_extents
+
+
+if TYPE_CHECKING:
+    from gt4py.definitions import Extent
+
+
+def tiles_are_independent(
+    node: oir.VerticalLoop, *, block_extents: Dict[int, "Extent"], symtable: Dict[str, Any]
+) -> bool:
+    """
+    Check if the tiles of a vertical loop can be computed independently of each other.
+
+    Each tile recomputes the halo of the temporaries it reads. This is only correct if the API
+    fields written in the loop are written on the compute domain only and never read at a
+    horizontal offset in the loop, and if every temporary written in the loop is written by a
+    single horizontal execution and not read before it.
+    """
+    horizontal_executions = node.iter_tree().if_isinstance(oir.HorizontalExecution).to_list()
+    accesses = [AccessCollector.apply(he) for he in horizontal_executions]
+    writers: Dict[str, List[int]] = {}
+    for index, he_accesses in enumerate(accesses):
+        for name in he_accesses.write_fields():
+            writers.setdefault(name, []).append(index)
+
+    for name, indices in writers.items():
+        read_offsets = [
+            offset
+            for he_accesses in accesses
+            for offset in he_accesses.read_offsets().get(name, set())
+        ]
+        if isinstance(symtable[name], oir.Temporary):
+            if len(indices) > 1 or any(
+                name in he_accesses.read_fields() for he_accesses in accesses[: indices[0]]
+            ):
+                return False
+        elif any(
+            block_extents[id(horizontal_executions[index])].to_boundary()[:2] != ((0, 0), (0, 0))
+            for index in indices
+        ) or any(offset[:2] != (0, 0) for offset in read_offsets):
+            return False
+    return True
+
+
+@dataclass
+class HorizontalTiling(NodeTranslator):
+    """
+    Computes parallel vertical loops by horizontal tiles whose working set fits in cache.
+
+    The tiles of a vertical loop are computed one after the other by all its horizontal
+    executions in turn, each of them on the tile extended by its extent: the halo read by the
+    following horizontal executions is recomputed by every tile. The tile size is chosen such that
+    the fields accessed by the loop on a tile and its halo, over `levels` vertical levels, fit in
+    the cache size of the cost model, but is at least `min_tile_size`.
+
+    Only vertical loops with several horizontal executions sharing fields are tiled, if their
+    tiles are independent (see :func:`tiles_are_independent`). Backends without tiled code
+    generation can ignore the `tiling` of vertical loops.
+    """
+
+    cost_model: CostModel = field(default_factory=CostModel)
+    #: Number of vertical levels assumed to size the tiles
+    levels: int = 64
+    min_tile_size: int = 8
+
+    def visit_VerticalLoop(
+        self,
+        node: oir.VerticalLoop,
+        *,
+        block_extents: Dict[int, "Extent"],
+        symtable: Dict[str, Any],
+        **kwargs: Any,
+    ) -> oir.VerticalLoop:
+        horizontal_executions = node.iter_tree().if_isinstance(oir.HorizontalExecution).to_list()
+        if node.loop_order != common.LoopOrder.PARALLEL or len(horizontal_executions) < 2:
+            return node
+        fields = [AccessCollector.apply(he).fields() for he in horizontal_executions]
+        shared = any(
+            fields[i] & fields[j] for i in range(len(fields)) for j in range(i + 1, len(fields))
+        )
+        if not shared or not tiles_are_independent(
+            node, block_extents=block_extents, symtable=symtable
+        ):
+            return node
+
+        halo = common.IJExtent.union(
+            *(
+                common.IJExtent(i=(-i_lower, i_upper), j=(-j_lower, j_upper))
+                for (i_lower, i_upper), (j_lower, j_upper) in (
+                    block_extents[id(he)].to_boundary()[:2] for he in horizontal_executions
+                )
+            )
+        )
+        names: Set[str] = {name for he_fields in fields for name in he_fields}
+        column_bytes = self.levels * sum(
+            np.dtype(common.data_type_to_typestr(symtable[name].dtype)).itemsize
+            * int(np.prod(getattr(symtable[name], "data_dims", ())))
+            for name in names
+        )
+        # Largest square tile whose columns, halo included, fit in cache: the positive root of
+        # the quadratic equation in the tile size where the tile and its halo fill the cache
+        halo_i, halo_j = halo.i[1] - halo.i[0], halo.j[1] - halo.j[0]
+        columns = self.cost_model.cache_size / column_bytes
+        size = int((-(halo_i + halo_j) + math.sqrt((halo_i - halo_j) ** 2 + 4 * columns)) / 2)
+        size = max(size, self.min_tile_size)
+        return oir.VerticalLoop(
+            loop_order=node.loop_order,
+            sections=node.sections,
+            caches=node.caches,
+            tiling=oir.Tiling(tile_size=(size, size), halo=halo),
+            loc=node.loc,
+        )
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        _, block_extents = compute_extents(node)
+        return self.generic_visit(
+            node, block_extents=block_extents, symtable=node.symtable_, **kwargs
+        )
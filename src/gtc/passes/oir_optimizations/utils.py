@@ -16,7 +16,7 @@
 
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Set, Tuple
 
 from eve import NodeVisitor
 from eve.concepts import TreeNode
@@ -24,6 +24,10 @@ from eve.utils import XIterator, xiter
 from gtc import common, oir
 
 
+if TYPE_CHECKING:
+    from gt4py.definitions import Extent
+
+
 @dataclass(frozen=True)
 class Access:
     field: str
@@ -148,3 +152,48 @@ def symbol_name_creator(used_names: Set[str]) -> Callable[[str], str]:
         return name
 
     return new_symbol_name
+
+
+def _offset_extent(offset: Tuple[int, int, int]) -> "Extent":
+    from gt4py.definitions import Extent
+
+    return Extent([(min(o, 0), max(o, 0)) for o in offset[:2]])
+
+
+def compute_extents(node: oir.Stencil) -> Tuple[Dict[str, "Extent"], Dict[int, "Extent"]]:
+    """Compute the horizontal extents of the fields and of the horizontal executions of a stencil.
+
+    The extent of a horizontal execution is the union of the extents at which the fields it
+    writes are read later on (shifted by the read offsets). Horizontal executions are processed
+    in reverse order of execution, thus the last writes of API fields have zero extent.
+
+    Returns:
+        A tuple of the field extents, i.e. the region where each field is read or written,
+        indexed by field name, and the horizontal execution extents, indexed by the `id` of
+        the horizontal execution nodes. All extents are two-dimensional.
+    """
+    # gt4py imports the gtc passes on initialization
+    from gt4py.definitions import Extent
+
+    read_extents: Dict[str, "Extent"] = {}
+    field_extents: Dict[str, "Extent"] = {}
+    block_extents: Dict[int, "Extent"] = {}
+    horizontal_executions = node.iter_tree().if_isinstance(oir.HorizontalExecution).to_list()
+    for horizontal_execution in reversed(horizontal_executions):
+        accesses = AccessCollector.apply(horizontal_execution)
+        extent = Extent.zeros(ndims=2)
+        for name in accesses.write_fields():
+            extent |= read_extents.get(name, Extent.zeros(ndims=2))
+        block_extents[id(horizontal_execution)] = extent
+        for name in accesses.write_fields():
+            field_extents[name] = extent | field_extents.get(name, Extent.zeros(ndims=2))
+        for name, offsets in accesses.read_offsets().items():
+            for offset in offsets:
+                read_extent = extent + _offset_extent(offset)
+                read_extents[name] = read_extent | read_extents.get(name, Extent.zeros(ndims=2))
+                field_extents[name] = read_extent | field_extents.get(name, Extent.zeros(ndims=2))
+
+    for decl in [*node.params, *node.declarations]:
+        if isinstance(decl, oir.FieldDecl):
+            field_extents.setdefault(decl.name, Extent.zeros(ndims=2))
+    return field_extents, block_extents
@@ -15,11 +15,33 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import warnings
-from typing import Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from eve import NodeTranslator
 from gtc import common, oir
 
+from .utils import AccessCollector
+
+
+def _merge_caches(a: List[oir.CacheDesc], b: List[oir.CacheDesc]) -> Optional[List[oir.CacheDesc]]:
+    """Return the union of two cache declarations, `None` if a field is cached differently."""
+    caches: Dict[str, oir.CacheDesc] = {str(cache.name): cache for cache in a}
+    for cache in b:
+        name = str(cache.name)
+        other = caches.get(name)
+        if other is None:
+            caches[name] = cache
+        elif type(other) is not type(cache):
+            return None
+        elif isinstance(other, oir.KCache) and isinstance(cache, oir.KCache):
+            caches[name] = oir.KCache(
+                name=name,
+                fill=other.fill or cache.fill,
+                flush=other.flush or cache.flush,
+                loc=other.loc,
+            )
+    return list(caches.values())
+
 
 class AdjacentLoopMerging(NodeTranslator):
     @staticmethod
@@ -39,12 +61,14 @@ class AdjacentLoopMerging(NodeTranslator):
     @staticmethod
     def _merge(a: oir.VerticalLoop, b: oir.VerticalLoop) -> oir.VerticalLoop:
         sections = a.sections + b.sections
-        if a.caches or b.caches:
-            warnings.warn("AdjacentLoopMerging pass removed previously declared caches")
+        caches = _merge_caches(a.caches, b.caches)
+        if caches is None:
+            warnings.warn("AdjacentLoopMerging pass removed conflicting cache declarations")
+            caches = []
         return oir.VerticalLoop(
             loop_order=a.loop_order,
             sections=sections,
-            caches=[],
+            caches=caches,
         )
 
     def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
@@ -65,3 +89,183 @@ class AdjacentLoopMerging(NodeTranslator):
             vertical_loops=vertical_loops,
             declarations=node.declarations,
         )
+
+
+def _accesses(node: oir.VerticalLoop) -> Tuple[Set[str], Dict[str, Set[Optional[int]]]]:
+    """Return the fields written in a loop and the K offsets of the reads, `None` if variable."""
+    lefts = [stmt.left for stmt in node.iter_tree().if_isinstance(oir.AssignStmt)]
+    left_ids = {id(left) for left in lefts}
+    reads: Dict[str, Set[Optional[int]]] = {}
+    for access in node.iter_tree().if_isinstance(oir.FieldAccess):
+        if id(access) not in left_ids:
+            offset = None if isinstance(access.offset, common.VariableOffset) else access.offset.k
+            reads.setdefault(access.name, set()).add(offset)
+    return {left.name for left in lefts if isinstance(left, oir.FieldAccess)}, reads
+
+
+def _computed(offset: Optional[int], loop_order: common.LoopOrder) -> bool:
+    """Check if the level at K `offset` is computed when the current level is."""
+    if offset is None:
+        return False
+    if loop_order == common.LoopOrder.FORWARD:
+        return offset <= 0
+    if loop_order == common.LoopOrder.BACKWARD:
+        return offset >= 0
+    return offset == 0
+
+
+def _not_computed(offset: Optional[int], loop_order: common.LoopOrder) -> bool:
+    """Check if the level at K `offset` is not yet computed when the current level is."""
+    return offset is not None and _computed(-offset, loop_order)
+
+
+def _columns_are_dependent(node: oir.VerticalLoop) -> bool:
+    """Check if a field written in a vertical loop is read at a horizontal offset in the loop."""
+    accesses = AccessCollector.apply(node)
+    written = accesses.write_fields()
+    return any(
+        offset[:2] != (0, 0)
+        for name, offsets in accesses.read_offsets().items()
+        if name in written
+        for offset in offsets
+    )
+
+
+def _horizontal_executions(
+    node: oir.VerticalLoop, interval: oir.Interval
+) -> List[oir.HorizontalExecution]:
+    return [
+        horizontal_execution
+        for section in node.sections
+        if section.interval.covers(interval)
+        for horizontal_execution in section.horizontal_executions
+    ]
+
+
+def _independent(a: oir.VerticalLoop, b: oir.VerticalLoop) -> bool:
+    """Check if two vertical loops can be executed in any order."""
+    a_writes, a_reads = _accesses(a)
+    b_writes, b_reads = _accesses(b)
+    return not (a_writes & (b_writes | set(b_reads))) and not (b_writes & set(a_reads))
+
+
+class VerticalLoopFusion(NodeTranslator):
+    """
+    Fuses vertical loops based on the K offsets of their accesses.
+
+    Every vertical loop is fused into the closest preceding loop it can be fused with, if it is
+    independent of the loops in between. The sections of the fused loop are split at the interval
+    bounds of both loops and execute the horizontal executions of the first loop, then those of
+    the second loop. Two loops can thus be fused if
+
+    * their loop orders are equal or one of them is parallel (the fused loop has the other order),
+    * their intervals overlap or touch,
+    * the second loop reads the fields written by the first loop only at levels computed before
+      or at the current level, the first loop reads the fields written by the second one only at
+      levels computed after or at the current level (only at the current level in parallel loops),
+    * parallel loops which become sequential or whose sections are split read the fields they
+      write only at the current level,
+    * they cache no field differently and are not tiled,
+    * columns of a sequential fused loop depend on each other only if they do in one of the
+      sequential loops: otherwise all columns must be computed level by level.
+
+    Cache declarations are merged.
+    """
+
+    @staticmethod
+    def _fuse(a: oir.VerticalLoop, b: oir.VerticalLoop) -> Optional[oir.VerticalLoop]:
+        if a.tiling is not None or b.tiling is not None:
+            return None
+        if a.loop_order == b.loop_order or b.loop_order == common.LoopOrder.PARALLEL:
+            loop_order = a.loop_order
+        elif a.loop_order == common.LoopOrder.PARALLEL:
+            loop_order = b.loop_order
+        else:
+            return None
+
+        a_intervals = [section.interval for section in a.sections]
+        b_intervals = [section.interval for section in b.sections]
+        a_start, a_end = min(i.start for i in a_intervals), max(i.end for i in a_intervals)
+        b_start, b_end = min(i.start for i in b_intervals), max(i.end for i in b_intervals)
+        if a_end < b_start or b_end < a_start:
+            return None
+        caches = _merge_caches(a.caches, b.caches)
+        if caches is None:
+            return None
+
+        a_writes, a_reads = _accesses(a)
+        b_writes, b_reads = _accesses(b)
+        if not all(
+            _computed(offset, loop_order) for name in a_writes for offset in b_reads.get(name, ())
+        ) or not all(
+            _not_computed(offset, loop_order)
+            for name in b_writes
+            for offset in a_reads.get(name, ())
+        ):
+            return None
+
+        bounds: List[common.AxisBound] = []
+        for interval in a_intervals + b_intervals:
+            bounds.extend(bound for bound in (interval.start, interval.end) if bound not in bounds)
+        bounds.sort()
+        intervals = [oir.Interval(start=start, end=end) for start, end in zip(bounds, bounds[1:])]
+
+        for node, writes, reads in ((a, a_writes, a_reads), (b, b_writes, b_reads)):
+            split = sum(1 for interval in intervals if _horizontal_executions(node, interval))
+            if (
+                node.loop_order == common.LoopOrder.PARALLEL
+                and (loop_order != common.LoopOrder.PARALLEL or split > len(node.sections))
+                and any(offset != 0 for name in writes for offset in reads.get(name, ()))
+            ):
+                return None
+
+        sections = []
+        used: Set[int] = set()
+        for interval in intervals:
+            horizontal_executions = []
+            for horizontal_execution in _horizontal_executions(
+                a, interval
+            ) + _horizontal_executions(b, interval):
+                # Horizontal executions of split sections are copied, nodes are identified by id
+                if id(horizontal_execution) in used:
+                    horizontal_execution = horizontal_execution.copy(deep=True)
+                used.add(id(horizontal_execution))
+                horizontal_executions.append(horizontal_execution)
+            sections.append(
+                oir.VerticalLoopSection(
+                    interval=interval, horizontal_executions=horizontal_executions
+                )
+            )
+        if loop_order == common.LoopOrder.BACKWARD:
+            sections.reverse()
+        fused = oir.VerticalLoop(loop_order=loop_order, sections=sections, caches=caches)
+        if (
+            loop_order != common.LoopOrder.PARALLEL
+            and _columns_are_dependent(fused)
+            and not any(
+                node.loop_order == loop_order and _columns_are_dependent(node) for node in (a, b)
+            )
+        ):
+            return None
+        return fused
+
+    def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> oir.Stencil:
+        vertical_loops: List[oir.VerticalLoop] = []
+        for vertical_loop in node.vertical_loops:
+            for index in reversed(range(len(vertical_loops))):
+                fused = self._fuse(vertical_loops[index], vertical_loop)
+                if fused is not None:
+                    vertical_loops[index] = fused
+                    break
+                if not _independent(vertical_loops[index], vertical_loop):
+                    vertical_loops.append(vertical_loop)
+                    break
+            else:
+                vertical_loops.append(vertical_loop)
+
+        return oir.Stencil(
+            name=node.name,
+            params=node.params,
+            vertical_loops=vertical_loops,
+            declarations=node.declarations,
+        )
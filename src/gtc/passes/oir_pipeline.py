@@ -14,7 +14,8 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from typing import Callable, Dict, Optional, Protocol, Sequence, Tuple, Type, Union
+import functools
+from typing import Any, Callable, Dict, Optional, Protocol, Sequence, Tuple, Type, Union, cast
 
 from eve.visitors import NodeVisitor
 from gtc import oir
@@ -28,15 +29,24 @@ from gtc.passes.oir_optimizations.caches import (
     PruneKCacheFills,
     PruneKCacheFlushes,
 )
+from gtc.passes.oir_optimizations.cost_model import CostModel
 from gtc.passes.oir_optimizations.horizontal_execution_merging import GreedyMerging, OnTheFlyMerging
 from gtc.passes.oir_optimizations.inlining import MaskInlining
 from gtc.passes.oir_optimizations.mask_stmt_merging import MaskStmtMerging
-from gtc.passes.oir_optimizations.pruning import NoFieldAccessPruning
+from gtc.passes.oir_optimizations.pruning import DeadCodeElimination, NoFieldAccessPruning
+from gtc.passes.oir_optimizations.subexpression_elimination import CommonSubexpressionElimination
 from gtc.passes.oir_optimizations.temporaries import (
     LocalTemporariesToScalars,
+    TemporariesToPlanes,
     WriteBeforeReadTemporariesToScalars,
 )
-from gtc.passes.oir_optimizations.vertical_loop_merging import AdjacentLoopMerging
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+from gtc.passes.oir_optimizations.vertical_loop_merging import (
+    AdjacentLoopMerging,
+    VerticalLoopFusion,
+)
+from gtc.passes.pass_cache import PassCache, step_id
+from gtc.passes.pass_instrumentation import PassInstrumentation, pass_name
 
 
 PASS_T = Union[Callable[[oir.Stencil], oir.Stencil], Type[NodeVisitor]]
@@ -54,16 +64,30 @@ class OirPipeline:
     """
     OIR passes pipeline runs passes in order and allows skipping.
 
-    May only call existing passes and may not contain any pass logic itself.
+    May only call existing passes and may not contain any pass logic itself. Passes with a
+    `cost_model` parameter are given `cost_model` if it is set. Results of the passes are reused
+    from and stored in `pass_cache` if it is set. Statistics of the passes are recorded by
+    `instrumentation` if it is set.
     """
 
-    def __init__(self, node: oir.Stencil):
+    def __init__(
+        self,
+        node: oir.Stencil,
+        cost_model: Optional[CostModel] = None,
+        *,
+        pass_cache: Optional[PassCache] = None,
+        instrumentation: Optional[PassInstrumentation] = None,
+    ):
         self.oir = node
+        self.cost_model = cost_model
+        self.pass_cache = pass_cache
+        self.instrumentation = instrumentation
         self._cache: Dict[Tuple[int, ...], oir.Stencil] = {}
 
     def steps(self) -> Sequence[PASS_T]:
         return [
             graph_merge_horizontal_executions,
+            VerticalLoopFusion,
             GreedyMerging,
             AdjacentLoopMerging,
             LocalTemporariesToScalars,
@@ -71,21 +95,54 @@ class OirPipeline:
             OnTheFlyMerging,
             MaskStmtMerging,
             MaskInlining,
+            CommonSubexpressionElimination,
+            DeadCodeElimination,
             NoFieldAccessPruning,
             IJCacheDetection,
             KCacheDetection,
             PruneKCacheFills,
             PruneKCacheFlushes,
             FillFlushToLocalKCaches,
+            TemporariesToPlanes,
+            HorizontalTiling,
         ]
 
+    def _step_kwargs(self, step: PASS_T) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {}
+        if self.cost_model is not None and "cost_model" in getattr(
+            step, "__dataclass_fields__", {}
+        ):
+            kwargs["cost_model"] = self.cost_model
+        return kwargs
+
+    def _apply_step(self, step: PASS_T, node: oir.Stencil) -> oir.Stencil:
+        if self.instrumentation is not None:
+            return self.instrumentation.apply(
+                pass_name(step), functools.partial(self._apply_uninstrumented_step, step), node
+            )
+        return self._apply_uninstrumented_step(step, node)
+
+    def _apply_uninstrumented_step(self, step: PASS_T, node: oir.Stencil) -> oir.Stencil:
+        if isinstance(step, type) and issubclass(step, NodeVisitor):
+            # Only dataclass passes take arguments, the `NodeVisitor` constructor does not
+            return cast(Callable[..., NodeVisitor], step)(**self._step_kwargs(step)).visit(node)
+        return step(node)
+
     def apply(self, steps: Sequence[PASS_T]) -> oir.Stencil:
+        if self.pass_cache is not None:
+            return self.pass_cache.apply(
+                self.oir,
+                [
+                    (
+                        step_id(step, *sorted(self._step_kwargs(step).items())),
+                        functools.partial(self._apply_step, step),
+                    )
+                    for step in steps
+                ],
+            )
         result = self.oir
         for step in steps:
-            if isinstance(step, type) and issubclass(step, NodeVisitor):
-                result = step().visit(result)
-            else:
-                result = step(result)
+            result = self._apply_step(step, result)
         return result
 
     def _get_cached(self, steps: Sequence[PASS_T]) -> Optional[oir.Stencil]:
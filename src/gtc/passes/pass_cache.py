@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Content-addressed cache of the results of IR passes, shared across stencils."""
+
+import enum
+import functools
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import pydantic
+
+import eve
+import gtc
+from eve.concepts import BaseNode
+
+
+NodeT = TypeVar("NodeT", bound=BaseNode)
+
+
+def _update_hash(hasher: Any, value: Any) -> None:
+    if isinstance(value, pydantic.BaseModel):
+        hasher.update(f"<{type(value).__module__}.{type(value).__qualname__}>".encode())
+        children = value.iter_children() if isinstance(value, BaseNode) else iter(value)
+        for name, child in children:
+            hasher.update(name.encode())
+            _update_hash(hasher, child)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"<{type(value).__name__}:{len(value)}>".encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"<dict:{len(value)}>".encode())
+        for key, item in value.items():
+            _update_hash(hasher, key)
+            _update_hash(hasher, item)
+    elif isinstance(value, (set, frozenset)):
+        # Set iteration order depends on the hash seed of the interpreter
+        hasher.update(f"<set:{len(value)}>".encode())
+        for digest in sorted(node_hash(item) for item in value):
+            hasher.update(digest.encode())
+    elif isinstance(value, enum.Enum):
+        hasher.update(f"<{type(value).__qualname__}>{value.value!r}".encode())
+    else:
+        hasher.update(f"<{type(value).__qualname__}>{value!r}".encode())
+
+
+def node_hash(node: Any) -> str:
+    """Compute a hash of the structure and the values of `node`, stable across interpreters.
+
+    Implementation fields (like symbol tables) are derived from the children and are ignored.
+    """
+    hasher = hashlib.sha256()
+    _update_hash(hasher, node)
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Hash the sources of the toolchain, results of previous versions of the passes are stale."""
+    hasher = hashlib.sha256()
+    for package in (eve, gtc):
+        package_path = pathlib.Path(package.__file__).parent
+        for path in sorted(package_path.rglob("*.py")):
+            hasher.update(str(path.relative_to(package_path)).encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+def step_id(step: Callable, *args: Any) -> str:
+    """Identify a pass by its qualified name, bound arguments and `args` (like its parameters)."""
+    if isinstance(step, functools.partial):
+        return step_id(step.func, *step.args, *sorted(step.keywords.items()), *args)
+    name = f"{step.__module__}.{step.__qualname__}"
+    return f"{name}({', '.join(repr(arg) for arg in args)})" if args else name
+
+
+class PassCache:
+    """
+    Results of IR passes stored in `path`, keyed by the input IR node and the passes applied.
+
+    The key of the result of a sequence of passes chains the structural hash of the input node
+    with the identities of the passes, so stencils (or pipeline configurations) sharing a
+    sequence of passes on the same input share the results. Each result is a pickle file, written
+    atomically so concurrent builds can share `path`.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+
+    def keys(self, node: BaseNode, step_ids: Sequence[str]) -> List[str]:
+        """Compute the keys of the results of the first 1, 2, ... passes of `step_ids` on `node`."""
+        key = hashlib.sha256(f"{code_version()}:{node_hash(node)}".encode()).hexdigest()
+        keys = []
+        for identity in step_ids:
+            key = hashlib.sha256(f"{key}:{identity}".encode()).hexdigest()
+            keys.append(key)
+        return keys
+
+    def load(self, key: str) -> Optional[Any]:
+        """Return the cached result for `key`, `None` if missing or unreadable."""
+        try:
+            with (self.path / f"{key}.pickle").open("rb") as result_file:
+                return pickle.load(result_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def store(self, key: str, result: Any) -> None:
+        """Store `result` for `key`, replacing previous results atomically."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=self.path, prefix=f"{key}.", suffix=".tmp", delete=False
+        ) as result_file:
+            pickle.dump(result, result_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(result_file.name, self.path / f"{key}.pickle")
+
+    def apply(self, node: NodeT, steps: Sequence[Tuple[str, Callable[[NodeT], NodeT]]]) -> NodeT:
+        """
+        Apply the `(step_id, step)` pairs of `steps` in order, reusing cached results.
+
+        Only the passes after the longest sequence of passes with a cached result are run.
+        """
+        keys = self.keys(node, [identity for identity, _ in steps])
+        start = 0
+        for index in reversed(range(len(keys))):
+            cached = self.load(keys[index])
+            if cached is not None:
+                node, start = cached, index + 1
+                break
+        for key, (_, step) in zip(keys[start:], steps[start:]):
+            node = step(node)
+            self.store(key, node)
+        return node
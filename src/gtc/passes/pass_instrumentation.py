@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Wall time, IR size and memory statistics of the passes applied by the GTIR and OIR pipelines."""
+
+import functools
+import time
+import tracemalloc
+from typing import Callable, List, NamedTuple, Optional, TypeVar
+
+from eve.concepts import BaseNode
+
+
+NodeT = TypeVar("NodeT", bound=BaseNode)
+
+
+class PassRecord(NamedTuple):
+    """Statistics of a pass applied by a pipeline."""
+
+    name: str
+    #: Wall time in seconds
+    time: float
+    #: Number of IR nodes of the input and of the result of the pass
+    nodes_before: int
+    nodes_after: int
+    #: Peak of the memory allocated while running the pass in bytes, `None` if not traced
+    peak_memory: Optional[int]
+
+
+def pass_name(step: Callable) -> str:
+    while isinstance(step, functools.partial):
+        step = step.func
+    return step.__qualname__
+
+
+def count_nodes(node: BaseNode) -> int:
+    return sum(1 for _ in node.iter_tree().if_isinstance(BaseNode))
+
+
+class PassInstrumentation:
+    """
+    Record the statistics of the passes applied by pipelines, in order.
+
+    Memory is only traced with :mod:`tracemalloc` if `trace_memory` is set, since tracing slows
+    down the passes and distorts their recorded times. It is not traced if :mod:`tracemalloc` is
+    already tracing (the peak can not be reset).
+    """
+
+    def __init__(self, *, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.records: List[PassRecord] = []
+
+    def apply(self, name: str, step: Callable[[NodeT], NodeT], node: NodeT) -> NodeT:
+        """Apply `step` to `node` and record its statistics as pass `name`."""
+        nodes_before = count_nodes(node)
+        trace_memory = self.trace_memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            result = step(node)
+            elapsed = time.perf_counter() - start
+            peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        self.records.append(
+            PassRecord(
+                name=name,
+                time=elapsed,
+                nodes_before=nodes_before,
+                nodes_after=count_nodes(result),
+                peak_memory=peak_memory,
+            )
+        )
+        return result
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import Any, Collection, Optional, Union
+
+from eve.codegen import FormatTemplate
+from gtc import common
+from gtc.python import npir
+from gtc.python.npir_gen import NpirGen
+
+
+__all__ = ["ArrayApiGen"]
+
+
+#: Array API names of the NumPy functions generated by :class:`NpirGen`
+ARRAY_API_FUNCTIONS = {
+    "true_divide": "divide",
+    "bitwise_and": "logical_and",
+    "bitwise_or": "logical_or",
+    "bitwise_not": "logical_not",
+    "power": "pow",
+    "mod": "remainder",
+    "arcsin": "asin",
+    "arccos": "acos",
+    "arctan": "atan",
+}
+
+
+class ArrayApiGen(NpirGen):
+    """
+    Generate the computation against the array API namespace of the fields.
+
+    The namespace is looked up with `array_api_compat` at the start of `run`, the generated module
+    thus works with any array library implementing the array API standard with mutable arrays
+    (NumPy, CuPy, PyTorch, ...). Only functions of the standard are used: there are no `out=`
+    arguments, no cached temporary buffers and no accumulations.
+    """
+
+    def visit_DataType(self, node: common.DataType, **kwargs: Any) -> Union[str, Collection[str]]:
+        return f"xp.{node.name.lower()}"
+
+    Literal = FormatTemplate("xp.asarray({value}, dtype={dtype})")
+
+    Cast = FormatTemplate("xp.asarray({expr}, dtype={dtype})")
+
+    FieldDecl = FormatTemplate(
+        "{name} = xp.reshape({name}, ({shape}))\n_origin_['{name}'] = [{origin}]"
+    )
+
+    EmptyTemp = FormatTemplate("xp.zeros({shape}, dtype={dtype})")
+
+    LocalScalarDecl = FormatTemplate("{name}_ = xp.empty({shape}, dtype={dtype})")
+
+    def visit_VectorArithmetic(
+        self, node: npir.VectorArithmetic, *, out: Optional[str] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if out is not None:
+            return self.visit_ufunc(node, out=out, **kwargs)
+        return self.generic_visit(node, **kwargs)
+
+    def visit_ufunc(self, node: npir.Expr, *, out: str, **kwargs: Any) -> str:
+        # There is no `out=` argument in the standard, the result is assigned to the target
+        return self.VectorAssign.render(left=out, right=self.generic_visit(node, **kwargs))
+
+    VectorLogic = FormatTemplate("xp.logical_{op}({left}, {right})")
+
+    def visit_UnaryOperator(
+        self, node: common.UnaryOperator, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if node is common.UnaryOperator.NOT:
+            return "xp.logical_not"
+        return self.generic_visit(node, **kwargs)
+
+    VectorTernaryOp = FormatTemplate("xp.where({cond}, {true_expr}, {false_expr})")
+
+    def visit_NativeFunction(
+        self, node: common.NativeFunction, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        name = str(super().visit_NativeFunction(node, **kwargs))
+        return ARRAY_API_FUNCTIONS.get(name, name)
+
+    NativeFuncCall = FormatTemplate("xp.{func}({', '.join(arg for arg in args)})")
+
+    def visit_Computation(
+        self, node: npir.Computation, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if node.temp_buffers or node.iter_tree().if_isinstance(npir.VectorAccumulate).to_list():
+            raise ValueError(
+                "Temporary buffers and accumulations are not supported by the array API."
+            )
+        return super().visit_Computation(node, array_api=True, **kwargs)
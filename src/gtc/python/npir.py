@@ -54,6 +54,8 @@ class AxisOffset(eve.Node):
     offset: NumericalOffset
     axis_name: AxisName
     parallel: bool
+    #: Number of levels a serial index wraps around, for temporaries storing few K planes
+    modulo: Optional[int] = None
 
     @classmethod
     def from_int(cls, *, axis_name: str, offset: int, parallel: bool) -> "AxisOffset":
@@ -68,8 +70,15 @@ class AxisOffset(eve.Node):
         return cls.from_int(axis_name=AxisName.J, offset=offset, parallel=parallel)
 
     @classmethod
-    def k(cls, offset: int, *, parallel: bool = False) -> "AxisOffset":
-        return cls.from_int(axis_name=AxisName.K, offset=offset, parallel=parallel)
+    def k(
+        cls, offset: int, *, parallel: bool = False, modulo: Optional[int] = None
+    ) -> "AxisOffset":
+        return cls(
+            axis_name=AxisName.K,
+            offset=NumericalOffset(value=offset),
+            parallel=parallel,
+            modulo=modulo,
+        )
 
 
 @eve.utils.noninstantiable
@@ -110,6 +119,34 @@ class VectorTemp(VectorExpression, VectorLValue):
 
 class EmptyTemp(VectorExpression):
     dtype: common.DataType
+    #: Index of the shared buffer in `Computation.temp_buffers`, `None` for a new allocation
+    buffer: Optional[int] = None
+    #: Whether the buffer has to be zero-filled before use
+    initialize: bool = True
+    #: Number of K levels, `None` for the domain size
+    k_size: Optional[int] = None
+
+
+class TemporaryBuffer(eve.Node):
+    """Buffer allocated once per domain and shared by temporaries with disjoint lifetimes."""
+
+    dtype: common.DataType
+    #: Boundary ((i_lower, i_upper), (j_lower, j_upper)) of the buffer around the domain
+    boundary: Tuple[Tuple[int, int], Tuple[int, int]]
+    #: Number of K levels, `None` for the domain size
+    k_size: Optional[int] = None
+
+
+class LocalScalarDecl(eve.Node):
+    """Declaration of an OIR local scalar, stored as an array spanning a horizontal block."""
+
+    name: eve.SymbolName
+    dtype: common.DataType
+    parallel_k: bool
+
+
+class LocalScalarAccess(VectorExpression, VectorLValue):
+    name: common.SymbolRef
 
 
 class VectorArithmetic(common.BinaryOp[VectorExpression], VectorExpression):
@@ -140,8 +177,36 @@ class MaskBlock(common.Stmt):
     body: List[VectorAssign]
 
 
+class VectorAccumulate(common.Stmt):
+    """
+    In-place cumulative `op` of a field along K, in the iteration order of `direction`.
+
+    The accumulation starts at the level before the vertical interval, so each level of the
+    interval is combined with the final value of the previous level.
+    """
+
+    name: str
+    op: common.ArithmeticOperator
+    direction: common.LoopOrder
+
+    @validator("op")
+    def is_supported_op(cls, op: common.ArithmeticOperator) -> common.ArithmeticOperator:
+        if op not in (common.ArithmeticOperator.ADD, common.ArithmeticOperator.MUL):
+            raise ValueError(f"Cannot accumulate with operator {op}.")
+        return op
+
+    @validator("direction")
+    def is_sequential(cls, direction: common.LoopOrder) -> common.LoopOrder:
+        if direction == common.LoopOrder.PARALLEL:
+            raise ValueError("Accumulation requires a sequential direction.")
+        return direction
+
+
 class HorizontalBlock(common.LocNode):
-    body: List[Union[VectorAssign, MaskBlock]]
+    body: List[Union[VectorAssign, MaskBlock, VectorAccumulate]]
+    declarations: List[LocalScalarDecl] = eve.field(default_factory=list)
+    #: Boundary ((i_lower, i_upper), (j_lower, j_upper)) of the computed region around the domain
+    extent: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
 
 
 class VerticalPass(common.LocNode):
@@ -157,6 +222,7 @@ class Computation(common.LocNode, eve.SymbolTableTrait):
     field_params: List[str]
     params: List[str]
     vertical_passes: List[VerticalPass]
+    temp_buffers: List[TemporaryBuffer] = eve.field(default_factory=list)
 
 
 class NativeFuncCall(common.NativeFuncCall[Expr], VectorExpression):
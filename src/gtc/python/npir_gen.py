@@ -15,7 +15,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import textwrap
-from typing import Any, Collection, Tuple, Union
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple, Union, cast
 
 from eve.codegen import FormatTemplate, JinjaTemplate, TemplatedGenerator
 from gtc import common
@@ -39,37 +39,211 @@ def op_delta_from_int(value: int) -> Tuple[str, str]:
     return operator, delta
 
 
-ORIGIN_CORRECTED_VIEW_CLASS = textwrap.dedent(
-    """\
-    class ShimmedView:
-        def __init__(self, field, offsets):
-            self.field = field
-            self.offsets = offsets
-
-        def shim_key(self, key):
-            new_args = []
-            if not isinstance(key, tuple):
-                key = (key, )
-            for dim, idx in enumerate(key):
-                if self.offsets[dim] == 0:
-                    new_args.append(idx)
-                elif isinstance(idx, slice):
-                    start = 0 if idx.start is None else idx.start
-                    stop = -1 if idx.stop is None else idx.stop
-                    new_args.append(
-                        slice(start + self.offsets[dim], stop + self.offsets[dim], idx.step)
-                    )
-                else:
-                    new_args.append(idx + self.offsets[dim])
-            return tuple(new_args)
+ARITHMETIC_UFUNCS = {
+    common.ArithmeticOperator.ADD: "add",
+    common.ArithmeticOperator.SUB: "subtract",
+    common.ArithmeticOperator.MUL: "multiply",
+    common.ArithmeticOperator.DIV: "true_divide",
+}
+
+COMPARISON_UFUNCS = {
+    common.ComparisonOperator.GT: "greater",
+    common.ComparisonOperator.LT: "less",
+    common.ComparisonOperator.GE: "greater_equal",
+    common.ComparisonOperator.LE: "less_equal",
+    common.ComparisonOperator.EQ: "equal",
+    common.ComparisonOperator.NE: "not_equal",
+}
+
+UNARY_UFUNCS = {
+    common.UnaryOperator.POS: "positive",
+    common.UnaryOperator.NEG: "negative",
+    common.UnaryOperator.NOT: "bitwise_not",
+}
+
+NATIVE_UFUNCS = {
+    common.NativeFunction.MIN: "minimum",
+    common.NativeFunction.MAX: "maximum",
+    common.NativeFunction.POW: "power",
+}
+
+
+def ufunc_name(node: npir.Expr) -> Optional[str]:
+    """Return the name of the NumPy ufunc computing `node`, `None` if it is not a ufunc call."""
+    if isinstance(node, npir.VectorArithmetic):
+        if isinstance(node.op, common.ArithmeticOperator):
+            return ARITHMETIC_UFUNCS[node.op]
+        return COMPARISON_UFUNCS[node.op]
+    if isinstance(node, npir.VectorLogic):
+        return f"bitwise_{node.op}"
+    if isinstance(node, npir.VectorUnaryOp):
+        return UNARY_UFUNCS[node.op]
+    if isinstance(node, npir.NativeFuncCall):
+        return NATIVE_UFUNCS.get(node.func, str(node.func))
+    return None
+
+
+def ufunc_operands(node: npir.Expr) -> List[npir.Expr]:
+    """Return the operands of a node computed by a ufunc (see :func:`ufunc_name`)."""
+    if isinstance(node, (npir.VectorArithmetic, npir.VectorLogic)):
+        return [node.left, node.right]
+    if isinstance(node, npir.VectorUnaryOp):
+        return [node.expr]
+    if isinstance(node, npir.NativeFuncCall):
+        return list(node.args)
+    raise TypeError(f"{type(node).__name__} is not computed by a ufunc.")
+
+
+def horizontal_extent(
+    node: npir.HorizontalBlock, field_extents: Optional[FIELD_EXT_T]
+) -> Tuple[List[int], List[int]]:
+    """Return the lower and upper boundary of the region computed by a horizontal block."""
+    lower, upper = [0, 0], [0, 0]
+    if node.extent is not None:
+        (lower[0], upper[0]), (lower[1], upper[1]) = node.extent
+    elif field_extents:
+        fields = set(node.iter_tree().if_isinstance(npir.FieldSlice).getattr("name")) & set(
+            field_extents
+        )
+        lower[0] = min(field_extents[field].to_boundary()[0][0] for field in fields)
+        lower[1] = min(field_extents[field].to_boundary()[1][0] for field in fields)
+        upper[0] = min(field_extents[field].to_boundary()[0][1] for field in fields)
+        upper[1] = min(field_extents[field].to_boundary()[1][1] for field in fields)
+    return lower, upper
+
+
+def field_shifts(
+    node: npir.Computation, field_extents: Optional[FIELD_EXT_T]
+) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Compute how many points before the compute domain the view of each field starts.
+
+    Fields are accessed through views starting at the origin of the field minus the shift, which
+    is large enough for all accessed indices to be non-negative. Offsets of the accesses are then
+    plain slices of the views, with the shift folded into the constant offset. Temporaries are
+    allocated with their boundary, their shift is the lower boundary and the view is the array.
+    The K shift only accounts for intervals starting relative to the start of the domain.
+    """
+    shifts: Dict[str, Tuple[int, int, int]] = {}
+
+    def update(name: str, shift: Sequence[Optional[int]]) -> None:
+        current = shifts.get(name, (0, 0, 0))
+        shifts[name] = cast(
+            Tuple[int, int, int],
+            tuple(max(c, s) if s is not None else c for c, s in zip(current, shift)),
+        )
 
-        def __getitem__(self, key):
-            return self.field.__getitem__(self.shim_key(key))
+    temps: Dict[str, Tuple[int, int, int]] = {}
+    for vertical_pass in node.vertical_passes:
+        for temp_def in vertical_pass.temp_defs:
+            lower_i, lower_j = 0, 0
+            if temp_def.right.buffer is not None:
+                boundary = node.temp_buffers[temp_def.right.buffer].boundary
+                lower_i, lower_j = boundary[0][0], boundary[1][0]
+            elif field_extents and (extent := field_extents.get(str(temp_def.left.name))):
+                extent_boundary = extent.to_boundary()
+                lower_i, lower_j = extent_boundary[0][0], extent_boundary[1][0]
+            temps[str(temp_def.left.name)] = (lower_i, lower_j, 0)
+
+    for vertical_pass in node.vertical_passes:
+        start = vertical_pass.lower
+        k_start = start.offset if start.level == common.LevelMarker.START else None
+        for block in vertical_pass.body:
+            lower, _ = horizontal_extent(block, field_extents)
+            for field_slice in block.iter_tree().if_isinstance(npir.FieldSlice):
+                offsets = (field_slice.i_offset, field_slice.j_offset, field_slice.k_offset)
+                starts = (lower[0], lower[1], -k_start if k_start is not None else None)
+                update(
+                    field_slice.name,
+                    tuple(
+                        s - offset.offset.value if offset and s is not None else None
+                        for offset, s in zip(offsets, starts)
+                    ),
+                )
+            for accumulate in block.iter_tree().if_isinstance(npir.VectorAccumulate):
+                k_lower = 1 if accumulate.direction == common.LoopOrder.FORWARD else 0
+                update(
+                    accumulate.name,
+                    (lower[0], lower[1], k_lower - k_start if k_start is not None else None),
+                )
+
+    return {**shifts, **temps}
+
+
+def kernel_name(index: int) -> str:
+    """Return the name of the compiled kernel of the vertical pass at `index`."""
+    return f"vertical_pass_{index}"
+
+
+def kernel_params(node: npir.VerticalPass) -> Tuple[List[str], List[str]]:
+    """Return the fields and the scalars accessed by a vertical pass, in order of appearance."""
+    fields = node.iter_tree().if_isinstance(npir.FieldSlice).getattr("name")
+    scalars = node.iter_tree().if_isinstance(npir.NamedScalar).getattr("name")
+    return list(dict.fromkeys(fields)), list(dict.fromkeys(scalars))
+
+
+def is_tileable(node: npir.Computation, field_extents: Optional[FIELD_EXT_T]) -> bool:
+    """
+    Check if the computation can run independently on tiles of the horizontal domain.
 
-        def __setitem__(self, key, value):
-            return self.field.__setitem__(self.shim_key(key), value)
+    Each tile recomputes the temporaries on its own boundary. The fields written by the stencil
+    must thus only be accessed by blocks computing exactly the domain and without horizontal
+    offset, otherwise a tile would depend on the writes of its neighbours.
     """
-)
+
+    def is_centered(offset: Optional[npir.AxisOffset]) -> bool:
+        return offset is None or offset.offset.value == 0
+
+    written = set(
+        node.iter_tree()
+        .if_isinstance(npir.VectorAssign)
+        .getattr("left")
+        .if_isinstance(npir.FieldSlice)
+        .getattr("name")
+    ) | set(node.iter_tree().if_isinstance(npir.VectorAccumulate).getattr("name"))
+    written &= set(node.field_params)
+    for block in node.iter_tree().if_isinstance(npir.HorizontalBlock):
+        slices = [
+            field_slice
+            for field_slice in block.iter_tree().if_isinstance(npir.FieldSlice)
+            if field_slice.name in written
+        ]
+        accumulates = [
+            accumulate
+            for accumulate in block.iter_tree().if_isinstance(npir.VectorAccumulate)
+            if accumulate.name in written
+        ]
+        if (slices or accumulates) and horizontal_extent(block, field_extents) != ([0, 0], [0, 0]):
+            return False
+        if not all(
+            is_centered(field_slice.i_offset) and is_centered(field_slice.j_offset)
+            for field_slice in slices
+        ):
+            return False
+    return True
+
+
+def _shifted(offset: npir.AxisOffset, delta: int) -> npir.AxisOffset:
+    if delta == 0:
+        return offset
+    return offset.copy(update={"offset": npir.NumericalOffset(value=offset.offset.value + delta)})
+
+
+def _shifted_bound(bound: str, delta: int) -> str:
+    operator, delta_str = op_delta_from_int(delta)
+    return f"({bound}{operator}{delta_str})" if delta else bound
+
+
+def fusable_cast(node: npir.Expr) -> Optional[npir.Cast]:
+    """Return the floating point cast wrapped by `node`, if it can be fused into a ufunc."""
+    if isinstance(node, npir.BroadCast):
+        node = node.expr
+    if isinstance(node, npir.Cast) and node.dtype in (
+        common.DataType.FLOAT32,
+        common.DataType.FLOAT64,
+    ):
+        return node
+    return None
 
 
 class NpirGen(TemplatedGenerator):
@@ -104,6 +278,8 @@ class NpirGen(TemplatedGenerator):
         lpar, rpar = "()" if offset else ("", "")
         variant = self.AxisOffset_parallel if node.parallel else self.AxisOffset_serial
         rendered = variant.render(lpar=lpar, rpar=rpar, axis_name=axis_name, offset=offset)
+        if node.modulo is not None and not node.parallel:
+            rendered = f"({rendered}) % {node.modulo}"
         return self.generic_visit(node, parallel_or_serial_variant=rendered, **kwargs)
 
     AxisOffset_parallel = JinjaTemplate(
@@ -136,9 +312,15 @@ class NpirGen(TemplatedGenerator):
 
     def visit_FieldSlice(self, node: npir.FieldSlice, **kwargs: Any) -> Union[str, Collection[str]]:
         kwargs.setdefault("mask_acc", "")
+        shift = kwargs.get("field_shifts", {}).get(node.name, (0, 0, 0))
+        # Fields without K dimension are reshaped to a single level, which a level-by-level
+        # pass selects like the K offset of the other fields
+        missing = [":", ":", "0" if kwargs.get("serial_k") else ":"]
         offsets = ", ".join(
-            self.visit(offset, **kwargs) if offset else ":"
-            for offset in [node.i_offset, node.j_offset, node.k_offset]
+            self.visit(_shifted(offset, delta), **kwargs) if offset else default
+            for offset, delta, default in zip(
+                [node.i_offset, node.j_offset, node.k_offset], shift, missing
+            )
         )
         return self.generic_visit(node, offsets=offsets, **kwargs)
 
@@ -147,29 +329,64 @@ class NpirGen(TemplatedGenerator):
     def visit_EmptyTemp(
         self, node: npir.EmptyTemp, *, temp_name: str, **kwargs
     ) -> Union[str, Collection[str]]:
-        shape = "_domain_"
-        origin = [0, 0, 0]
+        if node.buffer is not None:
+            return self.EmptyTemp_buffer.render(buffer=node.buffer)
+        k_size = "_dK_" if node.k_size is None else str(node.k_size)
+        shape = "_domain_" if node.k_size is None else f"(_dI_, _dJ_, {k_size})"
         if extents := kwargs.get("field_extents", {}).get(temp_name):
             boundary = extents.to_boundary()
             i_total = sum(boundary[0])
             j_total = sum(boundary[1])
-            shape = f"(_dI_ + {i_total}, _dJ_ + {j_total}, _dK_)"
-            origin[:2] = boundary[0][0], boundary[1][0]
-        return self.generic_visit(node, shape=shape, origin=origin, **kwargs)
+            shape = f"(_dI_ + {i_total}, _dJ_ + {j_total}, {k_size})"
+        return self.generic_visit(node, shape=shape, **kwargs)
+
+    EmptyTemp = FormatTemplate("np.zeros({shape}, dtype={dtype})")
+
+    EmptyTemp_buffer = FormatTemplate("_buffers_[{buffer}]")
+
+    def visit_TemporaryBuffer(
+        self, node: npir.TemporaryBuffer, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        i_total = sum(node.boundary[0])
+        j_total = sum(node.boundary[1])
+        k_levels = "_dK_" if node.k_size is None else str(node.k_size)
+        return self.generic_visit(
+            node, i_total=i_total, j_total=j_total, k_levels=k_levels, **kwargs
+        )
 
-    EmptyTemp = FormatTemplate("ShimmedView(np.zeros({shape}, dtype={dtype}), {origin})")
+    TemporaryBuffer = FormatTemplate(
+        "np.empty((_dI_ + {i_total}, _dJ_ + {j_total}, {k_levels}), dtype={dtype})"
+    )
 
     NamedScalar = FormatTemplate("{name}")
 
+    def visit_LocalScalarDecl(
+        self, node: npir.LocalScalarDecl, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        shape = "(I - i, J - j, K - k)" if node.parallel_k else "(I - i, J - j)"
+        return self.generic_visit(node, shape=shape, **kwargs)
+
+    LocalScalarDecl = FormatTemplate("{name}_ = np.empty({shape}, dtype={dtype})")
+
+    def visit_LocalScalarAccess(
+        self, node: npir.LocalScalarAccess, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        kwargs.setdefault("mask_acc", "")
+        return self.generic_visit(node, **kwargs)
+
+    LocalScalarAccess = FormatTemplate("{name}_{mask_acc}")
+
     VectorTemp = FormatTemplate("{name}_")
 
     def visit_MaskBlock(self, node: npir.MaskBlock, **kwargs) -> Union[str, Collection[str]]:
         if isinstance(node.mask, npir.FieldSlice):
             mask_def = ""
         elif isinstance(node.mask, npir.BroadCast):
-            mask_name = node.mask_name
-            mask = self.visit(node.mask)
-            mask_def = f"{mask_name}_ = np.full((I - i, J - j, K - k), {mask})\n"
+            # A scalar condition selects the whole block at once, no mask array is needed
+            return self.MaskBlock_scalar.render(
+                mask=self.visit(node.mask.expr, **kwargs),
+                body=[self.visit(stmt.copy(update={"mask": None}), **kwargs) for stmt in node.body],
+            )
         else:
             mask_name = node.mask_name
             mask = self.visit(node.mask)
@@ -185,6 +402,17 @@ class NpirGen(TemplatedGenerator):
         )
     )
 
+    MaskBlock_scalar = JinjaTemplate(
+        textwrap.dedent(
+            """\
+                if {{ mask }}:
+                {% for stmt in body %}{{ stmt | indent(4, first=True) }}
+                {% else %}    pass
+                {% endfor %}
+            """
+        )
+    )
+
     def visit_VectorAssign(
         self, node: npir.VectorAssign, **kwargs: Any
     ) -> Union[str, Collection[str]]:
@@ -193,12 +421,70 @@ class NpirGen(TemplatedGenerator):
             mask_acc = f"[{self.visit(node.mask, **kwargs)}]"
         if isinstance(node.right, npir.EmptyTemp):
             kwargs["temp_name"] = node.left.name
+            if node.right.buffer is not None and node.right.initialize:
+                return self.VectorAssign_zero_buffer.render(
+                    buffer=node.right.buffer,
+                    assign=self.generic_visit(node, mask_acc=mask_acc, **kwargs),
+                )
+        if not mask_acc and ufunc_name(node.right):
+            # Write the result of the outermost ufunc directly into the target
+            return self.visit(node.right, out=self.visit(node.left, **kwargs), **kwargs)
+        if isinstance(node.left, npir.LocalScalarAccess):
+            # Locals are updated in place, they may be partially written under a mask
+            return self.VectorAssign.render(
+                left=self.visit(node.left, mask_acc=mask_acc or "[...]", **kwargs),
+                right=self.visit(node.right, mask_acc=mask_acc, **kwargs),
+            )
         return self.generic_visit(node, mask_acc=mask_acc, **kwargs)
 
     VectorAssign = FormatTemplate("{left} = {right}")
 
+    VectorAssign_zero_buffer = FormatTemplate("_buffers_[{buffer}].fill(0)\n{assign}")
+
+    def visit_VectorArithmetic(
+        self, node: npir.VectorArithmetic, *, out: Optional[str] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if isinstance(node.op, common.ArithmeticOperator):
+            # Let the ufunc convert the operands on the fly instead of materializing
+            # a converted copy of each of them
+            left_cast, right_cast = fusable_cast(node.left), fusable_cast(node.right)
+            dtypes = {cast.dtype for cast in (left_cast, right_cast) if cast}
+            if len(dtypes) == 1:
+                return self.UfuncCall.render(
+                    ufunc=ARITHMETIC_UFUNCS[node.op],
+                    args=[
+                        self.visit(left_cast.expr if left_cast else node.left, **kwargs),
+                        self.visit(right_cast.expr if right_cast else node.right, **kwargs),
+                    ],
+                    dtype=self.visit(dtypes.pop()),
+                    out=out,
+                )
+        if out is not None:
+            return self.visit_ufunc(node, out=out, **kwargs)
+        return self.generic_visit(node, **kwargs)
+
     VectorArithmetic = FormatTemplate("({left} {op} {right})")
 
+    def visit_ufunc(self, node: npir.Expr, *, out: str, **kwargs: Any) -> str:
+        return self.UfuncCall.render(
+            ufunc=ufunc_name(node),
+            args=[self.visit(operand, **kwargs) for operand in ufunc_operands(node)],
+            dtype=None,
+            out=out,
+        )
+
+    UfuncCall = JinjaTemplate(
+        "np.{{ ufunc }}({{ args | join(', ') }}{% if dtype %}, dtype={{ dtype }}{% endif %}"
+        "{% if out %}, out={{ out }}{% endif %})"
+    )
+
+    def visit_VectorLogic(
+        self, node: npir.VectorLogic, *, out: Optional[str] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if out is not None:
+            return self.visit_ufunc(node, out=out, **kwargs)
+        return self.generic_visit(node, **kwargs)
+
     VectorLogic = FormatTemplate("np.bitwise_{op}({left}, {right})")
 
     def visit_UnaryOperator(
@@ -208,6 +494,13 @@ class NpirGen(TemplatedGenerator):
             return "np.bitwise_not"
         return self.generic_visit(node, **kwargs)
 
+    def visit_VectorUnaryOp(
+        self, node: npir.VectorUnaryOp, *, out: Optional[str] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if out is not None:
+            return self.visit_ufunc(node, out=out, **kwargs)
+        return self.generic_visit(node, **kwargs)
+
     VectorUnaryOp = FormatTemplate("({op}({expr}))")
 
     VectorTernaryOp = FormatTemplate("np.where({cond}, {true_expr}, {false_expr})")
@@ -230,11 +523,55 @@ class NpirGen(TemplatedGenerator):
             return "for k_ in range(K-1, k-1, -1):"
         return ""
 
+    def visit_VectorAccumulate(
+        self, node: npir.VectorAccumulate, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        shift_i, shift_j, shift_k = kwargs.get("field_shifts", {}).get(node.name, (0, 0, 0))
+        i_slice = f"{_shifted_bound('i', shift_i)}:{_shifted_bound('I', shift_i)}"
+        j_slice = f"{_shifted_bound('j', shift_j)}:{_shifted_bound('J', shift_j)}"
+        if node.direction == common.LoopOrder.FORWARD:
+            k_slice = f"{_shifted_bound('k', shift_k - 1)}:{_shifted_bound('K', shift_k)}"
+            view = f"{node.name}_[{i_slice}, {j_slice}, {k_slice}]"
+        else:
+            k_slice = f"{_shifted_bound('k', shift_k)}:{_shifted_bound('K', shift_k + 1)}"
+            view = f"{node.name}_[{i_slice}, {j_slice}, {k_slice}][:, :, ::-1]"
+        return self.VectorAccumulate.render(ufunc=ARITHMETIC_UFUNCS[node.op], view=view)
+
+    VectorAccumulate = FormatTemplate("np.{ufunc}.accumulate({view}, axis=2, out={view})")
+
+    def visit_VerticalPass(
+        self, node: npir.VerticalPass, *, kernels: Optional[Dict[int, str]] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if kernels and id(node) in kernels:
+            fields, scalars = kernel_params(node)
+            return self.VerticalPass_kernel.render(
+                temp_defs=self.visit(node.temp_defs, **kwargs),
+                kernel=kernels[id(node)],
+                args=[f"{name}_" for name in fields] + scalars,
+            )
+        hoisted = []
+        if node.direction != common.LoopOrder.PARALLEL:
+            kwargs["serial_k"] = True
+            # Allocate the block locals once, they are overwritten on each level
+            hoisted = [
+                self.HorizontalBlock_declarations.render(
+                    bounds=self._horizontal_bounds(block, **kwargs),
+                    declarations=self.visit(block.declarations, **kwargs),
+                )
+                for block in node.body
+                if block.declarations
+            ]
+            node = node.copy(
+                update={"body": [block.copy(update={"declarations": []}) for block in node.body]}
+            )
+        return self.generic_visit(node, hoisted=hoisted, **kwargs)
+
     VerticalPass = JinjaTemplate(
         textwrap.dedent(
             """\
             # -- begin vertical block --{% set body_indent = 0 %}
             {% for assign in temp_defs %}{{ assign }}
+            {% endfor %}{% for declarations in hoisted %}{{ declarations }}
             {% endfor %}k, K = {{ lower }}, {{ upper }}{% if direction %}
             {{ direction }}{% set body_indent = 4 %}{% endif %}
             {% for hblock in body %}{{ hblock | indent(body_indent, first=True) }}
@@ -243,66 +580,191 @@ class NpirGen(TemplatedGenerator):
         )
     )
 
+    VerticalPass_kernel = JinjaTemplate(
+        textwrap.dedent(
+            """\
+            # -- begin vertical block --
+            {% for assign in temp_defs %}{{ assign }}
+            {% endfor %}_kernels_.{{ kernel }}({% for arg in args %}{{ arg }}, {% endfor %}_dI_, _dJ_, _dK_)
+            # -- end vertical block --
+            """
+        )
+    )
+
+    def _horizontal_bounds(self, node: npir.HorizontalBlock, **kwargs: Any) -> str:
+        lower, upper = horizontal_extent(node, kwargs.get("field_extents"))
+        return self.HorizontalBounds.render(h_lower=lower, h_upper=upper)
+
+    HorizontalBounds = FormatTemplate(
+        "i, I = _di_ - {h_lower[0]}, _dI_ + {h_upper[0]}\nj, J = _dj_ - {h_lower[1]}, _dJ_ + {h_upper[1]}"
+    )
+
     def visit_HorizontalBlock(
         self, node: npir.HorizontalBlock, **kwargs
     ) -> Union[str, Collection[str]]:
-        lower, upper = [0, 0], [0, 0]
-
-        if extents := kwargs.get("field_extents"):
-            fields = set(node.iter_tree().if_isinstance(npir.FieldSlice).getattr("name")) & set(
-                extents
-            )
-            lower[0] = min(extents[field].to_boundary()[0][0] for field in fields)
-            lower[1] = min(extents[field].to_boundary()[1][0] for field in fields)
-            upper[0] = min(extents[field].to_boundary()[0][1] for field in fields)
-            upper[1] = min(extents[field].to_boundary()[1][1] for field in fields)
-        return self.generic_visit(node, h_lower=lower, h_upper=upper, **kwargs)
+        return self.generic_visit(node, bounds=self._horizontal_bounds(node, **kwargs), **kwargs)
 
     HorizontalBlock = JinjaTemplate(
         textwrap.dedent(
             """\
             # --- begin horizontal block --
-            i, I = _di_ - {{ h_lower[0] }}, _dI_ + {{ h_upper[0] }}
-            j, J = _dj_ - {{ h_lower[1] }}, _dJ_ + {{ h_upper[1] }}
-            {% for assign in body %}{{ assign }}
+            {{ bounds }}
+            {% for decl in declarations %}{{ decl }}
+            {% endfor %}{% for assign in body %}{{ assign }}
             {% endfor %}# --- end horizontal block --
 
             """
         )
     )
 
+    HorizontalBlock_declarations = JinjaTemplate(
+        "{{ bounds }}{% for decl in declarations %}\n{{ decl }}{% endfor %}"
+    )
+
     def visit_Computation(
-        self, node: npir.Computation, *, field_extents: FIELD_EXT_T, **kwargs: Any
+        self,
+        node: npir.Computation,
+        *,
+        field_extents: FIELD_EXT_T,
+        kernels_module: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        array_api: bool = False,
+        **kwargs: Any,
     ) -> Union[str, Collection[str]]:
         signature = ["*", *node.params, "_domain_", "_origin_"]
+        tile_origins = []
+        if (
+            num_threads is not None
+            and num_threads > 1
+            and kernels_module is None
+            and is_tileable(node, field_extents)
+        ):
+            # The tiles are computed on views of the fields starting at the origin of the tile
+            for decl in node.field_decls:
+                if decl.name in node.field_params:
+                    origin = f'_origin_["{decl.name}"]'
+                    i_start = f"{origin}[0]" + (" + _i_" if decl.dimensions[0] else "")
+                    j_start = f"{origin}[1]" + (" + _j_" if decl.dimensions[1] else "")
+                    tile_origins.append(f'"{decl.name}": ({i_start}, {j_start}, *{origin}[2:])')
+        else:
+            num_threads = None
         kwargs["field_extents"] = field_extents
+        if kernels_module is not None:
+            # Sequential passes are computed by the extension generated by `SequentialKernelGen`
+            kwargs["kernels"] = {
+                id(vertical_pass): kernel_name(index)
+                for index, vertical_pass in enumerate(node.vertical_passes)
+                if vertical_pass.direction != common.LoopOrder.PARALLEL
+            }
+        kwargs["field_shifts"] = field_shifts(node, field_extents)
+        accessed = node.iter_tree().if_isinstance(npir.FieldSlice).getattr("name").to_set()
+        data_views = [
+            self.DataView.render(name=name, shift=kwargs["field_shifts"].get(name, (0, 0, 0)))
+            for name in node.field_params
+            if name in accessed
+        ]
         return self.generic_visit(
             node,
             signature=", ".join(signature),
-            data_view_class=ORIGIN_CORRECTED_VIEW_CLASS,
+            data_views=data_views,
+            kernels_module=kernels_module,
+            num_threads=num_threads,
+            tile_origins=tile_origins,
+            array_fields=[name for name in node.field_params if name in accessed]
+            if array_api
+            else [],
             **kwargs,
         )
 
+    DataView = JinjaTemplate(
+        "{{ name }}_ = {{ name }}[{% for s in shift %}"
+        '_origin_["{{ name }}"][{{ loop.index0 }}]{% if s %} - {{ s }}{% endif %}:'
+        "{% if not loop.last %}, {% endif %}{% endfor %}]"
+    )
+
     Computation = JinjaTemplate(
         textwrap.dedent(
             """\
             import numpy as np
+            {% if array_fields %}import array_api_compat
+            {% endif %}{% if kernels_module %}import {{ kernels_module }} as _kernels_
+            {% endif %}{% if num_threads %}import concurrent.futures
+            {% endif %}{% if temp_buffers %}import threading
+
+
+            # Buffers of the temporaries, allocated once per domain and thread
+            _temporaries_ = threading.local()
+            {% endif %}{% if num_threads %}
+
+            _executor_ = concurrent.futures.ThreadPoolExecutor(max_workers={{ num_threads }})
 
 
+            def _tiles_(domain):
+                \"\"\"Split the horizontal domain into one tile per thread, along I first.\"\"\"
+                n_i = max(min({{ num_threads }}, domain[0]), 1)
+                n_j = max(min({{ num_threads }} // n_i, domain[1]), 1)
+                for t_i in range(n_i):
+                    i, I = domain[0] * t_i // n_i, domain[0] * (t_i + 1) // n_i
+                    for t_j in range(n_j):
+                        j, J = domain[1] * t_j // n_j, domain[1] * (t_j + 1) // n_j
+                        yield i, j, (I - i, J - j, *domain[2:])
+            {% endif %}
+
             def run({{ signature }}):
+                {% if array_fields %}
+                # -- begin array namespace --
+                xp = array_api_compat.array_namespace({{ array_fields | join(", ") }})
+                # -- end array namespace --
+                {% endif %}{% if num_threads %}
+                {% for decl in field_decls %}{{ decl | indent(4) }}
+                {% endfor %}
+                # -- begin tiles --
+                _futures_ = [
+                    _executor_.submit(
+                        _run_tile_,
+                        {% for param in params %}{{ param }}={{ param }},
+                        {% endfor %}_domain_=_tile_domain_,
+                        _origin_={ {{- tile_origins | join(", ") -}} },
+                    )
+                    for _i_, _j_, _tile_domain_ in _tiles_(_domain_)
+                ]
+                for _future_ in _futures_:
+                    _future_.result()
+                # -- end tiles --
+
 
+            def _run_tile_({{ signature }}):
+                {% if array_fields %}xp = array_api_compat.array_namespace({{ array_fields | join(", ") }})
+                {% endif %}{% endif %}
                 # -- begin domain boundary shortcuts --
                 _di_, _dj_, _dk_ = 0, 0, 0
                 _dI_, _dJ_, _dK_ = _domain_
                 # -- end domain padding --
 
-                {% for decl in field_decls %}{{ decl | indent(4) }}
-                {% endfor %}
+                {% if not num_threads %}{% for decl in field_decls %}{{ decl | indent(4) }}
+                {% endfor %}{% endif %}
                 # -- begin data views --
-                {{ data_view_class | indent(4) }}
-                {% for name in field_params %}{{ name }}_ = ShimmedView({{ name }}, _origin_["{{ name }}"])
+                {% for view in data_views %}{{ view }}
                 {% endfor %}# -- end data views --
-
+                {% if temp_buffers %}
+                # -- begin temporary buffers --
+                {% if num_threads -%}
+                # A domain has at most two tile sizes along each axis
+                _tiles_buffers_ = _temporaries_.__dict__.setdefault("tiles", {})
+                if tuple(_domain_) not in _tiles_buffers_:
+                    if len(_tiles_buffers_) >= 4:
+                        _tiles_buffers_.clear()
+                    _tiles_buffers_[tuple(_domain_)] = [{{ temp_buffers | join(", ") }}]
+                _buffers_ = _tiles_buffers_[tuple(_domain_)]
+                {%- else -%}
+                if getattr(_temporaries_, "domain", None) != tuple(_domain_):
+                    _temporaries_.buffers = None
+                    _temporaries_.buffers = [{{ temp_buffers | join(", ") }}]
+                    _temporaries_.domain = tuple(_domain_)
+                _buffers_ = _temporaries_.buffers
+                {%- endif %}
+                # -- end temporary buffers --
+                {% endif %}
                 {% for pass in vertical_passes %}
                 {{ pass | indent(4) }}
                 {% endfor %}
@@ -313,12 +775,15 @@ class NpirGen(TemplatedGenerator):
     def visit_NativeFunction(
         self, node: common.NativeFunction, **kwargs: Any
     ) -> Union[str, Collection[str]]:
-        if node == common.NativeFunction.MIN:
-            return "minimum"
-        elif node == common.NativeFunction.MAX:
-            return "maximum"
-        elif node == common.NativeFunction.POW:
-            return "power"
+        if node in NATIVE_UFUNCS:
+            return NATIVE_UFUNCS[node]
+        return self.generic_visit(node, **kwargs)
+
+    def visit_NativeFuncCall(
+        self, node: npir.NativeFuncCall, *, out: Optional[str] = None, **kwargs: Any
+    ) -> Union[str, Collection[str]]:
+        if out is not None:
+            return self.visit_ufunc(node, out=out, **kwargs)
         return self.generic_visit(node, **kwargs)
 
     NativeFuncCall = FormatTemplate("np.{func}({', '.join(arg for arg in args)})")
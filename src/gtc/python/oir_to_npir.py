@@ -18,7 +18,7 @@ import itertools
 import typing
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Optional, Union
 
 from eve.visitors import NodeTranslator
 
@@ -26,6 +26,10 @@ from .. import common, oir
 from . import npir
 
 
+if TYPE_CHECKING:
+    from gt4py.definitions import Extent
+
+
 class OirToNpir(NodeTranslator):
     """Lower from optimizable IR (OIR) to numpy IR (NPIR)."""
 
@@ -43,9 +47,11 @@ class OirToNpir(NodeTranslator):
 
         def ensure_temp_defined(self, temp: Union[oir.FieldAccess, npir.FieldSlice]) -> None:
             if temp.name not in self.temp_defs:
+                decl = self.symbol_table[str(temp.name)]
+                k_size = decl.k_planes if decl.dimensions[2] else 1
                 self.temp_defs[str(temp.name)] = npir.VectorAssign(
                     left=npir.VectorTemp(name=str(temp.name), dtype=temp.dtype),
-                    right=npir.EmptyTemp(dtype=temp.dtype),
+                    right=npir.EmptyTemp(dtype=temp.dtype, k_size=k_size),
                 )
 
     def visit_Stencil(self, node: oir.Stencil, **kwargs: Any) -> npir.Computation:
@@ -109,10 +115,23 @@ class OirToNpir(NodeTranslator):
         node: oir.HorizontalExecution,
         *,
         ctx: Optional[ComputationContext] = None,
+        block_extents: Optional[Dict[int, "Extent"]] = None,
         **kwargs: Any,
     ) -> npir.HorizontalBlock:
+        extent = None
+        if block_extents is not None:
+            boundary = block_extents[id(node)].to_boundary()
+            extent = (tuple(boundary[0]), tuple(boundary[1]))
+        local_names = {decl.name for decl in node.declarations}
         return npir.HorizontalBlock(
-            body=self.visit(node.body, ctx=ctx, **kwargs),
+            body=self.visit(node.body, ctx=ctx, local_names=local_names, **kwargs),
+            declarations=[
+                npir.LocalScalarDecl(
+                    name=decl.name, dtype=decl.dtype, parallel_k=kwargs["parallel_k"]
+                )
+                for decl in node.declarations
+            ],
+            extent=extent,
         )
 
     def visit_MaskStmt(
@@ -182,11 +201,15 @@ class OirToNpir(NodeTranslator):
         **kwargs: Any,
     ) -> npir.FieldSlice:
         dims = decl.dimensions if (decl := ctx.symbol_table.get(node.name)) else (True, True, True)
+        k_planes = decl.k_planes if isinstance(decl, oir.Temporary) else None
         return npir.FieldSlice(
             name=str(node.name),
             i_offset=npir.AxisOffset.i(node.offset.i) if dims[0] else None,
             j_offset=npir.AxisOffset.j(node.offset.j) if dims[1] else None,
-            k_offset=npir.AxisOffset.k(node.offset.k, parallel=parallel_k) if dims[2] else None,
+            k_offset=npir.AxisOffset.k(node.offset.k, parallel=parallel_k, modulo=k_planes)
+            if dims[2]
+            else None,
+            dtype=node.dtype,
         )
 
     def visit_FieldDecl(self, node: oir.FieldDecl, **kwargs) -> npir.FieldDecl:
@@ -205,17 +228,20 @@ class OirToNpir(NodeTranslator):
         right = self.visit(node.right, ctx=ctx, **kwargs)
 
         if isinstance(node.op, common.LogicalOperator):
-            return npir.VectorLogic(op=node.op, left=left, right=right)
+            return npir.VectorLogic(op=node.op, left=left, right=right, dtype=node.dtype)
 
         return npir.VectorArithmetic(
             op=node.op,
             left=left,
             right=right,
+            dtype=node.dtype,
         )
 
     def visit_UnaryOp(self, node: oir.UnaryOp, **kwargs: Any) -> npir.VectorUnaryOp:
         kwargs["broadcast"] = True
-        return npir.VectorUnaryOp(op=node.op, expr=self.visit(node.expr, **kwargs))
+        return npir.VectorUnaryOp(
+            op=node.op, expr=self.visit(node.expr, **kwargs), dtype=node.dtype
+        )
 
     def visit_TernaryOp(self, node: oir.TernaryOp, **kwargs: Any) -> npir.VectorTernaryOp:
         kwargs["broadcast"] = True
@@ -242,8 +268,15 @@ class OirToNpir(NodeTranslator):
         return literal
 
     def visit_ScalarAccess(
-        self, node: oir.ScalarAccess, *, broadcast: bool = False, **kwargs: Any
-    ) -> Union[npir.BroadCast, npir.NamedScalar]:
+        self,
+        node: oir.ScalarAccess,
+        *,
+        broadcast: bool = False,
+        local_names: Collection[str] = (),
+        **kwargs: Any,
+    ) -> Union[npir.BroadCast, npir.NamedScalar, npir.LocalScalarAccess]:
+        if node.name in local_names:
+            return npir.LocalScalarAccess(name=node.name, dtype=node.dtype)
         name = npir.NamedScalar(
             name=self.visit(node.name, **kwargs), dtype=self.visit(node.dtype, **kwargs)
         )
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Set, Union
+
+from eve import NodeTranslator
+from gtc import common
+from gtc.python import npir
+from gtc.python.npir_gen import ufunc_name, ufunc_operands
+
+
+@dataclass
+class _ScratchPool:
+    """Scratch arrays of a horizontal block, each one is free or holds an intermediate result."""
+
+    parallel_k: bool
+    counter: Iterator[int]
+    declarations: List[npir.LocalScalarDecl] = field(default_factory=list)
+    free: List[npir.LocalScalarDecl] = field(default_factory=list)
+
+    def acquire(self, dtype: common.DataType) -> npir.LocalScalarDecl:
+        for decl in self.free:
+            if decl.dtype == dtype:
+                self.free.remove(decl)
+                return decl
+        decl = npir.LocalScalarDecl(
+            name=f"_scratch_{next(self.counter)}", dtype=dtype, parallel_k=self.parallel_k
+        )
+        self.declarations.append(decl)
+        return decl
+
+    def release(self, name: str) -> None:
+        self.free.extend(decl for decl in self.declarations if decl.name == name)
+
+
+class SplitUfuncExpressions(NodeTranslator):
+    """
+    Evaluate nested ufunc expressions into reusable scratch arrays.
+
+    NumPy allocates a new array for the result of every operator of an expression, and the
+    assignment copies the final result into the target. Together with the `out=` argument that
+    :class:`NpirGen` uses for the outermost ufunc of an assignment, this pass makes each
+    intermediate result be written into a scratch array of the horizontal block instead.
+    Scratch arrays are declared as block locals and shared by all the statements of the block,
+    a ufunc overwrites the scratch array of one of its operands whenever possible.
+
+    Only unmasked assignments are split, and only sub-expressions which have the shape of the
+    horizontal block, i.e. do not access lower dimensional fields or fields with data dimensions.
+    """
+
+    def visit_Computation(self, node: npir.Computation, **kwargs: Any) -> npir.Computation:
+        partial_fields = {
+            decl.name for decl in node.field_decls if not all(decl.dimensions) or decl.data_dims
+        }
+        return self.generic_visit(
+            node, partial_fields=partial_fields, counter=itertools.count(), **kwargs
+        )
+
+    def visit_VerticalPass(self, node: npir.VerticalPass, **kwargs: Any) -> npir.VerticalPass:
+        return self.generic_visit(
+            node, parallel_k=node.direction == common.LoopOrder.PARALLEL, **kwargs
+        )
+
+    def visit_HorizontalBlock(
+        self, node: npir.HorizontalBlock, *, parallel_k: bool, counter: Iterator[int], **kwargs: Any
+    ) -> npir.HorizontalBlock:
+        pool = _ScratchPool(parallel_k=parallel_k, counter=counter)
+        body: List[Union[npir.VectorAssign, npir.MaskBlock, npir.VectorAccumulate]] = []
+        for stmt in node.body:
+            if isinstance(stmt, npir.VectorAssign) and stmt.mask is None and ufunc_name(stmt.right):
+                right = self._split_operands(stmt.right, pool=pool, body=body, **kwargs)
+                stmt = stmt.copy(update={"right": right})
+            body.append(stmt)
+        return node.copy(
+            update={"body": body, "declarations": [*node.declarations, *pool.declarations]}
+        )
+
+    def _split_operands(self, node: npir.Expr, *, pool: _ScratchPool, **kwargs: Any) -> npir.Expr:
+        """Evaluate the ufunc operands of `node` into scratch arrays."""
+        update: Dict[str, Any] = {}
+        for name in ("left", "right", "expr", "args"):
+            if not hasattr(node, name):
+                continue
+            value = getattr(node, name)
+            if isinstance(value, list):
+                update[name] = [self._to_scratch(arg, pool=pool, **kwargs) for arg in value]
+            else:
+                update[name] = self._to_scratch(value, pool=pool, **kwargs)
+        # Operands are consumed by the ufunc, their scratch arrays can be reused for the result
+        for operand in ufunc_operands(node.copy(update=update)):
+            if isinstance(operand, npir.LocalScalarAccess) and operand.name.startswith("_scratch_"):
+                pool.release(operand.name)
+        return node.copy(update=update)
+
+    def _to_scratch(
+        self,
+        node: npir.Expr,
+        *,
+        pool: _ScratchPool,
+        body: List[Union[npir.VectorAssign, npir.MaskBlock, npir.VectorAccumulate]],
+        partial_fields: Set[str],
+    ) -> npir.Expr:
+        if not ufunc_name(node) or node.dtype is None:
+            return node
+        slices = node.iter_tree().if_isinstance(npir.FieldSlice).to_list()
+        locals_ = node.iter_tree().if_isinstance(npir.LocalScalarAccess).to_list()
+        if not (slices or locals_) or any(
+            field_slice.name in partial_fields
+            or None in (field_slice.i_offset, field_slice.j_offset, field_slice.k_offset)
+            for field_slice in slices
+        ):
+            return node
+
+        node = self._split_operands(node, pool=pool, body=body, partial_fields=partial_fields)
+        assert node.dtype is not None
+        decl = pool.acquire(node.dtype)
+        scratch = npir.LocalScalarAccess(name=decl.name, dtype=decl.dtype)
+        body.append(npir.VectorAssign(left=scratch, right=node, mask=None))
+        return scratch
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import textwrap
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
+
+from eve.codegen import FormatTemplate, JinjaTemplate, TemplatedGenerator, format_source
+from gtc import common
+from gtc.passes.gtir_legacy_extents import FIELD_EXT_T
+from gtc.python import npir
+from gtc.python.npir_gen import field_shifts, horizontal_extent, kernel_name, kernel_params
+
+
+__all__ = ["SequentialKernelGen", "has_kernels"]
+
+
+def has_kernels(node: npir.Computation) -> bool:
+    """Check if a computation has sequential vertical passes to be compiled into kernels."""
+    return any(
+        vertical_pass.direction != common.LoopOrder.PARALLEL
+        for vertical_pass in node.vertical_passes
+    )
+
+
+def _bounds(lower: List[int], upper: List[int]) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    return (str(-lower[0]), f"_dI_ + {upper[0]}"), (str(-lower[1]), f"_dJ_ + {upper[1]}")
+
+
+def _loop(index: str, start: str, end: str) -> str:
+    return f"for (py::ssize_t {index} = {start}; {index} < {end}; ++{index})"
+
+
+def _nest(headers: List[str], body: str) -> str:
+    """Nest `body` in braces after each of the `headers` (loops or conditions)."""
+    for header in reversed(headers):
+        opening = f"{header} {{" if header else "{"
+        body = f"{opening}\n{textwrap.indent(body, '    ')}\n}}"
+    return body
+
+
+def _columns_are_independent(node: npir.VerticalPass) -> bool:
+    """Check if no field written in the pass is read at a horizontal offset in the pass."""
+    written = {
+        str(assign.left.name)
+        for assign in node.iter_tree().if_isinstance(npir.VectorAssign)
+        if isinstance(assign.left, npir.FieldSlice)
+    }
+    return all(
+        field_slice.name not in written
+        or all(
+            offset is None or offset.offset.value == 0
+            for offset in (field_slice.i_offset, field_slice.j_offset)
+        )
+        for field_slice in node.iter_tree().if_isinstance(npir.FieldSlice)
+    )
+
+
+class SequentialKernelGen(TemplatedGenerator):
+    """
+    Generate a C++ extension computing the sequential vertical passes of a computation.
+
+    Each forward or backward vertical pass becomes a function of the extension taking the views of
+    the accessed fields (see :func:`field_shifts`), the scalar parameters and the domain size. The
+    function computes the pass as an explicit loop nest: column by column if no field written in
+    the pass is read at a horizontal offset, level by level otherwise. Parallel passes are left to
+    the NumPy code generated by :class:`NpirGen`.
+    """
+
+    DATA_TYPE_TO_CODE = {
+        common.DataType.BOOL: "bool",
+        common.DataType.INT8: "std::int8_t",
+        common.DataType.INT16: "std::int16_t",
+        common.DataType.INT32: "std::int32_t",
+        common.DataType.INT64: "std::int64_t",
+        common.DataType.FLOAT32: "float",
+        common.DataType.FLOAT64: "double",
+    }
+
+    NATIVE_FUNCTION_TO_CODE = {
+        common.NativeFunction.ABS: "std::abs",
+        common.NativeFunction.MIN: "std::min",
+        common.NativeFunction.MAX: "std::max",
+        common.NativeFunction.MOD: "std::fmod",
+        common.NativeFunction.SIN: "std::sin",
+        common.NativeFunction.COS: "std::cos",
+        common.NativeFunction.TAN: "std::tan",
+        common.NativeFunction.ARCSIN: "std::asin",
+        common.NativeFunction.ARCCOS: "std::acos",
+        common.NativeFunction.ARCTAN: "std::atan",
+        common.NativeFunction.SQRT: "std::sqrt",
+        common.NativeFunction.POW: "std::pow",
+        common.NativeFunction.EXP: "std::exp",
+        common.NativeFunction.LOG: "std::log",
+        common.NativeFunction.ISFINITE: "std::isfinite",
+        common.NativeFunction.ISINF: "std::isinf",
+        common.NativeFunction.ISNAN: "std::isnan",
+        common.NativeFunction.FLOOR: "std::floor",
+        common.NativeFunction.CEIL: "std::ceil",
+        common.NativeFunction.TRUNC: "std::trunc",
+    }
+
+    def visit_DataType(self, node: common.DataType, **kwargs: Any) -> str:
+        try:
+            return self.DATA_TYPE_TO_CODE[node]
+        except KeyError as error:
+            raise NotImplementedError(
+                f"Not implemented DataType '{node.name}' encountered."
+            ) from error
+
+    def visit_BuiltInLiteral(
+        self, node: common.BuiltInLiteral, *, dtype: Optional[str] = None, **kwargs: Any
+    ) -> str:
+        if node is common.BuiltInLiteral.TRUE:
+            return "true"
+        if node is common.BuiltInLiteral.FALSE:
+            return "false"
+        if node is common.BuiltInLiteral.MAX_VALUE:
+            return f"std::numeric_limits<{dtype}>::max()"
+        if node is common.BuiltInLiteral.MIN_VALUE:
+            return f"std::numeric_limits<{dtype}>::lowest()"
+        return str(node.value)
+
+    def visit_Literal(self, node: npir.Literal, **kwargs: Any) -> str:
+        dtype = self.visit(node.dtype)
+        if isinstance(node.value, common.BuiltInLiteral):
+            return self.visit(node.value, dtype=dtype)
+        return f"static_cast<{dtype}>({node.value})"
+
+    BroadCast = FormatTemplate("{expr}")
+
+    Cast = FormatTemplate("static_cast<{dtype}>({expr})")
+
+    NamedScalar = FormatTemplate("{name}")
+
+    def visit_FieldSlice(
+        self, node: npir.FieldSlice, *, field_shifts: Dict[str, Tuple[int, int, int]], **kwargs: Any
+    ) -> str:
+        shift = field_shifts.get(node.name, (0, 0, 0))
+        indices = []
+        for index, offset, delta in zip(
+            ("_i_", "_j_", "_k_"), (node.i_offset, node.j_offset, node.k_offset), shift
+        ):
+            if offset is None:
+                indices.append("0")
+            else:
+                value = offset.offset.value + delta
+                operator = "+" if value > 0 else "-"
+                index = f"{index} {operator} {abs(value)}" if value else index
+                indices.append(index if offset.modulo is None else f"({index}) % {offset.modulo}")
+        return self.FieldSlice.render(name=node.name, indices=indices)
+
+    FieldSlice = JinjaTemplate("{{ name }}_({{ indices | join(', ') }})")
+
+    LocalScalarAccess = FormatTemplate("{name}_")
+
+    VectorTemp = FormatTemplate("{name}_")
+
+    LocalScalarDecl = FormatTemplate("{dtype} {name}_{{}};")
+
+    VectorArithmetic = FormatTemplate("({left} {op} {right})")
+
+    def visit_LogicalOperator(self, node: common.LogicalOperator, **kwargs: Any) -> str:
+        return "&&" if node is common.LogicalOperator.AND else "||"
+
+    VectorLogic = FormatTemplate("({left} {op} {right})")
+
+    def visit_UnaryOperator(self, node: common.UnaryOperator, **kwargs: Any) -> str:
+        return "!" if node is common.UnaryOperator.NOT else str(node.value)
+
+    VectorUnaryOp = FormatTemplate("({op}{expr})")
+
+    VectorTernaryOp = FormatTemplate("({cond} ? {true_expr} : {false_expr})")
+
+    def visit_NativeFunction(self, node: common.NativeFunction, **kwargs: Any) -> str:
+        try:
+            return self.NATIVE_FUNCTION_TO_CODE[node]
+        except KeyError as error:
+            raise NotImplementedError(
+                f"Not implemented NativeFunction '{node}' encountered."
+            ) from error
+
+    NativeFuncCall = JinjaTemplate("{{ func }}({{ args | join(', ') }})")
+
+    def visit_VectorAssign(self, node: npir.VectorAssign, **kwargs: Any) -> str:
+        mask = self.visit(node.mask, **kwargs) if node.mask is not None else None
+        return self.VectorAssign.render(
+            left=self.visit(node.left, **kwargs), right=self.visit(node.right, **kwargs), mask=mask
+        )
+
+    VectorAssign = JinjaTemplate(
+        "{% if mask %}if ({{ mask }}) {% endif %}{{ left }} = {{ right }};"
+    )
+
+    def visit_MaskBlock(self, node: npir.MaskBlock, **kwargs: Any) -> str:
+        mask_def = None
+        if not isinstance(node.mask, npir.FieldSlice):
+            mask_def = f"const bool {node.mask_name}_ = {self.visit(node.mask, **kwargs)};"
+        return self.MaskBlock.render(
+            mask_def=mask_def, body=[self.visit(stmt, **kwargs) for stmt in node.body]
+        )
+
+    MaskBlock = JinjaTemplate(
+        "{% if mask_def %}{{ mask_def }}\n{% endif %}{{ body | join('\\n') }}"
+    )
+
+    def visit_HorizontalBlock(
+        self,
+        node: npir.HorizontalBlock,
+        *,
+        field_extents: Optional[FIELD_EXT_T],
+        columns: Optional[Tuple[List[int], List[int]]] = None,
+        **kwargs: Any,
+    ) -> str:
+        lower, upper = horizontal_extent(node, field_extents)
+        bounds = _bounds(lower, upper)
+        if columns is None:
+            headers = [_loop(index, *bound) for index, bound in zip(("_i_", "_j_"), bounds)]
+        else:
+            # Computed inside the loops over the columns of all the blocks of the pass
+            guards = []
+            for index, dim in (("_i_", 0), ("_j_", 1)):
+                if lower[dim] < columns[0][dim]:
+                    guards.append(f"{index} >= {bounds[dim][0]}")
+                if upper[dim] < columns[1][dim]:
+                    guards.append(f"{index} < {bounds[dim][1]}")
+            headers = [f"if ({' && '.join(guards)})" if guards else ""]
+        body = [
+            *self.visit(node.declarations, **kwargs),
+            *self.visit(node.body, field_extents=field_extents, **kwargs),
+        ]
+        return _nest(headers, "\n".join(body))
+
+    def visit_VerticalPass(
+        self,
+        node: npir.VerticalPass,
+        *,
+        name: str,
+        field_extents: Optional[FIELD_EXT_T],
+        **kwargs: Any,
+    ) -> str:
+        fields, scalars = kernel_params(node)
+        dtypes: Dict[str, common.DataType] = {}
+        for field_slice in node.iter_tree().if_isinstance(npir.FieldSlice):
+            dtypes.setdefault(field_slice.name, field_slice.dtype)
+        for scalar in node.iter_tree().if_isinstance(npir.NamedScalar):
+            dtypes.setdefault(scalar.name, scalar.dtype)
+        written = {
+            str(assign.left.name)
+            for assign in node.iter_tree().if_isinstance(npir.VectorAssign)
+            if isinstance(assign.left, npir.FieldSlice)
+        }
+
+        headers = []
+        columns = None
+        if _columns_are_independent(node):
+            extents = [horizontal_extent(block, field_extents) for block in node.body]
+            columns = (
+                [max(lower[dim] for lower, _ in extents) for dim in range(2)],
+                [max(upper[dim] for _, upper in extents) for dim in range(2)],
+            )
+            headers = [
+                _loop(index, *bound) for index, bound in zip(("_i_", "_j_"), _bounds(*columns))
+            ]
+        if node.direction == common.LoopOrder.FORWARD:
+            headers.append("for (py::ssize_t _k_ = k; _k_ < K; ++_k_)")
+        else:
+            headers.append("for (py::ssize_t _k_ = K - 1; _k_ >= k; --_k_)")
+        blocks = [
+            self.visit(block, field_extents=field_extents, columns=columns, **kwargs)
+            for block in node.body
+        ]
+        return self.VerticalPass.render(
+            name=name,
+            fields=[(field, self.visit(dtypes[field]), field in written) for field in fields],
+            scalars=[(scalar, self.visit(dtypes[scalar])) for scalar in scalars],
+            lower=self.visit(node.lower),
+            upper=self.visit(node.upper),
+            loops=_nest(headers, "\n".join(blocks)),
+        )
+
+    VerticalPass = JinjaTemplate(
+        textwrap.dedent(
+            """\
+            void {{ name }}(
+                {%- for field, dtype, _ in fields %}py::array_t<{{ dtype }}, 0> {{ field }}, {% endfor %}
+                {%- for scalar, dtype in scalars %}{{ dtype }} {{ scalar }}, {% endfor -%}
+                py::ssize_t _dI_, py::ssize_t _dJ_, py::ssize_t _dK_) {
+                {% for field, _, is_written in fields -%}
+                auto {{ field }}_ = {{ field }}.{{ 'mutable_' if is_written }}unchecked<3>();
+                {% endfor -%}
+                const py::ssize_t _dk_ = 0;
+                const py::ssize_t k = {{ lower }}, K = {{ upper }};
+                {{ loops | indent(4) }}
+            }
+            """
+        )
+    )
+
+    def visit_LevelMarker(self, node: common.LevelMarker, **kwargs: Any) -> str:
+        return "K" if node == common.LevelMarker.END else "k"
+
+    def visit_AxisBound(self, node: common.AxisBound, **kwargs: Any) -> str:
+        level = self.visit(node.level)
+        if node.offset == 0:
+            return f"_d{level}_"
+        return f"_d{level}_ {'+' if node.offset > 0 else '-'} {abs(node.offset)}"
+
+    def visit_Computation(
+        self,
+        node: npir.Computation,
+        *,
+        module_name: str,
+        field_extents: Optional[FIELD_EXT_T] = None,
+        **kwargs: Any,
+    ) -> Union[str, Collection[str]]:
+        shifts = field_shifts(node, field_extents)
+        names = []
+        kernels = []
+        for index, vertical_pass in enumerate(node.vertical_passes):
+            if vertical_pass.direction == common.LoopOrder.PARALLEL:
+                continue
+            names.append(kernel_name(index))
+            kernels.append(
+                self.visit(
+                    vertical_pass,
+                    name=names[-1],
+                    field_extents=field_extents,
+                    field_shifts=shifts,
+                )
+            )
+        return self.Computation.render(module_name=module_name, names=names, kernels=kernels)
+
+    Computation = JinjaTemplate(
+        textwrap.dedent(
+            """\
+            #include <algorithm>
+            #include <cmath>
+            #include <cstdint>
+            #include <limits>
+
+            #include <pybind11/numpy.h>
+            #include <pybind11/pybind11.h>
+
+            namespace py = pybind11;
+
+            {% for kernel in kernels %}{{ kernel }}
+
+            {% endfor -%}
+            PYBIND11_MODULE({{ module_name }}, m) {
+            {%- for name in names %}
+                m.def("{{ name }}", &{{ name }});
+            {%- endfor %}
+            }
+            """
+        )
+    )
+
+    @classmethod
+    def apply(cls, root: npir.Computation, **kwargs: Any) -> str:
+        generated_code = super().apply(root, **kwargs)
+        return format_source("cpp", generated_code, style="LLVM")
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Set, Tuple, Union
+
+from eve import NodeTranslator
+from gtc import common
+from gtc.python import npir
+
+
+@dataclass
+class _Statement:
+    """Accesses of a statement of a sequential pass, executed in order at each level."""
+
+    #: Name and K offset of the values read
+    reads: List[Tuple[str, int]] = field(default_factory=list)
+    writes: Set[str] = field(default_factory=set)
+    #: Whether the statement is a recurrence `x = x[k -/+ 1] op increment` (see :func:`_scan`)
+    scan: bool = False
+
+
+def _reads(node: Optional[npir.Expr]) -> List[Tuple[str, int]]:
+    if node is None:
+        return []
+    return [
+        (
+            str(access.name),
+            access.k_offset.offset.value
+            if isinstance(access, npir.FieldSlice) and access.k_offset is not None
+            else 0,
+        )
+        for access in node.iter_tree().if_isinstance(
+            npir.FieldSlice, npir.LocalScalarAccess, npir.VectorTemp
+        )
+    ]
+
+
+def _is_vector_slice(node: npir.FieldSlice) -> bool:
+    if node.i_offset is None or node.j_offset is None or node.k_offset is None:
+        return False
+    return node.k_offset.modulo is None
+
+
+def _zero_offsets(node: npir.FieldSlice, *, k: int = 0) -> bool:
+    offsets = (node.i_offset, node.j_offset, node.k_offset)
+    return tuple(offset.offset.value if offset else None for offset in offsets) == (0, 0, k)
+
+
+def _scan(
+    stmt: npir.VectorAssign, past: int
+) -> Optional[Tuple[common.ArithmeticOperator, npir.Expr]]:
+    """Match a recurrence `x = x[k + past] op increment` which can be computed as accumulation."""
+    left, right = stmt.left, stmt.right
+    if (
+        stmt.mask is not None
+        or not isinstance(left, npir.FieldSlice)
+        or not _zero_offsets(left)
+        or not isinstance(right, npir.VectorArithmetic)
+        or not isinstance(right.op, common.ArithmeticOperator)
+        or right.op not in (common.ArithmeticOperator.ADD, common.ArithmeticOperator.MUL)
+    ):
+        return None
+    for recurrence, increment in ((right.left, right.right), (right.right, right.left)):
+        if (
+            isinstance(recurrence, npir.FieldSlice)
+            and recurrence.name == left.name
+            and _zero_offsets(recurrence, k=past)
+            and left.name not in {name for name, _ in _reads(increment)}
+        ):
+            return right.op, increment
+    return None
+
+
+def _statements(vertical_pass: npir.VerticalPass, past: int) -> List[_Statement]:
+    statements: List[_Statement] = []
+    for block in vertical_pass.body:
+        for stmt in block.body:
+            if isinstance(stmt, npir.MaskBlock):
+                statements.append(_Statement(reads=_reads(stmt.mask), writes={stmt.mask_name}))
+                assigns = stmt.body
+            else:
+                assigns = [stmt]
+            for assign in assigns:
+                statements.append(
+                    _Statement(
+                        reads=_reads(assign.right) + _reads(assign.mask),
+                        writes={str(assign.left.name)},
+                        scan=_scan(assign, past) is not None,
+                    )
+                )
+    return statements
+
+
+def _is_vectorizable(statements: List[_Statement], past: int) -> bool:
+    """
+    Check if executing each statement on all levels before the next one gives the same result.
+
+    A statement reading a value of a previous level requires all writes of the value to happen in
+    earlier statements (or in the statement itself if it is an accumulation), a statement reading
+    a value of a following level requires no earlier statement to write the value.
+    """
+    writers = {
+        name: [index for index, stmt in enumerate(statements) if name in stmt.writes]
+        for stmt in statements
+        for name in stmt.writes
+    }
+    for index, stmt in enumerate(statements):
+        for name, offset in stmt.reads:
+            if offset * past > 0:
+                if any(w > index or (w == index and not stmt.scan) for w in writers.get(name, [])):
+                    return False
+            elif offset != 0:
+                if any(w < index for w in writers.get(name, [])):
+                    return False
+    return True
+
+
+def _single_level(vertical_pass: npir.VerticalPass) -> bool:
+    lower, upper = vertical_pass.lower, vertical_pass.upper
+    return lower.level == upper.level and upper.offset - lower.offset <= 1
+
+
+def _is_vectorizable_pass(vertical_pass: npir.VerticalPass) -> bool:
+    if vertical_pass.direction == common.LoopOrder.PARALLEL:
+        return False
+    if any(
+        not _is_vector_slice(field_slice)
+        for field_slice in vertical_pass.iter_tree().if_isinstance(npir.FieldSlice)
+    ):
+        return False
+    past = -1 if vertical_pass.direction == common.LoopOrder.FORWARD else 1
+    return _single_level(vertical_pass) or _is_vectorizable(_statements(vertical_pass, past), past)
+
+
+class _AllLevels(NodeTranslator):
+    """Store the temporaries `names` on all vertical levels."""
+
+    def visit_FieldSlice(self, node: npir.FieldSlice, *, names: Set[str]) -> npir.FieldSlice:
+        if node.name not in names:
+            return node
+        if node.k_offset is None:
+            k_offset = npir.AxisOffset.k(0)
+        else:
+            k_offset = node.k_offset.copy(update={"modulo": None})
+        return node.copy(update={"k_offset": k_offset})
+
+    def visit_EmptyTemp(self, node: npir.EmptyTemp, **kwargs: Any) -> npir.EmptyTemp:
+        return node.copy(update={"k_size": None})
+
+    def visit_VectorAssign(self, node: npir.VectorAssign, *, names: Set[str]) -> npir.VectorAssign:
+        if isinstance(node.right, npir.EmptyTemp) and node.left.name not in names:
+            return node
+        return self.generic_visit(node, names=names)
+
+
+class _ToParallel(NodeTranslator):
+    def visit_AxisOffset(self, node: npir.AxisOffset, **kwargs: Any) -> npir.AxisOffset:
+        if node.axis_name == npir.AxisName.K:
+            return node.copy(update={"parallel": True})
+        return node
+
+    def visit_LocalScalarDecl(
+        self, node: npir.LocalScalarDecl, **kwargs: Any
+    ) -> npir.LocalScalarDecl:
+        return node.copy(update={"parallel_k": True})
+
+    def visit_VectorAssign(
+        self, node: npir.VectorAssign, *, direction: common.LoopOrder, past: Optional[int]
+    ) -> Union[npir.VectorAssign, List[Union[npir.VectorAssign, npir.VectorAccumulate]]]:
+        scan = _scan(node, past) if past is not None else None
+        node = self.generic_visit(node, direction=direction, past=None)
+        if not scan:
+            return node
+        op, increment = scan
+        return [
+            node.copy(update={"right": self.visit(increment, direction=direction, past=None)}),
+            npir.VectorAccumulate(name=node.left.name, op=op, direction=direction),
+        ]
+
+    def visit_HorizontalBlock(
+        self, node: npir.HorizontalBlock, **kwargs: Any
+    ) -> npir.HorizontalBlock:
+        body: List[Union[npir.VectorAssign, npir.MaskBlock, npir.VectorAccumulate]] = []
+        for stmt in node.body:
+            new_stmt = self.visit(stmt, **kwargs)
+            body.extend(new_stmt if isinstance(new_stmt, list) else [new_stmt])
+        return node.copy(
+            update={"body": body, "declarations": self.visit(node.declarations, **kwargs)}
+        )
+
+    def visit_MaskBlock(self, node: npir.MaskBlock, **kwargs: Any) -> npir.MaskBlock:
+        return self.generic_visit(node, **{**kwargs, "past": None})
+
+
+class VectorizeSequentialPasses(NodeTranslator):
+    """
+    Compute forward and backward vertical passes on all levels at once where possible.
+
+    A sequential pass is turned into a parallel pass if executing each statement on all levels
+    before the next one gives the same result as the level by level execution, i.e. if there is
+    no dependency between levels which crosses statements in the wrong order. This includes all
+    passes over a single level. Recurrences of the form `x = x[0, 0, -1] + increment` (or `*`,
+    `[0, 0, 1]` in backward passes) are computed as an in-place accumulation of the increments.
+
+    The accumulation of a sum adds the increments in the same order as the sequential loop, the
+    result is therefore identical.
+
+    Temporaries stored on fewer levels than the domain (IJ temporaries or cyclic K planes, see
+    :class:`gtc.passes.oir_optimizations.temporaries.TemporariesToPlanes`) are stored on all levels
+    again if a pass accessing them is vectorized, passes over a single level accessing them are not
+    vectorized.
+    """
+
+    def visit_Computation(self, node: npir.Computation, **kwargs: Any) -> npir.Computation:
+        reduced = {
+            str(temp_def.left.name)
+            for vertical_pass in node.vertical_passes
+            for temp_def in vertical_pass.temp_defs
+            if isinstance(temp_def.right, npir.EmptyTemp) and temp_def.right.k_size is not None
+        }
+        if reduced:
+            restored: Set[str] = set()
+            for vertical_pass in _AllLevels().visit(node.vertical_passes, names=reduced):
+                # Passes over a single level gain nothing from vectorization
+                if _is_vectorizable_pass(vertical_pass) and not _single_level(vertical_pass):
+                    names = vertical_pass.iter_tree().if_isinstance(npir.FieldSlice).getattr("name")
+                    restored |= reduced & names.to_set()
+            node = _AllLevels().visit(node, names=restored)
+        return self.generic_visit(node, **kwargs)
+
+    def visit_VerticalPass(self, node: npir.VerticalPass, **kwargs: Any) -> npir.VerticalPass:
+        if not _is_vectorizable_pass(node):
+            return node
+
+        past = -1 if node.direction == common.LoopOrder.FORWARD else 1
+        scan_past = None if _single_level(node) else past
+        body = _ToParallel().visit(node.body, direction=node.direction, past=scan_past)
+        return node.copy(update={"body": body, "direction": common.LoopOrder.PARALLEL})
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+from eve import NodeTranslator
+from gtc import common
+from gtc.python import npir
+
+
+if TYPE_CHECKING:
+    from gt4py.definitions import Extent
+
+
+BOUNDARY_T = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+@dataclass
+class _TemporaryLifetime:
+    dtype: common.DataType
+    boundary: BOUNDARY_T
+    k_size: Optional[int]
+    #: Position of the definition of the temporary (start of the defining vertical pass)
+    definition: int
+    first_access: Optional[int] = None
+    last_access: Optional[int] = None
+    #: Whether the first access writes the whole buffer region
+    covered: bool = False
+
+    @property
+    def start(self) -> int:
+        if not self.covered:
+            return self.definition
+        assert self.first_access is not None
+        return self.first_access
+
+    @property
+    def end(self) -> int:
+        return self.definition if self.last_access is None else self.last_access
+
+
+@dataclass
+class _Buffer:
+    dtype: common.DataType
+    boundary: BOUNDARY_T
+    k_size: Optional[int]
+    end: int
+
+
+def _boundary_union(a: BOUNDARY_T, b: BOUNDARY_T) -> BOUNDARY_T:
+    return (
+        (max(a[0][0], b[0][0]), max(a[0][1], b[0][1])),
+        (max(a[1][0], b[1][0]), max(a[1][1], b[1][1])),
+    )
+
+
+def _boundary_growth(buffer: BOUNDARY_T, boundary: BOUNDARY_T) -> int:
+    union = _boundary_union(buffer, boundary)
+    return sum(u - b for u_dim, b_dim in zip(union, buffer) for u, b in zip(u_dim, b_dim))
+
+
+def _field_names(
+    node: Union[npir.VectorExpression, npir.MaskBlock, npir.VectorAccumulate, None]
+) -> Set[str]:
+    if node is None:
+        return set()
+    return (
+        node.iter_tree()
+        .if_isinstance(npir.FieldSlice, npir.VectorAccumulate)
+        .getattr("name")
+        .to_set()
+    )
+
+
+def _is_covering_write(
+    stmt: Union[npir.VectorAssign, npir.MaskBlock, npir.VectorAccumulate],
+    name: str,
+    *,
+    boundary: BOUNDARY_T,
+    block: npir.HorizontalBlock,
+    vertical_pass: npir.VerticalPass,
+) -> bool:
+    """Check if `stmt` writes temporary `name` on the whole domain extended by `boundary`."""
+    if (
+        vertical_pass.direction != common.LoopOrder.PARALLEL
+        or vertical_pass.lower != common.AxisBound.start()
+        or vertical_pass.upper != common.AxisBound.end()
+    ):
+        return False
+    if block.extent is None or _boundary_union(block.extent, boundary) != tuple(block.extent):
+        return False
+    if not isinstance(stmt, npir.VectorAssign) or stmt.mask is not None:
+        return False
+    left = stmt.left
+    if not isinstance(left, npir.FieldSlice) or left.name != name:
+        return False
+    if any(
+        offset is not None and offset.offset.value != 0
+        for offset in (left.i_offset, left.j_offset, left.k_offset)
+    ):
+        return False
+    return name not in _field_names(stmt.right)
+
+
+class AllocateTemporaryBuffers(NodeTranslator):
+    """
+    Assign the temporaries of a computation to a minimal set of reusable buffers.
+
+    The lifetime of each temporary is computed on statement positions: every statement of a
+    parallel vertical pass has its own position, while all statements of a sequential pass share
+    the position of the pass since they are repeated for each vertical level. Temporaries with
+    disjoint lifetimes, the same dtype and the same number of K levels share a buffer, which is
+    large enough for the extents of all of them.
+
+    Buffers are zero-filled on definition of the temporary (like a new `np.zeros` allocation),
+    unless the first access is an unmasked write of the full temporary region in a parallel pass.
+
+    Precondition: `field_extents` contains the extents of the temporaries (default: no halo)
+    Postcondition: `EmptyTemp` nodes reference entries of `Computation.temp_buffers`
+    """
+
+    def visit_Computation(
+        self, node: npir.Computation, *, field_extents: Dict[str, "Extent"], **kwargs: Any
+    ) -> npir.Computation:
+        lifetimes = self._compute_lifetimes(node, field_extents)
+
+        buffers: List[_Buffer] = []
+        assignment: Dict[str, int] = {}
+        for name, lifetime in sorted(lifetimes.items(), key=lambda item: item[1].start):
+            candidates = [
+                index
+                for index, buffer in enumerate(buffers)
+                if buffer.dtype == lifetime.dtype
+                and buffer.k_size == lifetime.k_size
+                and buffer.end < lifetime.start
+            ]
+            if candidates:
+                index = min(
+                    candidates,
+                    key=lambda index: _boundary_growth(buffers[index].boundary, lifetime.boundary),
+                )
+                buffers[index].boundary = _boundary_union(
+                    buffers[index].boundary, lifetime.boundary
+                )
+                buffers[index].end = lifetime.end
+            else:
+                index = len(buffers)
+                buffers.append(
+                    _Buffer(lifetime.dtype, lifetime.boundary, lifetime.k_size, lifetime.end)
+                )
+            assignment[name] = index
+
+        return npir.Computation(
+            field_decls=node.field_decls,
+            field_params=node.field_params,
+            params=node.params,
+            vertical_passes=self.visit(
+                node.vertical_passes, assignment=assignment, lifetimes=lifetimes
+            ),
+            temp_buffers=[
+                npir.TemporaryBuffer(
+                    dtype=buffer.dtype, boundary=buffer.boundary, k_size=buffer.k_size
+                )
+                for buffer in buffers
+            ],
+        )
+
+    def visit_VerticalPass(self, node: npir.VerticalPass, **kwargs: Any) -> npir.VerticalPass:
+        return node.copy(update={"temp_defs": self.visit(node.temp_defs, **kwargs)})
+
+    def visit_VectorAssign(
+        self,
+        node: npir.VectorAssign,
+        *,
+        assignment: Dict[str, int],
+        lifetimes: Dict[str, _TemporaryLifetime],
+        **kwargs: Any,
+    ) -> npir.VectorAssign:
+        name = str(node.left.name)
+        if not isinstance(node.right, npir.EmptyTemp) or name not in assignment:
+            return node
+        right = node.right.copy(
+            update={"buffer": assignment[name], "initialize": not lifetimes[name].covered}
+        )
+        return node.copy(update={"right": right})
+
+    @staticmethod
+    def _compute_lifetimes(
+        node: npir.Computation, field_extents: Dict[str, "Extent"]
+    ) -> Dict[str, _TemporaryLifetime]:
+        lifetimes: Dict[str, _TemporaryLifetime] = {}
+        position = 0
+        for vertical_pass in node.vertical_passes:
+            for temp_def in vertical_pass.temp_defs:
+                name = str(temp_def.left.name)
+                extent = field_extents.get(name)
+                (i_lower, i_upper), (j_lower, j_upper) = (
+                    extent.to_boundary()[:2] if extent is not None else ((0, 0), (0, 0))
+                )
+                assert temp_def.right.dtype is not None
+                lifetimes[name] = _TemporaryLifetime(
+                    dtype=temp_def.right.dtype,
+                    boundary=((i_lower, i_upper), (j_lower, j_upper)),
+                    k_size=temp_def.right.k_size,
+                    definition=position,
+                )
+            position += 1
+
+            parallel = vertical_pass.direction == common.LoopOrder.PARALLEL
+            for block in vertical_pass.body:
+                for stmt in block.body:
+                    for name in _field_names(stmt) & lifetimes.keys():
+                        lifetime = lifetimes[name]
+                        if lifetime.first_access is None:
+                            lifetime.first_access = position
+                            lifetime.covered = _is_covering_write(
+                                stmt,
+                                name,
+                                boundary=lifetime.boundary,
+                                block=block,
+                                vertical_pass=vertical_pass,
+                            )
+                        lifetime.last_access = position
+                    if parallel:
+                        position += 1
+            if not parallel:
+                position += 1
+
+        return lifetimes
@@ -14,12 +14,15 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import warnings
+
 import numpy as np
 import pytest
 
 from gt4py import gtscript
 from gt4py import storage as gt_storage
-from gt4py.gtscript import __INLINED, BACKWARD, FORWARD, PARALLEL, computation, interval
+from gt4py.autotuning import autotune
+from gt4py.gtscript import __INLINED, BACKWARD, FORWARD, PARALLEL, asin, computation, interval
 
 from ..definitions import ALL_BACKENDS, CPU_BACKENDS, OLD_BACKENDS, make_backend_params
 from .stencil_definitions import EXTERNALS_REGISTRY as externals_registry
@@ -317,3 +320,432 @@ def test_variable_offsets_and_while_loop(backend):
                     qsum += qin[0, 0, lev] / (pe2[0, 0, 1] - pe1[0, 0, lev])
                     lev = lev + 1
                 qout = qsum / (pe2[0, 0, 1] - pe2)
+
+
+@pytest.mark.parametrize("backend", ["gtc:numba"])
+def test_variable_offsets_values(backend):
+    pytest.importorskip("numba")
+
+    @gtscript.stencil(backend=backend)
+    def stencil(
+        in_field: gtscript.Field[np.float64],
+        out_field: gtscript.Field[np.float64],
+        index_field: gtscript.Field[int],
+    ):
+        with computation(FORWARD), interval(...):
+            tmp = in_field[0, 0, 0]
+            out_field = tmp[1, 0, 0] + in_field[0, 0, index_field + 1]
+
+    shape = (5, 4, 6)
+    in_data = np.random.rand(*shape)
+    index_data = np.zeros(shape, dtype=int)
+    index_data[:, :, :2] = 2
+    in_field = gt_storage.from_array(
+        in_data, backend=backend, default_origin=(0, 0, 0), dtype=np.float64
+    )
+    out_field = gt_storage.zeros(
+        backend=backend, default_origin=(0, 0, 0), shape=shape, dtype=np.float64
+    )
+    index_field = gt_storage.from_array(
+        index_data, backend=backend, default_origin=(0, 0, 0), dtype=int
+    )
+    stencil(in_field, out_field, index_field, origin=(0, 0, 0), domain=(4, 4, 4))
+
+    k_indices = np.arange(4)[None, None, :] + index_data[:4, :, :4] + 1
+    expected = in_data[1:, :, :4] + np.take_along_axis(in_data[:4], k_indices, axis=2)
+    np.testing.assert_allclose(np.asarray(out_field)[:4, :, :4], expected)
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_compute_dtype(backend):
+    @gtscript.stencil(backend=backend, compute_dtype="float64")
+    def stencil(
+        in_field: gtscript.Field[np.float32],
+        out_field: gtscript.Field[np.float32],
+    ):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field * in_field
+            out_field = tmp / 3.0 + in_field
+
+    in_data = np.random.rand(5, 5, 5).astype(np.float32)
+    in_field = gt_storage.from_array(
+        in_data, backend=backend, default_origin=(0, 0, 0), dtype=np.float32
+    )
+    out_field = gt_storage.zeros(
+        backend=backend, default_origin=(0, 0, 0), shape=(5, 5, 5), dtype=np.float32
+    )
+    stencil(in_field, out_field)
+
+    in_data = in_data.astype(np.float64)
+    expected = (in_data * in_data / 3.0 + in_data).astype(np.float32)
+    np.testing.assert_equal(np.asarray(out_field), expected)
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_skip_passes(backend):
+    def definition(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] + in_field[-1, 0, 0]
+            out_field = tmp[0, 1, 0] + tmp[0, -1, 0]
+
+    shape = (8, 8, 4)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(2, 2, 0), dtype=np.float64
+    )
+    results = []
+    for skip_passes in ([], ["GreedyMerging", "AdjacentLoopMerging", "LocalTemporariesToScalars"]):
+        stencil = gtscript.stencil(backend=backend, definition=definition, skip_passes=skip_passes)
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(2, 2, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, out_field, origin=(2, 2, 0), domain=(4, 4, 4))
+        results.append(np.asarray(out_field))
+    np.testing.assert_equal(results[0], results[1])
+
+    with pytest.raises(ValueError, match="Unknown OIR pass"):
+        gtscript.stencil(backend=backend, definition=definition, skip_passes=["NoSuchPass"])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_cost_model(backend):
+    def definition(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] + in_field[-1, 0, 0]
+            out_field = tmp[0, 1, 0] + tmp[0, -1, 0]
+
+    shape = (8, 8, 4)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(2, 2, 0), dtype=np.float64
+    )
+    results = []
+    for cost_model in ({}, {"max_registers": 0, "function_costs": {"sin": 1.0}}):
+        stencil = gtscript.stencil(backend=backend, definition=definition, cost_model=cost_model)
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(2, 2, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, out_field, origin=(2, 2, 0), domain=(4, 4, 4))
+        results.append(np.asarray(out_field))
+    np.testing.assert_equal(results[0], results[1])
+
+    with pytest.raises(ValueError, match="Unknown parameters"):
+        gtscript.stencil(backend=backend, definition=definition, cost_model={"flops": 1.0})
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_autotuning(backend):
+    def definition(
+        in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64], weight: float
+    ):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] + in_field[-1, 0, 0]
+            out_field = weight * (tmp[0, 1, 0] + tmp[0, -1, 0])
+
+    configurations = [
+        {"skip_passes": [], "cost_model": {}},
+        {"skip_passes": ["GreedyMerging"], "cost_model": {"max_registers": None}},
+    ]
+    tuning_info = autotune(
+        definition, backend, domain=(8, 8, 4), configurations=configurations, repeat=1
+    )
+    assert tuning_info["domain"] == (8, 8, 4)
+    assert [configuration for configuration, _ in tuning_info["run_times"]] == configurations
+    assert tuning_info["backend_opts"] in configurations
+
+    stencil = gtscript.stencil(backend, definition)
+    assert stencil.options["backend_opts"] == tuning_info["backend_opts"]
+    stencil = gtscript.stencil(backend, definition, skip_passes=[])
+    assert stencil.options["backend_opts"] == {"skip_passes": []}
+
+
+@pytest.mark.parametrize("backend", ["gtc:numba"])
+def test_horizontal_tiling(backend):
+    pytest.importorskip("numba")
+
+    def definition(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] + in_field[-1, 0, 0]
+            out_field = tmp[0, 1, 0] + tmp[0, -1, 0]
+
+    shape = (23, 21, 4)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(1, 1, 0), dtype=np.float64
+    )
+    results = []
+    for skip_passes in (["OnTheFlyMerging"], ["OnTheFlyMerging", "HorizontalTiling"]):
+        # The smallest tiles, several of them cover the domain
+        stencil = gtscript.stencil(
+            backend=backend,
+            definition=definition,
+            skip_passes=skip_passes,
+            cost_model={"cache_size": 0},
+        )
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(1, 1, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, out_field, origin=(1, 1, 0), domain=(21, 19, 4))
+        results.append(np.asarray(out_field))
+    np.testing.assert_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy", "gtc:numba"])
+def test_temporaries_to_planes(backend):
+    if backend == "gtc:numba":
+        pytest.importorskip("numba")
+
+    def definition(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(FORWARD):
+            with interval(0, 1):
+                tmp = in_field[0, 0, 0]
+                out_field = in_field[0, 0, 0]
+            with interval(1, None):
+                tmp = in_field[0, 0, 0] + 0.5 * tmp[0, 0, -1]
+                out_field = tmp[0, 0, -1] + tmp[0, 0, 0]
+        with computation(BACKWARD):
+            with interval(-1, None):
+                tmp2 = in_field[0, 0, 0]
+            with interval(0, -1):
+                tmp2 = in_field[0, 0, 0] - 0.5 * tmp2[0, 0, 1]
+                out_field = out_field[0, 0, 0] * tmp2[0, 0, 1]
+        with computation(FORWARD), interval(...):
+            flux = in_field[1, 0, 0] - in_field[0, 0, 0]
+            out_field = out_field[0, 0, 0] + flux[-1, 0, 0] + flux[0, 0, 0]
+
+    shape = (23, 21, 6)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(1, 1, 0), dtype=np.float64
+    )
+    results = []
+    # K caches would otherwise replace the temporaries read at K offsets
+    for skip_passes in (["KCacheDetection"], ["KCacheDetection", "TemporariesToPlanes"]):
+        stencil = gtscript.stencil(backend=backend, definition=definition, skip_passes=skip_passes)
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(1, 1, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, out_field, origin=(1, 1, 0), domain=(21, 19, 6))
+        results.append(np.asarray(out_field))
+    np.testing.assert_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_temporary_buffers_domain_change(backend):
+    @gtscript.stencil(backend=backend)
+    def stencil(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] - in_field[0, 0, 0]
+            out_field = tmp[-1, 0, 0] + tmp[0, 0, 0]
+
+    shape = (10, 10, 5)
+    in_data = np.random.rand(*shape)
+    in_field = gt_storage.from_array(
+        in_data, backend=backend, default_origin=(1, 0, 0), dtype=np.float64
+    )
+    for domain in [(8, 10, 5), (4, 3, 2), (8, 10, 5)]:
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(1, 0, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, out_field, origin=(1, 0, 0), domain=domain)
+        expected = np.zeros(shape)
+        ni, nj, nk = domain
+        expected[1 : 1 + ni, :nj, :nk] = in_data[2 : 2 + ni, :nj, :nk] - in_data[:ni, :nj, :nk]
+        np.testing.assert_allclose(np.asarray(out_field), expected)
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_vertical_accumulation(backend):
+    @gtscript.stencil(backend=backend)
+    def stencil(
+        in_field: gtscript.Field[np.float64],
+        sum_field: gtscript.Field[np.float64],
+        prod_field: gtscript.Field[np.float64],
+    ):
+        with computation(FORWARD):
+            with interval(0, 1):
+                sum_field = in_field
+            with interval(1, None):
+                sum_field = sum_field[0, 0, -1] + in_field
+        with computation(BACKWARD):
+            with interval(-1, None):
+                prod_field = in_field
+            with interval(0, -1):
+                prod_field = in_field * prod_field[0, 0, 1]
+
+    shape = (4, 3, 8)
+    in_data = np.random.rand(*shape) + 0.5
+    in_field = gt_storage.from_array(in_data, backend=backend, default_origin=(0, 0, 0))
+    sum_field, prod_field = (
+        gt_storage.zeros(backend=backend, default_origin=(0, 0, 0), shape=shape, dtype=np.float64)
+        for _ in range(2)
+    )
+    stencil(in_field, sum_field, prod_field)
+
+    np.testing.assert_allclose(np.asarray(sum_field), np.cumsum(in_data, axis=2))
+    np.testing.assert_allclose(
+        np.asarray(prod_field), np.cumprod(in_data[:, :, ::-1], axis=2)[:, :, ::-1]
+    )
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_compile_sequential_passes(backend):
+    def definition(
+        in_field: gtscript.Field[np.float64],
+        surface: gtscript.Field[gtscript.IJ, np.float64],
+        out_field: gtscript.Field[np.float64],
+        *,
+        scale: float,
+    ):
+        with computation(FORWARD):
+            with interval(0, 1):
+                out_field = surface * scale
+            with interval(1, None):
+                if out_field[0, 0, -1] > 2.0:
+                    out_field = out_field[0, 0, -1] - in_field
+                else:
+                    out_field = abs(in_field - 0.5) + out_field[0, 0, -1]
+        with computation(BACKWARD), interval(0, -1):
+            out_field = max(out_field, out_field[0, 0, 1])
+        with computation(FORWARD), interval(1, None):
+            tmp = out_field[0, 0, -1] * 0.5
+            out_field = tmp[1, 0, 0] + tmp[-1, 0, 0]
+
+    shape = (8, 8, 6)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(1, 1, 0), dtype=np.float64
+    )
+    surface = gt_storage.from_array(
+        np.random.rand(*shape[:2]),
+        backend=backend,
+        default_origin=(1, 1),
+        dtype=np.float64,
+        mask=(True, True, False),
+    )
+    results = []
+    for compile_sequential_passes in (False, True):
+        stencil = gtscript.stencil(
+            backend=backend,
+            definition=definition,
+            compile_sequential_passes=compile_sequential_passes,
+        )
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(1, 1, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, surface, out_field, scale=3.0, origin=(1, 1, 0), domain=(6, 6, 6))
+        results.append(np.asarray(out_field))
+    np.testing.assert_allclose(results[0], results[1])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_num_threads(backend):
+    def tileable(
+        in_field: gtscript.Field[np.float64],
+        surface: gtscript.Field[gtscript.IJ, np.float64],
+        out_field: gtscript.Field[np.float64],
+    ):
+        with computation(PARALLEL), interval(...):
+            lap = in_field[1, 0, 0] + in_field[-1, 0, 0] - 2.0 * in_field
+            out_field = lap[0, 1, 0] - lap[0, -1, 0] + surface
+
+    def not_tileable(
+        in_field: gtscript.Field[np.float64],
+        surface: gtscript.Field[gtscript.IJ, np.float64],
+        out_field: gtscript.Field[np.float64],
+    ):
+        with computation(PARALLEL), interval(...):
+            out_field = in_field + surface
+        with computation(PARALLEL), interval(...):
+            in_field = out_field[1, 0, 0] - out_field[0, -1, 0]
+
+    shape = (13, 11, 4)
+    in_data = np.random.rand(*shape)
+    surface = gt_storage.from_array(
+        np.random.rand(*shape[:2]),
+        backend=backend,
+        default_origin=(1, 1),
+        dtype=np.float64,
+        mask=(True, True, False),
+    )
+    for definition in (tileable, not_tileable):
+        results = []
+        for num_threads in (None, 3):
+            stencil = gtscript.stencil(
+                backend=backend,
+                definition=definition,
+                num_threads=num_threads,
+            )
+            in_field = gt_storage.from_array(
+                in_data, backend=backend, default_origin=(1, 1, 0), dtype=np.float64
+            )
+            out_field = gt_storage.zeros(
+                backend=backend, default_origin=(1, 1, 0), shape=shape, dtype=np.float64
+            )
+            stencil(in_field, surface, out_field, origin=(1, 1, 0), domain=(10, 8, 4))
+            results.append((np.asarray(in_field), np.asarray(out_field)))
+        np.testing.assert_array_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_array_api(backend):
+    pytest.importorskip("array_api_compat")
+
+    def definition(
+        in_field: gtscript.Field[np.float64],
+        mask: gtscript.Field[gtscript.IJ, bool],
+        out_field: gtscript.Field[np.float64],
+        *,
+        scale: float,
+    ):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] - in_field[-1, 0, 0]
+            if mask and not (tmp < 0.0):
+                out_field = asin(tmp * 0.5) + min(tmp, scale)
+            else:
+                out_field = tmp % 0.3
+        with computation(FORWARD), interval(1, None):
+            out_field += out_field[0, 0, -1]
+
+    shape = (8, 8, 6)
+    in_field = gt_storage.from_array(
+        np.random.rand(*shape), backend=backend, default_origin=(1, 1, 0), dtype=np.float64
+    )
+    mask = gt_storage.from_array(
+        np.random.rand(*shape[:2]) > 0.5,
+        backend=backend,
+        default_origin=(1, 1),
+        dtype=bool,
+        mask=(True, True, False),
+    )
+    results = []
+    for array_api in (False, True):
+        stencil = gtscript.stencil(backend=backend, definition=definition, array_api=array_api)
+        out_field = gt_storage.zeros(
+            backend=backend, default_origin=(1, 1, 0), shape=shape, dtype=np.float64
+        )
+        stencil(in_field, mask, out_field, scale=0.2, origin=(1, 1, 0), domain=(6, 6, 6))
+        results.append(np.asarray(out_field))
+    np.testing.assert_allclose(results[0], results[1])
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy"])
+def test_array_api_namespace(backend):
+    pytest.importorskip("array_api_compat")
+    with warnings.catch_warnings():
+        # The strict NumPy implementation of the array API warns that it is experimental
+        warnings.simplefilter("ignore", UserWarning)
+        xp = pytest.importorskip("numpy.array_api")
+
+    def definition(in_field: gtscript.Field[np.float64], out_field: gtscript.Field[np.float64]):
+        with computation(PARALLEL), interval(...):
+            tmp = in_field[1, 0, 0] - in_field[0, 0, 0]
+            out_field = tmp[-1, 0, 0] + abs(tmp[0, 0, 0])
+        with computation(FORWARD), interval(1, None):
+            out_field += 0.5 * out_field[0, 0, -1]
+
+    stencil = gtscript.stencil(backend=backend, definition=definition, array_api=True)
+    in_data = np.random.rand(8, 7, 5)
+    expected = np.zeros_like(in_data)
+    stencil(in_data, expected, origin=(1, 0, 0), domain=(6, 7, 5))
+
+    # Arrays of another array API library are accepted and computed on in their namespace
+    out_field = xp.zeros(in_data.shape, dtype=xp.float64)
+    stencil(xp.asarray(in_data), out_field, origin=(1, 0, 0), domain=(6, 7, 5))
+    assert type(out_field) is not np.ndarray
+    np.testing.assert_allclose(np.asarray(out_field), expected)
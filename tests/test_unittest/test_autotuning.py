@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# GT4Py - GridTools4Py - GridTools for Python
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from gt4py import backend as gt_backend
+from gt4py.autotuning import default_configurations
+from gt4py.backend.gtc_backend.common import oir_skip_from_options
+from gt4py.definitions import BuildOptions
+from gtc.passes.oir_pipeline import OirPipeline
+
+from .test_gtc.oir_utils import StencilFactory
+
+
+@pytest.mark.parametrize("backend", ["gtc:numpy", "gtc:numba"])
+def test_default_configurations_skip_different_passes(backend):
+    if backend == "gtc:numba":
+        pytest.importorskip("numba")
+    backend_cls = gt_backend.from_name(backend)
+    steps = OirPipeline(StencilFactory()).steps()
+
+    skipped = []
+    for configuration in default_configurations(backend):
+        if configuration["cost_model"]:
+            continue
+        options = BuildOptions(name="stencil", module="", backend_opts=configuration)
+        skipped.append(
+            frozenset(
+                oir_skip_from_options(options, steps, default=backend_cls.DEFAULT_SKIP_PASSES)
+            )
+        )
+
+    assert len(skipped) > 1
+    assert len(set(skipped)) == len(skipped)
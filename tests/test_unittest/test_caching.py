@@ -72,6 +72,8 @@ def test_jit_properties(builder):
     assert jit_caching.cache_info_path.parent == builder.module_path.parent
     assert stencil_id.version in jit_caching.module_postfix
     assert stencil_id.version in jit_caching.class_name
+    # results of passes are shared by the stencils of all backends
+    assert jit_caching.pass_cache_path.parent == jit_caching.backend_root_path.parent
 
 
 def stencil_fingerprints_are_equal(builder_a, builder_b):
@@ -125,6 +127,19 @@ def test_jit_extrainfo(builder):
     assert "pyext_md5" in builder.caching.cache_info
 
 
+def test_jit_pass_cache(builder, monkeypatch):
+    original = builder(simple_stencil).with_caching("jit")
+    assert original.pass_cache is None
+
+    monkeypatch.setitem(gt4py.config.cache_settings, "pass_cache", True)
+    original = builder(simple_stencil).with_caching("jit")
+    assert original.pass_cache.path == original.caching.pass_cache_path
+
+    gtir = original.gtir
+    assert any(original.pass_cache.path.iterdir())
+    assert builder(simple_stencil).with_caching("jit").gtir == gtir
+
+
 def test_nocaching_paths(builder, tmp_path):
     builder = builder(simple_stencil).with_caching("nocaching", output_path=tmp_path)
     no_caching = builder.caching
@@ -133,6 +148,7 @@ def test_nocaching_paths(builder, tmp_path):
     assert no_caching.root_path == tmp_path
     assert no_caching.backend_root_path == tmp_path
     assert no_caching.cache_info_path is None
+    assert no_caching.pass_cache_path is None
 
 
 def assert_nocaching_gtcpp_source_file_tree_conforms_to_expectations(root_path, stencil_name):
@@ -215,6 +215,45 @@ def test_gen_gtx86(clirunner, simple_stencil, tmp_path):
     assert set(["computation.hpp", "computation.cpp"]) == set(src_files), result.output
 
 
+def test_gen_report_passes(clirunner, simple_stencil, tmp_path):
+    """Test the --report-passes flag."""
+    result = clirunner.invoke(
+        cli.gtpyc,
+        [
+            "gen",
+            f"--output-path={tmp_path}",
+            "--backend=gtc:numpy",
+            "--report-passes",
+            str(simple_stencil),
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert re.findall(r"^\s*fold_constants\s+[0-9.]+\s+\d+\s+\d+", result.output, re.MULTILINE)
+    assert re.findall(r"^\s*total\s+[0-9.]+", result.output, re.MULTILINE)
+    assert re.findall(r"^\s*fold_constants(\s+[0-9.]+){3}\s+-$", result.output, re.MULTILINE)
+
+
+def test_gen_report_passes_trace_memory(clirunner, simple_stencil, tmp_path):
+    """Test the --trace-memory flag."""
+    result = clirunner.invoke(
+        cli.gtpyc,
+        [
+            "gen",
+            f"--output-path={tmp_path}",
+            "--backend=gtc:numpy",
+            "--report-passes",
+            "--trace-memory",
+            str(simple_stencil),
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0
+    assert re.findall(r"^\s*fold_constants(\s+[0-9.]+){4}$", result.output, re.MULTILINE)
+
+
 def test_backend_option_order(clirunner, simple_stencil, tmp_path):
     """Make sure the order in which --backend and --option are passed does not matter."""
     output_path1 = tmp_path / "backend_first"
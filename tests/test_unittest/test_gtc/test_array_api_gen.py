@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from gtc import common
+from gtc.python import npir
+from gtc.python.array_api_gen import ArrayApiGen
+
+from .npir_utils import (
+    FieldDeclFactory,
+    FieldSliceFactory,
+    VectorAssignFactory,
+    VerticalPassFactory,
+)
+
+
+def test_native_function_names() -> None:
+    result = ArrayApiGen().visit(
+        npir.NativeFuncCall(
+            func=common.NativeFunction.ARCSIN,
+            args=[npir.Literal(dtype=common.DataType.FLOAT64, value="0.5")],
+        )
+    )
+    assert result == "xp.asin(xp.asarray(0.5, dtype=xp.float64))"
+
+
+def test_assign_without_out() -> None:
+    result = ArrayApiGen().visit(
+        VectorAssignFactory(
+            left__name="a",
+            right=npir.VectorArithmetic(
+                op=common.ArithmeticOperator.DIV,
+                left=FieldSliceFactory(name="b"),
+                right=npir.BroadCast(
+                    expr=npir.Cast(dtype=common.DataType.FLOAT64, expr=FieldSliceFactory(name="c"))
+                ),
+            ),
+        )
+    )
+    assert result == (
+        "a_[i:I, j:J, k_] = (b_[i:I, j:J, k_] / xp.asarray(c_[i:I, j:J, k_], dtype=xp.float64))"
+    )
+
+
+def test_computation_namespace() -> None:
+    result = ArrayApiGen.apply(
+        npir.Computation(
+            params=["a", "b", "c"],
+            field_params=["a", "b", "c"],
+            field_decls=[
+                FieldDeclFactory(name="a"),
+                FieldDeclFactory(name="b", dimensions=(True, True, False)),
+                FieldDeclFactory(name="c"),
+            ],
+            vertical_passes=[
+                VerticalPassFactory(
+                    temp_defs=[],
+                    body=[
+                        npir.HorizontalBlock(
+                            body=[VectorAssignFactory(left__name="a", right__name="b")]
+                        )
+                    ],
+                )
+            ],
+        ),
+        field_extents={},
+    )
+    assert "xp = array_api_compat.array_namespace(a, b)\n" in result
+    assert "b = xp.reshape(b, (b.shape[0], b.shape[1], 1))" in result
+    assert "np." not in result
+
+
+def test_accumulation_unsupported() -> None:
+    with pytest.raises(ValueError, match="accumulations"):
+        ArrayApiGen.apply(
+            npir.Computation(
+                params=["a"],
+                field_params=["a"],
+                field_decls=[FieldDeclFactory(name="a")],
+                vertical_passes=[
+                    VerticalPassFactory(
+                        temp_defs=[],
+                        direction=common.LoopOrder.FORWARD,
+                        body=[
+                            npir.HorizontalBlock(
+                                body=[
+                                    npir.VectorAccumulate(
+                                        name="a",
+                                        op=common.ArithmeticOperator.ADD,
+                                        direction=common.LoopOrder.FORWARD,
+                                    )
+                                ]
+                            )
+                        ],
+                    )
+                ],
+            ),
+            field_extents={},
+        )
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from gtc import gtir
+from gtc.common import DataType
+from gtc.passes.gtir_compute_dtype import set_compute_dtype
+from gtc.passes.gtir_upcaster import upcast
+
+from .gtir_utils import (
+    BinaryOpFactory,
+    FieldAccessFactory,
+    FieldDeclFactory,
+    LiteralFactory,
+    ParAssignStmtFactory,
+    StencilFactory,
+    VerticalLoopFactory,
+)
+
+
+def test_reads_are_converted():
+    testee = StencilFactory(
+        vertical_loops__0__body=[
+            ParAssignStmtFactory(
+                left__name="out",
+                right=BinaryOpFactory(left__name="in", right=LiteralFactory(value="2.0")),
+            )
+        ]
+    )
+    result = upcast(set_compute_dtype(testee, DataType.FLOAT64))
+
+    assignment = result.vertical_loops[0].body[0]
+    assert assignment.left.dtype == DataType.FLOAT32
+    assert isinstance(assignment.right, gtir.Cast)
+    assert assignment.right.dtype == DataType.FLOAT32
+
+    binary_op = assignment.right.expr
+    assert binary_op.dtype == DataType.FLOAT64
+    assert isinstance(binary_op.left, gtir.Cast)
+    assert binary_op.left.dtype == DataType.FLOAT64
+    assert binary_op.left.expr.name == "in"
+    assert binary_op.right.dtype == DataType.FLOAT64
+
+    assert all(param.dtype == DataType.FLOAT32 for param in result.params)
+
+
+def test_temporaries_are_retyped():
+    testee = StencilFactory(
+        vertical_loops=[
+            VerticalLoopFactory(
+                temporaries=[FieldDeclFactory(name="tmp", dtype=DataType.FLOAT64)],
+                body=[
+                    ParAssignStmtFactory(
+                        left=FieldAccessFactory(name="tmp", dtype=DataType.FLOAT64),
+                        right=FieldAccessFactory(name="in", dtype=DataType.FLOAT64),
+                    ),
+                    ParAssignStmtFactory(
+                        left=FieldAccessFactory(name="out", dtype=DataType.FLOAT64),
+                        right=FieldAccessFactory(name="tmp", dtype=DataType.FLOAT64),
+                    ),
+                ],
+            )
+        ],
+        params=[
+            FieldDeclFactory(name="in", dtype=DataType.FLOAT64),
+            FieldDeclFactory(name="out", dtype=DataType.FLOAT64),
+        ],
+    )
+    result = upcast(set_compute_dtype(testee, DataType.FLOAT32))
+
+    assert result.vertical_loops[0].temporaries[0].dtype == DataType.FLOAT32
+    tmp_assignment, out_assignment = result.vertical_loops[0].body
+    assert tmp_assignment.left.dtype == DataType.FLOAT32
+    assert isinstance(tmp_assignment.right, gtir.Cast)
+    assert isinstance(out_assignment.right, gtir.Cast)
+    assert out_assignment.right.dtype == DataType.FLOAT64
+    assert out_assignment.right.expr.name == "tmp"
+
+
+def test_integer_accesses_are_not_converted():
+    testee = StencilFactory(
+        vertical_loops__0__body=[
+            ParAssignStmtFactory(
+                left=FieldAccessFactory(name="out", dtype=DataType.INT32),
+                right=FieldAccessFactory(name="in", dtype=DataType.INT32),
+            )
+        ],
+        params=[
+            FieldDeclFactory(name="in", dtype=DataType.INT32),
+            FieldDeclFactory(name="out", dtype=DataType.INT32),
+        ],
+    )
+    assert set_compute_dtype(testee, DataType.FLOAT64) == testee
+
+
+def test_invalid_compute_dtype():
+    with pytest.raises(ValueError, match="floating point"):
+        set_compute_dtype(StencilFactory(), DataType.INT32)
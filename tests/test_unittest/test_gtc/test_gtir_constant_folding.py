@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from gtc import gtir
+from gtc.common import (
+    ArithmeticOperator,
+    BuiltInLiteral,
+    ComparisonOperator,
+    DataType,
+    LogicalOperator,
+    NativeFunction,
+    UnaryOperator,
+)
+from gtc.passes.gtir_constant_folding import _GTIRConstantFolding
+
+from .gtir_utils import (
+    BlockStmtFactory,
+    FieldAccessFactory,
+    FieldIfStmtFactory,
+    LiteralFactory,
+    ParAssignStmtFactory,
+    ScalarIfStmtFactory,
+    VerticalLoopFactory,
+)
+
+
+def fold(node):
+    return _GTIRConstantFolding().visit(node)
+
+
+def binary(op, left, right):
+    return gtir.BinaryOp(op=op, left=left, right=right)
+
+
+def literal(value, dtype=DataType.FLOAT32):
+    return LiteralFactory(value=value, dtype=dtype)
+
+
+A_FIELD = FieldAccessFactory(name="a")
+TRUE = literal(BuiltInLiteral.TRUE, DataType.BOOL)
+FALSE = literal(BuiltInLiteral.FALSE, DataType.BOOL)
+
+
+@pytest.mark.parametrize(
+    ["testee", "expected"],
+    [
+        (
+            binary(
+                ArithmeticOperator.MUL,
+                binary(ArithmeticOperator.MUL, literal("2.0"), literal("0.25")),
+                A_FIELD,
+            ),
+            binary(ArithmeticOperator.MUL, literal("0.5"), A_FIELD),
+        ),
+        (
+            binary(ArithmeticOperator.ADD, literal("0.1"), literal("0.2")),
+            literal("0.30000001192092896"),
+        ),
+        (
+            binary(
+                ArithmeticOperator.DIV, literal("7", DataType.INT32), literal("2", DataType.INT32)
+            ),
+            None,
+        ),
+        (binary(ArithmeticOperator.DIV, literal("1.0"), literal("0.0")), None),
+        (binary(ComparisonOperator.LT, literal("1.0"), literal("2.0")), TRUE),
+        (
+            gtir.UnaryOp(op=UnaryOperator.NEG, expr=literal("3", DataType.INT64)),
+            literal("-3", DataType.INT64),
+        ),
+        (gtir.Cast(dtype=DataType.INT32, expr=literal("2.5")), literal("2", DataType.INT32)),
+        (gtir.NativeFuncCall(func=NativeFunction.SQRT, args=[literal("4.0")]), literal("2.0")),
+        (gtir.NativeFuncCall(func=NativeFunction.EXP, args=[literal("1.0")]), None),
+    ],
+)
+def test_literal_folding(testee, expected):
+    assert fold(testee) == (testee if expected is None else expected)
+
+
+@pytest.mark.parametrize(
+    ["testee", "expected"],
+    [
+        (binary(ArithmeticOperator.MUL, literal("1.0"), A_FIELD), A_FIELD),
+        (binary(ArithmeticOperator.DIV, A_FIELD, literal("1.0")), A_FIELD),
+        (binary(ArithmeticOperator.SUB, A_FIELD, literal("0.0")), A_FIELD),
+        (binary(ArithmeticOperator.ADD, A_FIELD, literal("0.0")), None),
+        (
+            binary(
+                ArithmeticOperator.ADD,
+                literal("0", DataType.INT32),
+                FieldAccessFactory(name="a", dtype=DataType.INT32),
+            ),
+            FieldAccessFactory(name="a", dtype=DataType.INT32),
+        ),
+        (
+            binary(LogicalOperator.AND, FieldAccessFactory(name="m", dtype=DataType.BOOL), TRUE),
+            FieldAccessFactory(name="m", dtype=DataType.BOOL),
+        ),
+        (binary(LogicalOperator.OR, FieldAccessFactory(name="m", dtype=DataType.BOOL), TRUE), TRUE),
+        (gtir.TernaryOp(cond=FALSE, true_expr=A_FIELD, false_expr=literal("1.0")), literal("1.0")),
+        (
+            gtir.UnaryOp(
+                op=UnaryOperator.NEG, expr=gtir.UnaryOp(op=UnaryOperator.NEG, expr=A_FIELD)
+            ),
+            A_FIELD,
+        ),
+    ],
+)
+def test_identities(testee, expected):
+    assert fold(testee) == (testee if expected is None else expected)
+
+
+@pytest.mark.parametrize(
+    ["exponent", "factors"], [("1.0", 1), ("3.0", 3), ("5.0", None), ("2.5", None)]
+)
+def test_integer_power(exponent, factors):
+    testee = gtir.NativeFuncCall(func=NativeFunction.POW, args=[A_FIELD, literal(exponent)])
+    result = fold(testee)
+    if factors is None:
+        assert result == testee
+    else:
+        assert not result.iter_tree().if_isinstance(gtir.NativeFuncCall).to_list()
+        assert len(result.iter_tree().if_isinstance(gtir.FieldAccess).to_list()) == factors
+
+
+def test_if_stmt_pruning():
+    true_stmt = ParAssignStmtFactory(left__name="out", right__name="a")
+    false_stmt = ParAssignStmtFactory(left__name="out", right__name="b")
+    testee = VerticalLoopFactory(
+        body=[
+            FieldIfStmtFactory(
+                cond=binary(
+                    LogicalOperator.AND, FieldAccessFactory(name="m", dtype=DataType.BOOL), FALSE
+                ),
+                true_branch=BlockStmtFactory(body=[true_stmt]),
+                false_branch=BlockStmtFactory(body=[false_stmt]),
+            ),
+            ScalarIfStmtFactory(cond=TRUE, true_branch=BlockStmtFactory(body=[true_stmt])),
+            ScalarIfStmtFactory(cond=FALSE, true_branch=BlockStmtFactory(body=[true_stmt])),
+        ]
+    )
+    assert fold(testee).body == [false_stmt, true_stmt]
@@ -152,9 +152,34 @@ def test_vector_assign() -> None:
     assert result == "a_[i:I, j:J, k_] = b_[i:I, j:J, k_]"
 
 
+def test_vector_assign_ufunc_out() -> None:
+    result = npir_gen.NpirGen().visit(
+        VectorAssignFactory(
+            left__name="a",
+            right=npir.VectorArithmetic(
+                left=FieldSliceFactory(name="b"),
+                right=FieldSliceFactory(name="c"),
+                op=common.ArithmeticOperator.ADD,
+            ),
+        )
+    )
+    assert result == "np.add(b_[i:I, j:J, k_], c_[i:I, j:J, k_], out=a_[i:I, j:J, k_])"
+
+
+def test_vector_assign_masked_ufunc() -> None:
+    result = npir_gen.NpirGen().visit(
+        VectorAssignFactory(
+            left__name="a",
+            right=npir.VectorUnaryOp(expr=FieldSliceFactory(name="b"), op=common.UnaryOperator.NEG),
+            mask=FieldSliceFactory(name="m"),
+        )
+    )
+    assert result == "a_[i:I, j:J, k_][m_[i:I, j:J, k_]] = (-(b_[i:I, j:J, k_][m_[i:I, j:J, k_]]))"
+
+
 def test_temp_definition() -> None:
     result = npir_gen.NpirGen().visit(VectorAssignFactory(temp_init=True, temp_name="a"))
-    assert result == "a_ = ShimmedView(np.zeros(_domain_, dtype=np.int64), [0, 0, 0])"
+    assert result == "a_ = np.zeros(_domain_, dtype=np.int64)"
 
 
 def test_temp_with_extent_definition() -> None:
@@ -162,10 +187,7 @@ def test_temp_with_extent_definition() -> None:
         VectorAssignFactory(temp_init=True, temp_name="a"),
         field_extents={"a": Extent((0, 1), (-2, 3))},
     )
-    assert (
-        result
-        == "a_ = ShimmedView(np.zeros((_dI_ + 1, _dJ_ + 5, _dK_), dtype=np.int64), [0, 2, 0])"
-    )
+    assert result == "a_ = np.zeros((_dI_ + 1, _dJ_ + 5, _dK_), dtype=np.int64)"
 
 
 def test_vector_arithmetic() -> None:
@@ -179,6 +201,34 @@ def test_vector_arithmetic() -> None:
     assert result == "(a_[i:I, j:J, k_] + b_[i:I, j:J, k_])"
 
 
+def test_vector_arithmetic_fused_cast() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.VectorArithmetic(
+            left=npir.BroadCast(
+                expr=npir.Cast(dtype=common.DataType.FLOAT64, expr=FieldSliceFactory(name="a")),
+                dtype=common.DataType.FLOAT64,
+            ),
+            right=FieldSliceFactory(name="b"),
+            op=common.ArithmeticOperator.MUL,
+        )
+    )
+    assert result == "np.multiply(a_[i:I, j:J, k_], b_[i:I, j:J, k_], dtype=np.float64)"
+
+
+def test_vector_comparison_not_fused_cast() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.VectorArithmetic(
+            left=npir.BroadCast(
+                expr=npir.Cast(dtype=common.DataType.FLOAT64, expr=FieldSliceFactory(name="a")),
+                dtype=common.DataType.FLOAT64,
+            ),
+            right=FieldSliceFactory(name="b"),
+            op=common.ComparisonOperator.LT,
+        )
+    )
+    assert result == "(np.array(a_[i:I, j:J, k_], dtype=np.float64) < b_[i:I, j:J, k_])"
+
+
 def test_vector_unary_op() -> None:
     result = npir_gen.NpirGen().visit(
         npir.VectorUnaryOp(
@@ -231,7 +281,22 @@ def test_mask_block_broadcast() -> None:
             mask_name="mask1",
         )
     )
-    assert result == "mask1_ = np.full((I - i, J - j, K - k), np.bool(True))\n"
+    assert result == "if np.bool(True):\n    pass\n"
+
+
+def test_mask_block_broadcast_body() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.MaskBlock(
+            body=[
+                VectorAssignFactory(
+                    left__name="out", right__name="in", mask=npir.VectorTemp(name="mask1")
+                )
+            ],
+            mask=npir.BroadCast(expr=npir.NamedScalar(name="cond", dtype=common.DataType.BOOL)),
+            mask_name="mask1",
+        )
+    )
+    assert result == "if cond:\n    out_[i:I, j:J, k_] = in_[i:I, j:J, k_]\n"
 
 
 def test_mask_block_other() -> None:
@@ -260,6 +325,32 @@ def test_horizontal_block() -> None:
     assert match
 
 
+def test_horizontal_block_with_extent_and_locals() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.HorizontalBlock(
+            body=[
+                VectorAssignFactory(
+                    left=npir.LocalScalarAccess(name="tmp"), right__name="a", right__parallel_k=True
+                ),
+                VectorAssignFactory(
+                    left=npir.LocalScalarAccess(name="tmp"),
+                    right=npir.LocalScalarAccess(name="tmp"),
+                    mask=FieldSliceFactory(name="m", parallel_k=True),
+                ),
+            ],
+            declarations=[
+                npir.LocalScalarDecl(name="tmp", dtype=common.DataType.FLOAT64, parallel_k=True)
+            ],
+            extent=((1, 0), (0, 2)),
+        ),
+    )
+    print(result)
+    assert "i, I = _di_ - 1, _dI_ + 0\nj, J = _dj_ - 0, _dJ_ + 2\n" in result
+    assert "tmp_ = np.empty((I - i, J - j, K - k), dtype=np.float64)\n" in result
+    assert "tmp_[...] = a_[i:I, j:J, k:K]\n" in result
+    assert "tmp_[m_[i:I, j:J, k:K]] = tmp_[m_[i:I, j:J, k:K]]\n" in result
+
+
 def test_vertical_pass_seq() -> None:
     result = npir_gen.NpirGen().visit(
         VerticalPassFactory(
@@ -279,6 +370,64 @@ def test_vertical_pass_seq() -> None:
     assert match
 
 
+def test_vertical_pass_seq_hoisted_declarations() -> None:
+    result = npir_gen.NpirGen().visit(
+        VerticalPassFactory(
+            temp_defs=[],
+            body=[
+                npir.HorizontalBlock(
+                    body=[
+                        VectorAssignFactory(
+                            left=npir.LocalScalarAccess(name="tmp"), right__name="a"
+                        )
+                    ],
+                    declarations=[
+                        npir.LocalScalarDecl(
+                            name="tmp", dtype=common.DataType.FLOAT64, parallel_k=False
+                        )
+                    ],
+                    extent=((1, 0), (0, 0)),
+                )
+            ],
+            direction=common.LoopOrder.FORWARD,
+        )
+    )
+    print(result)
+    match = re.match(
+        (
+            r"(#.*?\n)?"
+            r"i, I = _di_ - 1, _dI_ \+ 0\nj, J = _dj_ - 0, _dJ_ \+ 0\n"
+            r"tmp_ = np.empty\(\(I - i, J - j\), dtype=np.float64\)\n"
+            r"k, K = _dk_, _dK_\n"
+            r"for k_ in range\(k, K\):\n"
+        ),
+        result,
+        re.MULTILINE,
+    )
+    assert match
+    assert result.count("np.empty") == 1
+
+
+def test_vector_accumulate() -> None:
+    forward = npir_gen.NpirGen().visit(
+        npir.VectorAccumulate(
+            name="a", op=common.ArithmeticOperator.ADD, direction=common.LoopOrder.FORWARD
+        )
+    )
+    assert forward == (
+        "np.add.accumulate(a_[i:I, j:J, (k - 1):K], axis=2, out=a_[i:I, j:J, (k - 1):K])"
+    )
+    backward = npir_gen.NpirGen().visit(
+        npir.VectorAccumulate(
+            name="a", op=common.ArithmeticOperator.MUL, direction=common.LoopOrder.BACKWARD
+        )
+    )
+    assert backward == (
+        "np.multiply.accumulate(a_[i:I, j:J, k:(K + 1)][:, :, ::-1], axis=2, "
+        "out=a_[i:I, j:J, k:(K + 1)][:, :, ::-1])"
+    )
+
+
 def test_vertical_pass_par() -> None:
     result = npir_gen.NpirGen().visit(VerticalPassFactory(body=[], temp_defs=[]))
     print(result)
@@ -341,7 +490,7 @@ def test_vertical_pass_temp_def() -> None:
     )
     print(result)
     match = re.match(
-        r"(#.*?\n)?a_ = ShimmedView\(np.zeros\(_domain_, dtype=np.int64\), \[0, 0, 0\]\)\nk, K = _dK_ \- 4, _dK_ \- 1\nfor k_ in range\(K-1, k-1, -1\):\n",
+        r"(#.*?\n)?a_ = np.zeros\(_domain_, dtype=np.int64\)\nk, K = _dK_ \- 4, _dK_ \- 1\nfor k_ in range\(K-1, k-1, -1\):\n",
         result,
         re.MULTILINE,
     )
@@ -372,6 +521,130 @@ def test_computation() -> None:
     assert match
 
 
+def test_computation_data_views() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.Computation(
+            params=["a", "b", "c"],
+            field_params=["a", "b", "c"],
+            field_decls=[FieldDeclFactory(name=name) for name in "abc"],
+            vertical_passes=[
+                VerticalPassFactory(
+                    temp_defs=[],
+                    body=[
+                        npir.HorizontalBlock(
+                            body=[
+                                VectorAssignFactory(
+                                    left__name="a",
+                                    left__parallel_k=True,
+                                    right__name="b",
+                                    right__offsets=(-1, 1, -1),
+                                    right__parallel_k=True,
+                                )
+                            ],
+                            extent=((1, 0), (0, 0)),
+                        )
+                    ],
+                )
+            ],
+        ),
+        field_extents={},
+    )
+    print(result)
+    assert 'a_ = a[_origin_["a"][0] - 1:, _origin_["a"][1]:, _origin_["a"][2]:]\n' in result
+    assert 'b_ = b[_origin_["b"][0] - 2:, _origin_["b"][1]:, _origin_["b"][2] - 1:]\n' in result
+    assert "c_ =" not in result
+    assert "a_[(i + 1):(I + 1), j:J, k:K] = b_[(i + 1):(I + 1), (j + 1):(J + 1), k:K]" in result
+
+
+def test_computation_temp_buffers() -> None:
+    result = npir_gen.NpirGen().visit(
+        npir.Computation(
+            params=[],
+            field_params=[],
+            field_decls=[],
+            vertical_passes=[
+                VerticalPassFactory(
+                    temp_defs=[
+                        VectorAssignFactory(
+                            left=npir.VectorTemp(name="a"),
+                            right=npir.EmptyTemp(
+                                dtype=common.DataType.FLOAT64, buffer=0, initialize=False
+                            ),
+                        ),
+                        VectorAssignFactory(
+                            left=npir.VectorTemp(name="b"),
+                            right=npir.EmptyTemp(dtype=common.DataType.FLOAT64, buffer=0),
+                        ),
+                    ],
+                    body=[],
+                )
+            ],
+            temp_buffers=[
+                npir.TemporaryBuffer(dtype=common.DataType.FLOAT64, boundary=((1, 2), (0, 3)))
+            ],
+        ),
+        field_extents={},
+    )
+    print(result)
+    assert "_temporaries_ = threading.local()" in result
+    assert "[np.empty((_dI_ + 3, _dJ_ + 3, _dK_), dtype=np.float64)]" in result
+    assert "a_ = _buffers_[0]\n" in result
+    assert "_buffers_[0].fill(0)\n    b_ = _buffers_[0]\n" in result
+
+
+def tiles_computation(*assigns: npir.VectorAssign, extent=((0, 0), (0, 0))) -> npir.Computation:
+    return npir.Computation(
+        params=["a", "b"],
+        field_params=["a", "b"],
+        field_decls=[
+            FieldDeclFactory(name="a"),
+            FieldDeclFactory(name="b", dimensions=(True, True, False)),
+        ],
+        vertical_passes=[
+            VerticalPassFactory(
+                temp_defs=[],
+                body=[npir.HorizontalBlock(body=list(assigns), extent=extent)],
+            )
+        ],
+    )
+
+
+def test_is_tileable() -> None:
+    assert npir_gen.is_tileable(
+        tiles_computation(
+            VectorAssignFactory(left__name="a", right__name="b", right__offsets=(1, -1, 0))
+        ),
+        field_extents={},
+    )
+    assert not npir_gen.is_tileable(
+        tiles_computation(
+            VectorAssignFactory(left__name="a", right__name="a", right__offsets=(1, 0, 0))
+        ),
+        field_extents={},
+    )
+    assert not npir_gen.is_tileable(
+        tiles_computation(
+            VectorAssignFactory(left__name="a", right__name="b"), extent=((1, 0), (0, 0))
+        ),
+        field_extents={},
+    )
+
+
+def test_computation_tiles() -> None:
+    result = npir_gen.NpirGen().visit(
+        tiles_computation(VectorAssignFactory(left__name="a", right__name="b")),
+        field_extents={},
+        num_threads=4,
+    )
+    print(result)
+    assert "_executor_ = concurrent.futures.ThreadPoolExecutor(max_workers=4)" in result
+    assert "def _run_tile_(*, a, b, _domain_, _origin_):" in result
+    assert '"a": (_origin_["a"][0] + _i_, _origin_["a"][1] + _j_, *_origin_["a"][2:])' in result
+    assert '"b": (_origin_["b"][0] + _i_, _origin_["b"][1] + _j_, *_origin_["b"][2:])' in result
+    # The fields are reshaped once, before splitting the domain
+    assert result.index("b = np.reshape(") < result.index("def _run_tile_")
+
+
 def test_full_computation_valid(tmp_path) -> None:
     result = npir_gen.NpirGen.apply(
         npir.Computation(
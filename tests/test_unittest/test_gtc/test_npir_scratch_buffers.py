@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import List
+
+from gtc import common
+from gtc.python import npir
+from gtc.python.scratch_buffers import SplitUfuncExpressions
+
+from .npir_utils import FieldDeclFactory, FieldSliceFactory, VerticalPassFactory
+
+
+FLOAT = common.DataType.FLOAT32
+
+
+def field(name: str) -> npir.FieldSlice:
+    return FieldSliceFactory(name=name, dtype=FLOAT, parallel_k=True)
+
+
+def add(left: npir.Expr, right: npir.Expr) -> npir.VectorArithmetic:
+    return npir.VectorArithmetic(
+        left=left, right=right, op=common.ArithmeticOperator.ADD, dtype=FLOAT
+    )
+
+
+def split(body: List[npir.VectorAssign], field_decls: List[npir.FieldDecl]) -> npir.HorizontalBlock:
+    computation = npir.Computation(
+        field_decls=field_decls,
+        field_params=[decl.name for decl in field_decls],
+        params=[],
+        vertical_passes=[VerticalPassFactory(temp_defs=[], body=[npir.HorizontalBlock(body=body)])],
+    )
+    return SplitUfuncExpressions().visit(computation).vertical_passes[0].body[0]
+
+
+def test_nested_expression_reuses_scratch():
+    block = split(
+        [
+            npir.VectorAssign(
+                left=field("out"),
+                right=add(add(add(field("a"), field("b")), field("c")), field("d")),
+                mask=None,
+            )
+        ],
+        [FieldDeclFactory(name=name) for name in ("out", "a", "b", "c", "d")],
+    )
+
+    assert block.declarations == [
+        npir.LocalScalarDecl(name="_scratch_0", dtype=FLOAT, parallel_k=True)
+    ]
+    scratch = npir.LocalScalarAccess(name="_scratch_0", dtype=FLOAT)
+    assert [stmt.left for stmt in block.body] == [scratch, scratch, field("out")]
+    assert block.body[0].right == add(field("a"), field("b"))
+    assert block.body[1].right == add(scratch, field("c"))
+    assert block.body[2].right == add(scratch, field("d"))
+
+
+def test_partial_field_not_split():
+    body = [
+        npir.VectorAssign(
+            left=field("out"), right=add(add(field("a"), field("b2d")), field("c")), mask=None
+        )
+    ]
+    block = split(
+        body,
+        [
+            *(FieldDeclFactory(name=name) for name in ("out", "a", "c")),
+            FieldDeclFactory(name="b2d", dimensions=(True, True, False)),
+        ],
+    )
+
+    assert block.declarations == []
+    assert block.body == body
+
+
+def test_masked_assign_not_split():
+    body = [
+        npir.VectorAssign(
+            left=field("out"), right=add(add(field("a"), field("b")), field("c")), mask=field("m")
+        )
+    ]
+    block = split(body, [FieldDeclFactory(name=name) for name in ("out", "a", "b", "c", "m")])
+
+    assert block.declarations == []
+    assert block.body == body
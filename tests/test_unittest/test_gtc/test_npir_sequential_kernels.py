@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import List
+
+from gtc import common, oir
+from gtc.passes.oir_optimizations.utils import compute_extents
+from gtc.python import npir
+from gtc.python.npir_gen import NpirGen
+from gtc.python.oir_to_npir import OirToNpir
+from gtc.python.sequential_kernels import SequentialKernelGen, has_kernels
+
+from .oir_utils import AssignStmtFactory, HorizontalExecutionFactory, StencilFactory
+
+
+def lower(horizontal_executions: List[oir.HorizontalExecution]) -> npir.Computation:
+    testee = StencilFactory(
+        vertical_loops__0__loop_order=common.LoopOrder.FORWARD,
+        vertical_loops__0__sections__0__horizontal_executions=horizontal_executions,
+    )
+    return OirToNpir().visit(testee, block_extents=compute_extents(testee)[1])
+
+
+def test_parallel_passes_stay_in_numpy():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions__0__body=[
+            AssignStmtFactory(left__name="out", right__name="in")
+        ]
+    )
+    computation = OirToNpir().visit(testee, block_extents=compute_extents(testee)[1])
+    assert not has_kernels(computation)
+
+
+def test_independent_columns():
+    computation = lower(
+        [
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out", right__name="out", right__offset__k=-1)]
+            )
+        ]
+    )
+    assert has_kernels(computation)
+    result = SequentialKernelGen.apply(computation, module_name="kernels")
+    assert "void vertical_pass_0(py::array_t<float, 0> out, " in result
+    assert "auto out_ = out.mutable_unchecked<3>();" in result
+    assert result.index("for (py::ssize_t _i_") < result.index("for (py::ssize_t _k_")
+    # The view of `out` starts one level below the domain for the read at K offset -1
+    assert "out_(_i_, _j_, _k_ + 1) = out_(_i_, _j_, _k_);" in result
+    assert 'm.def("vertical_pass_0", &vertical_pass_0);' in result
+
+
+def test_dependent_columns_by_level():
+    computation = lower(
+        [
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="tmp", right__name="in", right__offset__k=-1)]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)]
+            ),
+        ]
+    )
+    result = SequentialKernelGen.apply(computation, module_name="kernels")
+    assert "auto in_ = in.unchecked<3>();" in result
+    assert result.index("for (py::ssize_t _k_") < result.index("for (py::ssize_t _i_")
+    assert "for (py::ssize_t _i_ = 0; _i_ < _dI_ + 1; ++_i_)" in result
+    assert "out_(_i_, _j_, _k_) = tmp_(_i_ + 1, _j_, _k_);" in result
+
+
+def test_numpy_calls_kernels():
+    computation = lower(
+        [
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out", right__name="in", right__offset__k=-1)]
+            )
+        ]
+    )
+    result = NpirGen.apply(computation, field_extents={}, kernels_module="kernels")
+    assert "import kernels as _kernels_" in result
+    assert "_kernels_.vertical_pass_0(out_, in_, _dI_, _dJ_, _dK_)" in result
+    assert "for k_ in range" not in result
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import List
+
+from gtc import common, oir
+from gtc.python import npir
+from gtc.python.oir_to_npir import OirToNpir
+from gtc.python.sequential_passes import VectorizeSequentialPasses
+
+from .oir_utils import (
+    AssignStmtFactory,
+    FieldAccessFactory,
+    HorizontalExecutionFactory,
+    IntervalFactory,
+    LocalScalarFactory,
+    StencilFactory,
+    TemporaryFactory,
+)
+
+
+def vectorize(
+    body: List[oir.Stmt],
+    loop_order: common.LoopOrder = common.LoopOrder.FORWARD,
+    **kwargs,
+) -> npir.VerticalPass:
+    testee = StencilFactory(
+        vertical_loops__0__loop_order=loop_order,
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=body, **kwargs)
+        ],
+    )
+    computation = VectorizeSequentialPasses().visit(OirToNpir().visit(testee))
+    return computation.vertical_passes[0]
+
+
+def add(left: oir.Expr, right: oir.Expr) -> oir.BinaryOp:
+    return oir.BinaryOp(op=common.ArithmeticOperator.ADD, left=left, right=right)
+
+
+def test_independent_levels():
+    vertical_pass = vectorize(
+        [
+            AssignStmtFactory(left=oir.ScalarAccess(name="tmp", dtype=common.DataType.FLOAT32)),
+            AssignStmtFactory(
+                left__name="out",
+                right=add(
+                    oir.ScalarAccess(name="tmp", dtype=common.DataType.FLOAT32),
+                    FieldAccessFactory(name="in", offset__k=-1),
+                ),
+            ),
+        ],
+        declarations=[LocalScalarFactory(name="tmp")],
+    )
+
+    assert vertical_pass.direction == common.LoopOrder.PARALLEL
+    assert all(decl.parallel_k for decl in vertical_pass.body[0].declarations)
+    assert all(
+        offset.parallel
+        for offset in vertical_pass.iter_tree().if_isinstance(npir.AxisOffset)
+        if offset.axis_name == npir.AxisName.K
+    )
+
+
+def test_accumulation():
+    vertical_pass = vectorize(
+        [
+            AssignStmtFactory(
+                left__name="sum",
+                right=add(
+                    FieldAccessFactory(name="in"), FieldAccessFactory(name="sum", offset__k=1)
+                ),
+            )
+        ],
+        loop_order=common.LoopOrder.BACKWARD,
+    )
+
+    assert vertical_pass.direction == common.LoopOrder.PARALLEL
+    assign, accumulate = vertical_pass.body[0].body
+    assert assign.left.name == "sum"
+    assert assign.right.name == "in"
+    assert accumulate == npir.VectorAccumulate(
+        name="sum", op=common.ArithmeticOperator.ADD, direction=common.LoopOrder.BACKWARD
+    )
+
+
+def test_dependency_on_later_statement():
+    vertical_pass = vectorize(
+        [
+            AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=-1),
+            AssignStmtFactory(left__name="tmp", right__name="in"),
+        ],
+    )
+    assert vertical_pass.direction == common.LoopOrder.FORWARD
+
+
+def test_non_linear_recurrence():
+    vertical_pass = vectorize(
+        [
+            AssignStmtFactory(
+                left__name="out",
+                right=oir.BinaryOp(
+                    op=common.ArithmeticOperator.DIV,
+                    left=FieldAccessFactory(name="in"),
+                    right=FieldAccessFactory(name="out", offset__k=-1),
+                ),
+            )
+        ],
+    )
+    assert vertical_pass.direction == common.LoopOrder.FORWARD
+
+
+def test_single_level():
+    testee = StencilFactory(
+        vertical_loops__0__loop_order=common.LoopOrder.FORWARD,
+        vertical_loops__0__sections__0__interval=IntervalFactory(
+            start=common.AxisBound.from_start(1), end=common.AxisBound.from_start(2)
+        ),
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out", right__name="out", right__offset__k=-1)]
+            )
+        ],
+    )
+    computation = VectorizeSequentialPasses().visit(OirToNpir().visit(testee))
+    vertical_pass = computation.vertical_passes[0]
+
+    assert vertical_pass.direction == common.LoopOrder.PARALLEL
+    assert not vertical_pass.iter_tree().if_isinstance(npir.VectorAccumulate).to_list()
+
+
+def test_temporary_planes():
+    def vectorize_with_temporary(
+        body: List[oir.Stmt], temporary: oir.Temporary
+    ) -> npir.Computation:
+        testee = StencilFactory(
+            vertical_loops__0__loop_order=common.LoopOrder.FORWARD,
+            vertical_loops__0__sections__0__horizontal_executions=[
+                HorizontalExecutionFactory(body=body)
+            ],
+            declarations=[temporary],
+        )
+        return VectorizeSequentialPasses().visit(OirToNpir().visit(testee))
+
+    # Vectorized passes store temporaries on all levels
+    computation = vectorize_with_temporary(
+        [
+            AssignStmtFactory(left__name="tmp", right__name="in"),
+            AssignStmtFactory(left__name="out", right__name="tmp"),
+        ],
+        TemporaryFactory(name="tmp", dimensions=(True, True, False)),
+    )
+    (vertical_pass,) = computation.vertical_passes
+    assert vertical_pass.direction == common.LoopOrder.PARALLEL
+    assert vertical_pass.temp_defs[0].right.k_size is None
+    assert all(
+        field_slice.k_offset.parallel
+        for field_slice in vertical_pass.iter_tree().if_isinstance(npir.FieldSlice)
+    )
+
+    computation = vectorize_with_temporary(
+        [
+            AssignStmtFactory(
+                left__name="tmp",
+                right=oir.BinaryOp(
+                    op=common.ArithmeticOperator.DIV,
+                    left=FieldAccessFactory(name="in"),
+                    right=FieldAccessFactory(name="tmp", offset__k=-1),
+                ),
+            ),
+            AssignStmtFactory(left__name="out", right__name="tmp"),
+        ],
+        TemporaryFactory(name="tmp", k_planes=2),
+    )
+    (vertical_pass,) = computation.vertical_passes
+    assert vertical_pass.direction == common.LoopOrder.FORWARD
+    assert vertical_pass.temp_defs[0].right.k_size == 2
+    assert all(
+        field_slice.k_offset.modulo == 2
+        for field_slice in vertical_pass.iter_tree().if_isinstance(npir.FieldSlice)
+        if field_slice.name == "tmp"
+    )
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from typing import Dict
+
+from gtc import common, oir
+from gtc.passes.oir_optimizations.utils import compute_extents
+from gtc.python import npir
+from gtc.python.oir_to_npir import OirToNpir
+from gtc.python.temporary_buffers import AllocateTemporaryBuffers
+
+from .oir_utils import (
+    AssignStmtFactory,
+    HorizontalExecutionFactory,
+    MaskStmtFactory,
+    StencilFactory,
+    TemporaryFactory,
+)
+
+
+def allocate(stencil: oir.Stencil) -> npir.Computation:
+    field_extents, block_extents = compute_extents(stencil)
+    computation = OirToNpir().visit(stencil, block_extents=block_extents)
+    return AllocateTemporaryBuffers().visit(computation, field_extents=field_extents)
+
+
+def temp_allocations(computation: npir.Computation) -> Dict[str, npir.EmptyTemp]:
+    return {
+        temp_def.left.name: temp_def.right
+        for vertical_pass in computation.vertical_passes
+        for temp_def in vertical_pass.temp_defs
+    }
+
+
+def test_disjoint_lifetimes_share_buffer():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="tmp1", right__name="in")]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out1", right__name="tmp1", right__offset__i=1)]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="tmp2", right__name="in")]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out2", right__name="tmp2", right__offset__j=-1)]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp1"), TemporaryFactory(name="tmp2")],
+    )
+    computation = allocate(testee)
+    allocations = temp_allocations(computation)
+
+    assert computation.temp_buffers == [
+        npir.TemporaryBuffer(dtype=common.DataType.FLOAT32, boundary=((0, 1), (1, 0)))
+    ]
+    assert allocations["tmp1"].buffer == allocations["tmp2"].buffer == 0
+    assert not allocations["tmp1"].initialize
+    assert not allocations["tmp2"].initialize
+
+
+def test_overlapping_lifetimes():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(left__name="tmp1", right__name="in"),
+                    AssignStmtFactory(left__name="tmp2", right__name="in"),
+                    AssignStmtFactory(left__name="out", right__name="tmp1"),
+                    AssignStmtFactory(left__name="out", right__name="tmp2"),
+                ]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp1"), TemporaryFactory(name="tmp2")],
+    )
+    computation = allocate(testee)
+    allocations = temp_allocations(computation)
+
+    assert len(computation.temp_buffers) == 2
+    assert allocations["tmp1"].buffer != allocations["tmp2"].buffer
+
+
+def test_partial_first_write_is_initialized():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    MaskStmtFactory(body=[AssignStmtFactory(left__name="tmp", right__name="in")]),
+                    AssignStmtFactory(left__name="out", right__name="tmp"),
+                ]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    assert temp_allocations(allocate(testee))["tmp"].initialize
+
+
+def test_sequential_pass():
+    testee = StencilFactory(
+        vertical_loops__0__loop_order=common.LoopOrder.FORWARD,
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(left__name="tmp1", right__name="in"),
+                    AssignStmtFactory(left__name="out", right__name="tmp1"),
+                    AssignStmtFactory(left__name="tmp2", right__name="in"),
+                    AssignStmtFactory(left__name="out", right__name="tmp2"),
+                ]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp1"), TemporaryFactory(name="tmp2")],
+    )
+    computation = allocate(testee)
+    allocations = temp_allocations(computation)
+
+    assert len(computation.temp_buffers) == 2
+    assert allocations["tmp1"].initialize
+    assert allocations["tmp2"].initialize
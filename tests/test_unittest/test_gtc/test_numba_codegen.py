@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from gtc import common, oir
+from gtc.numba.numba_codegen import NumbaCodegen, columns_are_independent, k_cache_windows
+
+from .oir_utils import (
+    AssignStmtFactory,
+    HorizontalExecutionFactory,
+    KCacheFactory,
+    StencilFactory,
+    TemporaryFactory,
+    VerticalLoopFactory,
+)
+
+
+# The generated code is only meaningful with the gtc:numba backend, which requires numba
+pytest.importorskip("numba")
+
+
+def test_columns_are_independent():
+    assert columns_are_independent(
+        VerticalLoopFactory(
+            sections__0__horizontal_executions__0__body=[
+                AssignStmtFactory(left__name="a", right__name="a", right__offset__k=-1),
+                AssignStmtFactory(left__name="b", right__name="c", right__offset__i=1),
+            ]
+        )
+    )
+    assert not columns_are_independent(
+        VerticalLoopFactory(
+            sections__0__horizontal_executions__0__body=[
+                AssignStmtFactory(left__name="a", right__name="b"),
+                AssignStmtFactory(left__name="c", right__name="a", right__offset__j=-1),
+            ]
+        )
+    )
+
+
+def test_k_cache_windows():
+    testee = VerticalLoopFactory(
+        loop_order=common.LoopOrder.FORWARD,
+        sections__0__horizontal_executions__0__body=[
+            AssignStmtFactory(left__name="tmp", right__name="tmp", right__offset__k=-1),
+            AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=-2),
+            AssignStmtFactory(left__name="shared", right__name="in"),
+            AssignStmtFactory(left__name="shifted", right__name="shifted", right__offset__i=1),
+        ],
+        caches=[
+            KCacheFactory(name=name, fill=False, flush=False)
+            for name in ("tmp", "shared", "shifted")
+        ],
+    )
+    windows = k_cache_windows(
+        testee,
+        loop_counts={"tmp": 1, "shared": 2, "shifted": 1},
+        temporaries={"tmp", "shared", "shifted"},
+    )
+    assert windows == {"tmp": (-2, 0)}
+
+
+def test_parallel_loop_nest():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions__0__body=[
+            AssignStmtFactory(left__name="out", right__name="in", right__offset__i=1)
+        ]
+    )
+    result = NumbaCodegen.apply(testee)
+    assert "@numba.njit(" in result
+    assert "for _i_ in numba.prange(0, _dI_):" in result
+    assert "for _j_ in range(0, _dJ_):" in result
+    assert "for _k_ in range(0, _dK_):" in result
+    assert "in[_i_ + _in_origin_[0] + 1, _j_ + _in_origin_[1], _k_ + _in_origin_[2]]" in result
+
+
+def test_k_cached_temporary_in_scalars():
+    testee = StencilFactory(
+        vertical_loops__0=VerticalLoopFactory(
+            loop_order=common.LoopOrder.FORWARD,
+            sections__0__horizontal_executions__0__body=[
+                AssignStmtFactory(left__name="tmp", right__name="tmp", right__offset__k=-1),
+                AssignStmtFactory(left__name="out", right__name="tmp"),
+            ],
+            caches=[KCacheFactory(name="tmp", fill=False, flush=False)],
+        ),
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    result = NumbaCodegen.apply(testee)
+    assert "np.zeros(" not in result
+    assert "_tmp_0_ = _tmp_m1_" in result
+    assert "_tmp_m1_ = _tmp_0_" in result
+
+
+def test_tiled_loop_nest():
+    testee = StencilFactory(
+        vertical_loops__0=VerticalLoopFactory(
+            sections__0__horizontal_executions=[
+                HorizontalExecutionFactory(
+                    body=[AssignStmtFactory(left__name="tmp", right__name="in")]
+                ),
+                HorizontalExecutionFactory(
+                    body=[
+                        AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)
+                    ]
+                ),
+            ],
+            tiling=oir.Tiling(tile_size=(16, 8), halo=common.IJExtent(i=(0, 1), j=(0, 0))),
+        ),
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    result = NumbaCodegen.apply(testee)
+    assert "for _t_ in numba.prange(((_dI_ + 16 - 1) // 16) * ((_dJ_ + 8 - 1) // 8)):" in result
+    assert "for _i_ in range(_ti_ - 0, min(_ti_ + 16, _dI_) + 1):" in result
+    assert "for _j_ in range(_tj_ - 0, min(_tj_ + 8, _dJ_) + 0):" in result
+    # The temporary is allocated per tile, halo included, and indexed relative to the tile
+    assert "tmp = np.zeros((16 + 1, 8, _dK_)" in result
+    assert "tmp[_i_ - _ti_ + 1, _j_ - _tj_, _k_]" in result
+
+
+def test_temporary_planes():
+    testee = StencilFactory(
+        vertical_loops__0=VerticalLoopFactory(
+            loop_order=common.LoopOrder.FORWARD,
+            sections__0__interval__start=common.AxisBound.from_start(1),
+            sections__0__horizontal_executions__0__body=[
+                AssignStmtFactory(left__name="tmp", right__name="tmp", right__offset__k=-1),
+                AssignStmtFactory(left__name="tmp2", right__name="tmp"),
+            ],
+        ),
+        declarations=[
+            TemporaryFactory(name="tmp", k_planes=2),
+            TemporaryFactory(name="tmp2", dimensions=(True, True, False)),
+        ],
+    )
+    result = NumbaCodegen.apply(testee)
+    assert "tmp = np.zeros((_dI_, _dJ_, 2)" in result
+    assert "tmp2 = np.zeros((_dI_, _dJ_)" in result
+    assert "tmp[_i_, _j_, (_k_) % 2] = tmp[_i_, _j_, (_k_ - 1) % 2]" in result
+    assert "tmp2[_i_, _j_] = tmp[_i_, _j_, (_k_) % 2]" in result
@@ -16,6 +16,7 @@
 
 import pytest
 
+from gt4py.definitions import Extent
 from gtc import common, oir
 from gtc.python import npir
 from gtc.python.oir_to_npir import OirToNpir
@@ -25,6 +26,7 @@ from .oir_utils import (
     FieldAccessFactory,
     FieldDeclFactory,
     HorizontalExecutionFactory,
+    LocalScalarFactory,
     MaskStmtFactory,
     ScalarAccessFactory,
     StencilFactory,
@@ -125,6 +127,30 @@ def test_horizontal_execution_to_vector_assigns():
     assert horizontal_region.body == []
 
 
+def test_horizontal_execution_with_local_scalars(parallel_k):
+    horizontal_execution = HorizontalExecutionFactory(
+        body=[
+            AssignStmtFactory(left=ScalarAccessFactory(name="tmp"), right__name="a"),
+            AssignStmtFactory(left__name="b", right=ScalarAccessFactory(name="tmp")),
+            AssignStmtFactory(left__name="b", right=ScalarAccessFactory(name="param")),
+        ],
+        declarations=[LocalScalarFactory(name="tmp")],
+    )
+    horizontal_block = OirToNpir().visit(
+        horizontal_execution,
+        ctx=OirToNpir.ComputationContext(),
+        parallel_k=parallel_k,
+        block_extents={id(horizontal_execution): Extent((-1, 2), (0, 0))},
+    )
+    assert horizontal_block.extent == ((1, 2), (0, 0))
+    assert horizontal_block.declarations == [
+        npir.LocalScalarDecl(name="tmp", dtype=common.DataType.FLOAT32, parallel_k=parallel_k)
+    ]
+    assert isinstance(horizontal_block.body[0].left, npir.LocalScalarAccess)
+    assert isinstance(horizontal_block.body[1].right, npir.LocalScalarAccess)
+    assert isinstance(horizontal_block.body[2].right, npir.BroadCast)
+
+
 def test_mask_stmt_to_mask_block(parallel_k):
     mask_stmt = MaskStmtFactory(body=[])
     mask_block = OirToNpir().visit(
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import functools
+
+from gtc.passes.oir_optimizations.cost_model import CostModel
+from gtc.passes.oir_optimizations.horizontal_execution_merging import OnTheFlyMerging
+from gtc.passes.oir_pipeline import OirPipeline
+from gtc.passes.pass_cache import PassCache, node_hash, step_id
+
+from .oir_utils import StencilFactory
+
+
+def test_node_hash_is_structural():
+    stencil = StencilFactory()
+
+    assert node_hash(stencil) == node_hash(stencil.copy(deep=True))
+    assert node_hash(stencil) != node_hash(stencil.copy(update={"name": "other"}))
+
+
+def test_node_hash_ignores_set_order():
+    assert node_hash({"a", "b", "c"}) == node_hash({"c", "b", "a"})
+
+
+def test_step_id():
+    def step(node, *, factor):
+        return node
+
+    assert step_id(step) != step_id(functools.partial(step, factor=2))
+    assert step_id(functools.partial(step, factor=2)) != step_id(functools.partial(step, factor=3))
+    assert step_id(OnTheFlyMerging, ("cost_model", CostModel())) != step_id(
+        OnTheFlyMerging, ("cost_model", CostModel(byte_cost=2.0))
+    )
+
+
+class CountingPass:
+    def __init__(self, name):
+        self.__qualname__ = name
+        self.calls = 0
+
+    def __call__(self, node):
+        self.calls += 1
+        return node.copy(update={"name": f"{node.name}_{self.__qualname__}"})
+
+
+def test_pipeline_results_are_shared(tmp_path):
+    stencil = StencilFactory()
+    first, second = CountingPass("first"), CountingPass("second")
+
+    result = OirPipeline(stencil, pass_cache=PassCache(tmp_path)).apply([first, second])
+    assert result.name == f"{stencil.name}_first_second"
+    assert (first.calls, second.calls) == (1, 1)
+
+    # Another pipeline on an equal stencil reads all results from the cache
+    cached = OirPipeline(stencil.copy(deep=True), pass_cache=PassCache(tmp_path)).apply(
+        [first, second]
+    )
+    assert cached == result
+    assert (first.calls, second.calls) == (1, 1)
+
+
+def test_longest_cached_prefix_is_reused(tmp_path):
+    stencil = StencilFactory()
+    first, second, third = CountingPass("first"), CountingPass("second"), CountingPass("third")
+    pass_cache = PassCache(tmp_path)
+
+    OirPipeline(stencil, pass_cache=pass_cache).apply([first, second])
+    result = OirPipeline(stencil, pass_cache=pass_cache).apply([first, second, third])
+
+    assert result.name == f"{stencil.name}_first_second_third"
+    assert (first.calls, second.calls, third.calls) == (1, 1, 1)
+
+    # Different sequences of passes do not share results
+    OirPipeline(stencil, pass_cache=pass_cache).apply([second])
+    assert second.calls == 2
+
+
+def test_unreadable_results_are_missing(tmp_path):
+    stencil = StencilFactory()
+    step = CountingPass("step")
+    pass_cache = PassCache(tmp_path)
+
+    OirPipeline(stencil, pass_cache=pass_cache).apply([step])
+    for path in tmp_path.iterdir():
+        path.write_bytes(b"")
+    result = OirPipeline(stencil, pass_cache=pass_cache).apply([step])
+
+    assert result.name == f"{stencil.name}_step"
+    assert step.calls == 2
+
+
+def test_full_pipeline(tmp_path):
+    stencil = StencilFactory()
+    expected = OirPipeline(stencil).full()
+
+    assert OirPipeline(stencil, pass_cache=PassCache(tmp_path)).full() == expected
+    assert OirPipeline(stencil, pass_cache=PassCache(tmp_path)).full() == expected
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import tracemalloc
+
+from gtc.passes.oir_optimizations.horizontal_execution_merging import GreedyMerging
+from gtc.passes.oir_optimizations.temporaries import LocalTemporariesToScalars
+from gtc.passes.oir_pipeline import OirPipeline
+from gtc.passes.pass_instrumentation import PassInstrumentation, count_nodes
+
+from .oir_utils import (
+    AssignStmtFactory,
+    HorizontalExecutionFactory,
+    StencilFactory,
+    TemporaryFactory,
+)
+
+
+def test_records():
+    stencil = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=[AssignStmtFactory(left__name="tmp")]),
+            HorizontalExecutionFactory(body=[AssignStmtFactory(right__name="tmp")]),
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    instrumentation = PassInstrumentation(trace_memory=True)
+    result = OirPipeline(stencil, instrumentation=instrumentation).apply(
+        [GreedyMerging, LocalTemporariesToScalars]
+    )
+
+    merging, scalars = instrumentation.records
+    assert (merging.name, scalars.name) == ("GreedyMerging", "LocalTemporariesToScalars")
+    assert merging.nodes_before == count_nodes(stencil)
+    assert merging.nodes_after < merging.nodes_before
+    assert scalars.nodes_before == merging.nodes_after
+    assert scalars.nodes_after == count_nodes(result)
+    assert all(record.time >= 0 for record in instrumentation.records)
+    assert all(record.peak_memory > 0 for record in instrumentation.records)
+    assert not tracemalloc.is_tracing()
+
+
+def test_untraced_memory():
+    instrumentation = PassInstrumentation()
+    OirPipeline(StencilFactory(), instrumentation=instrumentation).apply([GreedyMerging])
+    assert instrumentation.records[0].peak_memory is None
+
+    # The peak of memory traced by others can not be reset
+    instrumentation = PassInstrumentation(trace_memory=True)
+    tracemalloc.start()
+    try:
+        OirPipeline(StencilFactory(), instrumentation=instrumentation).apply([GreedyMerging])
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert instrumentation.records[0].peak_memory is None
@@ -15,7 +15,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from gtc.common import AxisBound, LevelMarker, LoopOrder
-from gtc.oir import IJCache, KCache
+from gtc.oir import AssignStmt, IJCache, KCache
 from gtc.passes.oir_optimizations.caches import (
     FillFlushToLocalKCaches,
     IJCacheDetection,
@@ -31,6 +31,7 @@ from ...oir_utils import (
     IntervalFactory,
     KCacheFactory,
     LocalScalarFactory,
+    MaskStmtFactory,
     StencilFactory,
     TemporaryFactory,
     VerticalLoopFactory,
@@ -206,6 +207,31 @@ def test_prune_k_cache_fills_forward_with_reads_outside_interval():
     assert cache_dict["foo"].fill
 
 
+def test_prune_k_cache_fills_conditional_write():
+    testee = VerticalLoopFactory(
+        loop_order=LoopOrder.FORWARD,
+        sections__0=VerticalLoopSectionFactory(
+            horizontal_executions__0__body=[
+                MaskStmtFactory(
+                    body=[
+                        AssignStmtFactory(left__name="foo", right__name="foo", right__offset__k=-1),
+                    ]
+                ),
+                AssignStmtFactory(left__name="bar", right__name="bar", right__offset__k=-1),
+            ],
+            interval__start=AxisBound.from_start(1),
+        ),
+        caches=[
+            KCacheFactory(name="foo", fill=True),
+            KCacheFactory(name="bar", fill=True),
+        ],
+    )
+    transformed = PruneKCacheFills().visit(testee)
+    cache_dict = {c.name: c for c in transformed.caches}
+    assert cache_dict["foo"].fill
+    assert cache_dict["bar"].fill
+
+
 def test_prune_k_cache_fills_backward():
     testee = VerticalLoopFactory(
         loop_order=LoopOrder.BACKWARD,
@@ -702,3 +728,34 @@ def test_fill_flush_to_local_k_caches_basic_forward():
     assert body[2].left.name == "foo", "wrong flush destination"
     assert body[2].right.name == cache_name, "wrong flush source"
     assert body[2].left.offset.k == body[2].right.offset.k == 0, "wrong flush offset"
+
+
+def test_fill_flush_to_local_k_caches_conditional_write():
+    testee = StencilFactory(
+        vertical_loops=[
+            VerticalLoopFactory(
+                loop_order=LoopOrder.FORWARD,
+                sections__0__horizontal_executions__0__body=[
+                    MaskStmtFactory(
+                        body=[
+                            AssignStmtFactory(
+                                left__name="foo", right__name="foo", right__offset__k=-1
+                            )
+                        ]
+                    ),
+                ],
+                sections__0__interval__start=AxisBound.from_start(1),
+                caches=[KCacheFactory(name="foo", fill=True, flush=True)],
+            )
+        ]
+    )
+    transformed = FillFlushToLocalKCaches().visit(testee)
+    vertical_loop = transformed.vertical_loops[0]
+    cache_name = vertical_loop.caches[0].name
+
+    assert len(vertical_loop.sections) == 2, "wrong number of vertical sections"
+    for section, fill_offsets in zip(vertical_loop.sections, ([-1, 0], [0])):
+        body = section.horizontal_executions[0].body
+        fills = [stmt for stmt in body if isinstance(stmt, AssignStmt) and stmt.right.name == "foo"]
+        assert [fill.left.name for fill in fills] == [cache_name] * len(fill_offsets)
+        assert [fill.left.offset.k for fill in fills] == fill_offsets, "wrong fill offsets"
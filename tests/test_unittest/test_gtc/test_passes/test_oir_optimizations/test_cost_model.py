@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from gtc import common, oir
+from gtc.passes.oir_optimizations.cost_model import CostModel
+
+from ...oir_utils import (
+    AssignStmtFactory,
+    FieldAccessFactory,
+    HorizontalExecutionFactory,
+    LocalScalarFactory,
+    NativeFuncCallFactory,
+)
+
+
+def test_flops():
+    expr = oir.BinaryOp(
+        op=common.ArithmeticOperator.ADD,
+        left=NativeFuncCallFactory(func=common.NativeFunction.SIN),
+        right=NativeFuncCallFactory(func=common.NativeFunction.ABS),
+    )
+    he = HorizontalExecutionFactory(body=[AssignStmtFactory(right=expr)])
+    assert CostModel().flops(he) == 1.0 + 40.0 + 1.0
+    assert CostModel(function_costs={}).flops(he) == 3.0
+
+
+def test_memory_traffic():
+    he = HorizontalExecutionFactory(
+        body=[
+            AssignStmtFactory(
+                left__name="out",
+                right=oir.BinaryOp(
+                    op=common.ArithmeticOperator.ADD,
+                    left=FieldAccessFactory(name="in", offset__i=1),
+                    right=FieldAccessFactory(name="in", offset__i=-1),
+                ),
+            ),
+            AssignStmtFactory(left__name="out", right__name="out"),
+        ]
+    )
+    cost_model = CostModel(flop_cost=0.0, byte_cost=1.0)
+    # float32 fields, every field is counted once whatever the number of offsets
+    assert cost_model.loads(he) == 8
+    assert cost_model.stores(he) == 4
+    assert cost_model.cost([he, he]) == 24
+
+
+def test_register_pressure():
+    he = HorizontalExecutionFactory(
+        body=[
+            AssignStmtFactory(left__name="out", right__name="in", right__offset__i=1),
+            AssignStmtFactory(left__name="out", right__name="in", right__offset__i=1),
+        ],
+        declarations=[LocalScalarFactory()],
+    )
+    assert CostModel().register_pressure(he) == 3
+    assert CostModel(max_registers=3).fits(he)
+    assert not CostModel(max_registers=2).fits(he)
+    assert CostModel(max_registers=None).fits(he)
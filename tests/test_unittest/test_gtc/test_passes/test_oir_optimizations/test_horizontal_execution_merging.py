@@ -15,6 +15,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from gtc import common, oir
+from gtc.passes.oir_optimizations.cost_model import CostModel
 from gtc.passes.oir_optimizations.horizontal_execution_merging import GreedyMerging, OnTheFlyMerging
 
 from ...oir_utils import (
@@ -98,6 +99,42 @@ def test_nonzero_extent_merging():
     )
 
 
+def test_different_extent_no_merging():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=[AssignStmtFactory(left__name="tmp")]),
+            HorizontalExecutionFactory(body=[AssignStmtFactory(left__name="out1")]),
+            HorizontalExecutionFactory(body=[AssignStmtFactory(left__name="out2")]),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out3", right__name="tmp", right__offset__i=1)]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    transformed = GreedyMerging().visit(testee)
+    hexecs = transformed.vertical_loops[0].sections[0].horizontal_executions
+    original_hexecs = testee.vertical_loops[0].sections[0].horizontal_executions
+    assert len(hexecs) == 2
+    assert hexecs[0].body == original_hexecs[0].body
+    assert hexecs[1].body == sum((he.body for he in original_hexecs[1:]), [])
+
+
+def test_register_limit_no_merging():
+    testee = VerticalLoopSectionFactory(
+        horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="foo", right__name="bar")]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="baz", right__name="bar")]
+            ),
+        ]
+    )
+    assert len(GreedyMerging().visit(testee).horizontal_executions) == 1
+    transformed = GreedyMerging(cost_model=CostModel(max_registers=2)).visit(testee)
+    assert transformed == testee
+
+
 def test_on_the_fly_merging_basic():
     testee = StencilFactory(
         vertical_loops__0__sections__0__horizontal_executions=[
@@ -160,12 +197,48 @@ def test_on_the_fly_merging_with_expensive_function():
         ],
         declarations=[TemporaryFactory(name="tmp")],
     )
-    transformed = OnTheFlyMerging(allow_expensive_function_duplication=False).visit(testee)
+    transformed = OnTheFlyMerging().visit(testee)
     hexecs = transformed.vertical_loops[0].sections[0].horizontal_executions
     assert len(hexecs) == 2
 
+    cheap_functions = CostModel(function_costs={})
+    transformed = OnTheFlyMerging(cost_model=cheap_functions).visit(testee)
+    hexecs = transformed.vertical_loops[0].sections[0].horizontal_executions
+    assert len(hexecs) == 1
+
+
+def test_on_the_fly_merging_without_duplication():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(
+                        left__name="tmp",
+                        right=NativeFuncCallFactory(func=common.NativeFunction.SIN),
+                    )
+                ]
+            ),
+            HorizontalExecutionFactory(body=[AssignStmtFactory(right__name="tmp")]),
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    transformed = OnTheFlyMerging().visit(testee)
+    hexecs = transformed.vertical_loops[0].sections[0].horizontal_executions
+    assert len(hexecs) == 1
+
+
+def test_on_the_fly_merging_api_field():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=[AssignStmtFactory(left__name="out")]),
+            HorizontalExecutionFactory(body=[AssignStmtFactory(right__name="out")]),
+        ],
+    )
+    transformed = OnTheFlyMerging().visit(testee)
+    assert transformed == testee
+
 
-def test_on_the_fly_merging_body_size_limit():
+def test_on_the_fly_merging_register_limit():
     testee = StencilFactory(
         vertical_loops__0__sections__0__horizontal_executions=[
             HorizontalExecutionFactory(
@@ -180,6 +253,6 @@ def test_on_the_fly_merging_body_size_limit():
         ],
         declarations=[TemporaryFactory(name="tmp")],
     )
-    transformed = OnTheFlyMerging(max_horizontal_execution_body_size=0).visit(testee)
+    transformed = OnTheFlyMerging(cost_model=CostModel(max_registers=2)).visit(testee)
     hexecs = transformed.vertical_loops[0].sections[0].horizontal_executions
     assert len(hexecs) == 2
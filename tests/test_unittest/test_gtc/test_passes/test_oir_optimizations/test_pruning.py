@@ -14,15 +14,21 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from gtc.passes.oir_optimizations.pruning import NoFieldAccessPruning
+from gtc import common
+from gtc.passes.oir_optimizations.pruning import DeadCodeElimination, NoFieldAccessPruning
+from gtc.passes.oir_optimizations.utils import AccessCollector
 
 from ...oir_utils import (
     AssignStmtFactory,
+    FieldAccessFactory,
     HorizontalExecutionFactory,
+    IJCacheFactory,
     LiteralFactory,
     LocalScalarFactory,
+    MaskStmtFactory,
     ScalarAccessFactory,
     StencilFactory,
+    TemporaryFactory,
     VerticalLoopFactory,
 )
 
@@ -60,3 +66,111 @@ def test_no_field_access_pruning():
     transformed = NoFieldAccessPruning().visit(testee)
     assert len(transformed.vertical_loops) == 1
     assert len(transformed.vertical_loops[0].sections[0].horizontal_executions) == 1
+
+
+def test_dead_temporary_elimination():
+    testee = StencilFactory(
+        vertical_loops=[
+            VerticalLoopFactory(
+                sections__0__horizontal_executions=[
+                    HorizontalExecutionFactory(
+                        body=[
+                            AssignStmtFactory(left__name="tmp1", right__name="in"),
+                            AssignStmtFactory(left__name="out", right__name="in"),
+                        ]
+                    ),
+                ],
+                caches=[IJCacheFactory(name="tmp1")],
+            ),
+            VerticalLoopFactory(
+                sections__0__horizontal_executions=[
+                    HorizontalExecutionFactory(
+                        body=[AssignStmtFactory(left__name="tmp2", right__name="tmp1")]
+                    ),
+                ]
+            ),
+        ],
+        declarations=[
+            TemporaryFactory(name="tmp1"),
+            TemporaryFactory(name="tmp2"),
+            TemporaryFactory(name="unused"),
+        ],
+    )
+    transformed = DeadCodeElimination().visit(testee)
+    accesses = AccessCollector.apply(transformed)
+    assert accesses.fields() == {"in", "out"}
+    assert accesses.write_fields() == {"out"}
+    assert not transformed.declarations
+    assert len(transformed.vertical_loops) == 1
+    assert not transformed.vertical_loops[0].caches
+
+
+def test_dead_local_scalar_elimination():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(
+                        left=ScalarAccessFactory(name="overwritten"), right__name="a"
+                    ),
+                    AssignStmtFactory(left=ScalarAccessFactory(name="unread"), right__name="b"),
+                    AssignStmtFactory(
+                        left=ScalarAccessFactory(name="overwritten"), right__name="c"
+                    ),
+                    AssignStmtFactory(
+                        left__name="out", right=ScalarAccessFactory(name="overwritten")
+                    ),
+                ],
+                declarations=[
+                    LocalScalarFactory(name="overwritten"),
+                    LocalScalarFactory(name="unread"),
+                ],
+            )
+        ]
+    )
+    transformed = DeadCodeElimination().visit(testee)
+    horizontal_execution = transformed.vertical_loops[0].sections[0].horizontal_executions[0]
+    assert AccessCollector.apply(transformed).read_fields() == {"c"}
+    assert len(horizontal_execution.body) == 2
+    assert [decl.name for decl in horizontal_execution.declarations] == ["overwritten"]
+
+
+def test_conditional_assignment_stays_live():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(left=ScalarAccessFactory(name="foo"), right__name="a"),
+                    MaskStmtFactory(
+                        body=[
+                            AssignStmtFactory(left=ScalarAccessFactory(name="foo"), right__name="b")
+                        ]
+                    ),
+                    AssignStmtFactory(left__name="out", right=ScalarAccessFactory(name="foo")),
+                ],
+                declarations=[LocalScalarFactory(name="foo")],
+            )
+        ]
+    )
+    transformed = DeadCodeElimination().visit(testee)
+    assert transformed == testee
+
+
+def test_empty_mask_elimination():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[
+                    MaskStmtFactory(
+                        mask=FieldAccessFactory(name="mask", dtype=common.DataType.BOOL),
+                        body=[AssignStmtFactory(left__name="tmp", right__name="in")],
+                    ),
+                    AssignStmtFactory(left__name="out", right__name="in"),
+                ]
+            )
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    transformed = DeadCodeElimination().visit(testee)
+    assert AccessCollector.apply(transformed).fields() == {"in", "out"}
+    assert len(transformed.vertical_loops[0].sections[0].horizontal_executions[0].body) == 1
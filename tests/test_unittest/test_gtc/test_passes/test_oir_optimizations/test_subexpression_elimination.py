@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from gtc import common, oir
+from gtc.passes.oir_optimizations.subexpression_elimination import CommonSubexpressionElimination
+
+from ...common_utils import HorizontalIntervalFactory
+from ...oir_utils import (
+    AssignStmtFactory,
+    FieldAccessFactory,
+    HorizontalExecutionFactory,
+    LiteralFactory,
+    MaskStmtFactory,
+    StencilFactory,
+)
+
+
+def add(left: oir.Expr, right: oir.Expr) -> oir.BinaryOp:
+    return oir.BinaryOp(op=common.ArithmeticOperator.ADD, left=left, right=right)
+
+
+def horizontal_execution(body) -> oir.HorizontalExecution:
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=body)
+        ]
+    )
+    transformed = CommonSubexpressionElimination().visit(testee)
+    return transformed.vertical_loops[0].sections[0].horizontal_executions[0]
+
+
+def test_across_statements():
+    expr = add(FieldAccessFactory(name="a", offset__i=1), FieldAccessFactory(name="b"))
+    he = horizontal_execution(
+        [
+            AssignStmtFactory(left__name="c", right=add(expr, LiteralFactory())),
+            AssignStmtFactory(left__name="d", right=expr),
+        ]
+    )
+    assert len(he.declarations) == 1
+    cse = oir.ScalarAccess(name=he.declarations[0].name, dtype=expr.dtype)
+    assert he.body[0] == oir.AssignStmt(left=cse, right=expr)
+    assert he.body[1].right == add(cse, LiteralFactory())
+    assert he.body[2].right == cse
+
+
+def test_within_statement():
+    expr = add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b"))
+    he = horizontal_execution([AssignStmtFactory(left__name="c", right=add(expr, expr))])
+    cse = oir.ScalarAccess(name=he.declarations[0].name, dtype=expr.dtype)
+    assert he.body[1].right == add(cse, cse)
+
+
+def test_largest_expression_first():
+    inner = add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b"))
+    outer = add(inner, FieldAccessFactory(name="c"))
+    he = horizontal_execution(
+        [
+            AssignStmtFactory(left__name="d", right=outer),
+            AssignStmtFactory(left__name="e", right=outer),
+        ]
+    )
+    assert len(he.declarations) == 1
+    assert he.body[0].right == outer
+
+
+def test_different_offsets():
+    he = horizontal_execution(
+        [
+            AssignStmtFactory(
+                left__name="c",
+                right=add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b")),
+            ),
+            AssignStmtFactory(
+                left__name="d",
+                right=add(FieldAccessFactory(name="a", offset__j=1), FieldAccessFactory(name="b")),
+            ),
+        ]
+    )
+    assert not he.declarations
+    assert len(he.body) == 2
+
+
+def test_intermediate_write():
+    expr = add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b"))
+    he = horizontal_execution(
+        [
+            AssignStmtFactory(left__name="c", right=expr),
+            MaskStmtFactory(body=[AssignStmtFactory(left__name="a", right__name="d")]),
+            AssignStmtFactory(left__name="e", right=expr),
+        ]
+    )
+    assert not he.declarations
+
+
+def test_mask_and_body():
+    expr = add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b"))
+    cond = oir.BinaryOp(op=common.ComparisonOperator.GT, left=expr, right=LiteralFactory())
+    he = horizontal_execution(
+        [
+            MaskStmtFactory(
+                mask=cond,
+                body=[
+                    AssignStmtFactory(left__name="c", right=add(expr, LiteralFactory())),
+                    AssignStmtFactory(left__name="d", right=add(expr, LiteralFactory())),
+                ],
+            ),
+        ]
+    )
+    assert len(he.declarations) == 1
+    body = he.body[0].body
+    cse = oir.ScalarAccess(name=he.declarations[0].name, dtype=expr.dtype)
+    assert body[0] == oir.AssignStmt(left=cse, right=add(expr, LiteralFactory()))
+    assert body[1].right == cse and body[2].right == cse
+
+
+def test_conditional_branches_and_regions():
+    expr = add(FieldAccessFactory(name="a"), FieldAccessFactory(name="b"))
+    he = horizontal_execution(
+        [
+            AssignStmtFactory(
+                left__name="c",
+                right=oir.TernaryOp(
+                    cond=FieldAccessFactory(name="m", dtype=common.DataType.BOOL),
+                    true_expr=expr,
+                    false_expr=expr,
+                ),
+            ),
+            MaskStmtFactory(
+                mask=oir.BinaryOp(
+                    op=common.LogicalOperator.AND,
+                    left=oir.HorizontalMask(
+                        i=HorizontalIntervalFactory(), j=HorizontalIntervalFactory()
+                    ),
+                    right=FieldAccessFactory(name="m", dtype=common.DataType.BOOL),
+                ),
+            ),
+            MaskStmtFactory(
+                mask=oir.BinaryOp(
+                    op=common.LogicalOperator.AND,
+                    left=oir.HorizontalMask(
+                        i=HorizontalIntervalFactory(), j=HorizontalIntervalFactory()
+                    ),
+                    right=FieldAccessFactory(name="m", dtype=common.DataType.BOOL),
+                ),
+            ),
+        ]
+    )
+    assert not he.declarations
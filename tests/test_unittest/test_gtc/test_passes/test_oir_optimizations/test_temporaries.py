@@ -14,17 +14,23 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from gtc import oir
+from gtc import common, oir
 from gtc.passes.oir_optimizations.temporaries import (
     LocalTemporariesToScalars,
+    TemporariesToPlanes,
     WriteBeforeReadTemporariesToScalars,
 )
 
 from ...oir_utils import (
     AssignStmtFactory,
     HorizontalExecutionFactory,
+    KCacheFactory,
+    MaskStmtFactory,
     StencilFactory,
     TemporaryFactory,
+    VariableOffsetFactory,
+    VerticalLoopFactory,
+    VerticalLoopSectionFactory,
 )
 
 
@@ -100,3 +106,122 @@ def test_write_before_read_temporaries_to_scalars():
     assert not isinstance(hexec1.body[0].right, oir.ScalarAccess)
     assert isinstance(hexec1.body[1].left, oir.ScalarAccess)
     assert isinstance(hexec1.body[2].right, oir.ScalarAccess)
+
+
+def vertical_loop(*bodies, loop_order=common.LoopOrder.FORWARD, **kwargs):
+    return VerticalLoopFactory(
+        loop_order=loop_order,
+        sections__0__horizontal_executions=[HorizontalExecutionFactory(body=b) for b in bodies],
+        **kwargs,
+    )
+
+
+def test_temporaries_to_planes():
+    testee = StencilFactory(
+        vertical_loops=[
+            vertical_loop(
+                [AssignStmtFactory(left__name="tmp", right__name="in")],
+                [AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)],
+            )
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    (decl,) = TemporariesToPlanes().visit(testee).declarations
+    assert decl.dimensions == (True, True, False)
+    assert decl.k_planes is None
+
+    forward = common.LoopOrder.FORWARD
+    testee = StencilFactory(
+        vertical_loops=[
+            VerticalLoopFactory(
+                loop_order=forward,
+                sections=[
+                    VerticalLoopSectionFactory(
+                        interval__end=common.AxisBound.from_start(2),
+                        horizontal_executions__0__body=[
+                            AssignStmtFactory(left__name="tmp", right__name="in")
+                        ],
+                    ),
+                    VerticalLoopSectionFactory(
+                        interval__start=common.AxisBound.from_start(2),
+                        horizontal_executions__0__body=[
+                            AssignStmtFactory(
+                                left__name="out", right__name="tmp", right__offset__k=-2
+                            ),
+                            AssignStmtFactory(
+                                left__name="tmp", right__name="tmp", right__offset__k=-1
+                            ),
+                        ],
+                    ),
+                ],
+            )
+        ],
+        declarations=[TemporaryFactory(name="tmp")],
+    )
+    (decl,) = TemporariesToPlanes().visit(testee).declarations
+    assert decl.dimensions == (True, True, True)
+    assert decl.k_planes == 3
+
+
+def test_temporaries_to_planes_all_levels():
+    backward = common.LoopOrder.BACKWARD
+    write = AssignStmtFactory(left__name="tmp", right__name="in")
+    parallel = [
+        vertical_loop(
+            [write], [AssignStmtFactory(right__name="tmp")], loop_order=common.LoopOrder.PARALLEL
+        )
+    ]
+    read_ahead = [
+        vertical_loop(
+            [write],
+            [AssignStmtFactory(right__name="tmp", right__offset__k=-1)],
+            loop_order=backward,
+        )
+    ]
+    read_before_computed = [
+        vertical_loop([write], [AssignStmtFactory(right__name="tmp", right__offset__k=-1)])
+    ]
+    read_before_write = [
+        vertical_loop([AssignStmtFactory(right__name="tmp")], [write]),
+    ]
+    masked_write = [
+        vertical_loop([MaskStmtFactory(body=[write])], [AssignStmtFactory(right__name="tmp")])
+    ]
+    several_loops = [
+        vertical_loop([write]),
+        vertical_loop([AssignStmtFactory(right__name="tmp")]),
+    ]
+    variable_offset = [
+        vertical_loop(
+            [write],
+            [
+                AssignStmtFactory(
+                    right__name="tmp",
+                    right__offset=VariableOffsetFactory(
+                        k__name="idx", k__dtype=common.DataType.INT32
+                    ),
+                )
+            ],
+        )
+    ]
+    cached = [
+        vertical_loop(
+            [write],
+            [AssignStmtFactory(right__name="tmp")],
+            caches=[KCacheFactory(name="tmp", fill=False, flush=False)],
+        )
+    ]
+    for vertical_loops in (
+        parallel,
+        read_ahead,
+        read_before_computed,
+        read_before_write,
+        masked_write,
+        several_loops,
+        variable_offset,
+        cached,
+    ):
+        testee = StencilFactory(
+            vertical_loops=vertical_loops, declarations=[TemporaryFactory(name="tmp")]
+        )
+        assert TemporariesToPlanes().visit(testee) == testee
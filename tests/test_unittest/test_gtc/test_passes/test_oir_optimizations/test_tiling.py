@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from gtc import common
+from gtc.passes.oir_optimizations.cost_model import CostModel
+from gtc.passes.oir_optimizations.tiling import HorizontalTiling
+
+from ...oir_utils import (
+    AssignStmtFactory,
+    HorizontalExecutionFactory,
+    StencilFactory,
+    TemporaryFactory,
+)
+
+
+def stencil(*bodies, declarations=("tmp",)):
+    return StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(body=body) for body in bodies
+        ],
+        declarations=[TemporaryFactory(name=name) for name in declarations],
+    )
+
+
+def test_tiling():
+    testee = stencil(
+        [AssignStmtFactory(left__name="tmp", right__name="in")],
+        [AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)],
+        [AssignStmtFactory(left__name="out2", right__name="tmp", right__offset__j=-2)],
+    )
+    tiling = HorizontalTiling().visit(testee).vertical_loops[0].tiling
+    assert tiling is not None
+    assert tiling.halo == common.IJExtent(i=(0, 1), j=(-2, 0))
+
+
+def test_no_tiling():
+    single = stencil([AssignStmtFactory(left__name="out", right__name="in", right__offset__i=1)])
+    no_shared_fields = stencil(
+        [AssignStmtFactory(left__name="out", right__name="in")],
+        [AssignStmtFactory(left__name="out2", right__name="in2")],
+    )
+    api_field_read_at_offset = stencil(
+        [AssignStmtFactory(left__name="mid", right__name="in")],
+        [AssignStmtFactory(left__name="out", right__name="mid", right__offset__i=1)],
+    )
+    temporary_written_twice = stencil(
+        [AssignStmtFactory(left__name="tmp", right__name="in")],
+        [AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)],
+        [AssignStmtFactory(left__name="tmp", right__name="out")],
+    )
+    temporary_read_before_write = stencil(
+        [AssignStmtFactory(left__name="out", right__name="tmp")],
+        [AssignStmtFactory(left__name="tmp", right__name="out")],
+    )
+    sequential = stencil(
+        [AssignStmtFactory(left__name="tmp", right__name="in")],
+        [AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)],
+    )
+    sequential.vertical_loops[0].loop_order = common.LoopOrder.FORWARD
+    for testee in (
+        single,
+        no_shared_fields,
+        api_field_read_at_offset,
+        temporary_written_twice,
+        temporary_read_before_write,
+        sequential,
+    ):
+        assert HorizontalTiling().visit(testee).vertical_loops[0].tiling is None
+
+
+def test_tile_size():
+    testee = stencil(
+        [AssignStmtFactory(left__name="tmp", right__name="in")],
+        [AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1)],
+    )
+    # 3 float32 fields over 4 levels: 48 bytes per column, 64 + 1 columns along I
+    tiling = (
+        HorizontalTiling(cost_model=CostModel(cache_size=48 * 64 * 65), levels=4)
+        .visit(testee)
+        .vertical_loops[0]
+        .tiling
+    )
+    assert tiling.tile_size == (64, 64)
+    tiling = HorizontalTiling(cost_model=CostModel(cache_size=48), levels=4, min_tile_size=16)
+    assert tiling.visit(testee).vertical_loops[0].tiling.tile_size == (16, 16)
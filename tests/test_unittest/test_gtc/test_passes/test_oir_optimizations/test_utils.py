@@ -14,8 +14,9 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from gt4py.definitions import Extent
 from gtc.common import DataType
-from gtc.passes.oir_optimizations.utils import Access, AccessCollector
+from gtc.passes.oir_optimizations.utils import Access, AccessCollector, compute_extents
 
 from ...oir_utils import (
     AssignStmtFactory,
@@ -81,3 +82,35 @@ def test_access_collector():
     assert result.write_offsets() == write_offsets
     assert result.offsets() == offsets
     assert result.ordered_accesses() == ordered_accesses
+
+
+def test_compute_extents():
+    testee = StencilFactory(
+        vertical_loops__0__sections__0__horizontal_executions=[
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="tmp", right__name="in")]
+            ),
+            HorizontalExecutionFactory(
+                body=[
+                    AssignStmtFactory(left__name="tmp2", right__name="tmp", right__offset__i=1),
+                    AssignStmtFactory(left__name="out1", right__name="in", right__offset__j=-1),
+                ]
+            ),
+            HorizontalExecutionFactory(
+                body=[AssignStmtFactory(left__name="out2", right__name="tmp2", right__offset__j=2)]
+            ),
+        ],
+        declarations=[TemporaryFactory(name="tmp"), TemporaryFactory(name="tmp2")],
+    )
+    field_extents, block_extents = compute_extents(testee)
+    horizontal_executions = testee.vertical_loops[0].sections[0].horizontal_executions
+
+    assert [block_extents[id(he)] for he in horizontal_executions] == [
+        Extent((0, 1), (0, 2)),
+        Extent((0, 0), (0, 2)),
+        Extent.zeros(ndims=2),
+    ]
+    assert field_extents["out2"] == Extent.zeros(ndims=2)
+    assert field_extents["tmp2"] == Extent((0, 0), (0, 2))
+    assert field_extents["tmp"] == Extent((0, 1), (0, 2))
+    assert field_extents["in"] == Extent((0, 1), (-1, 2))
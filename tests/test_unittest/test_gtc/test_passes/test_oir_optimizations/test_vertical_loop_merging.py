@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# GTC Toolchain - GT4Py Project - GridTools Framework
+#
+# Copyright (c) 2014-2021, ETH Zurich
+# All rights reserved.
+#
+# This file is part of the GT4Py project and the GridTools framework.
+# GT4Py is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or any later
+# version. See the LICENSE.txt file at the top-level directory of this
+# distribution for a copy of the license or check <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from gtc import common, oir
+from gtc.passes.oir_optimizations.vertical_loop_merging import (
+    AdjacentLoopMerging,
+    VerticalLoopFusion,
+)
+
+from ...oir_utils import (
+    AssignStmtFactory,
+    IJCacheFactory,
+    IntervalFactory,
+    KCacheFactory,
+    StencilFactory,
+    VerticalLoopFactory,
+)
+
+
+def loop(*stmts, loop_order=common.LoopOrder.PARALLEL, **kwargs):
+    return VerticalLoopFactory(
+        loop_order=loop_order, sections__0__horizontal_executions__0__body=list(stmts), **kwargs
+    )
+
+
+def test_adjacent_loop_merging_caches():
+    testee = StencilFactory(
+        vertical_loops=[
+            loop(
+                AssignStmtFactory(left__name="tmp", right__name="in"),
+                sections__0__interval__end=common.AxisBound.from_start(1),
+                caches=[KCacheFactory(name="tmp", fill=False, flush=False)],
+            ),
+            loop(
+                AssignStmtFactory(left__name="tmp", right__name="in"),
+                sections__0__interval__start=common.AxisBound.from_start(1),
+                caches=[KCacheFactory(name="tmp", fill=True, flush=False)],
+            ),
+        ]
+    )
+    transformed = AdjacentLoopMerging().visit(testee)
+    assert len(transformed.vertical_loops) == 1
+    assert transformed.vertical_loops[0].caches == [
+        KCacheFactory(name="tmp", fill=True, flush=False)
+    ]
+
+
+def test_parallel_into_sequential():
+    forward = common.LoopOrder.FORWARD
+    testee = StencilFactory(
+        vertical_loops=[
+            loop(AssignStmtFactory(left__name="tmp", right__name="in")),
+            loop(
+                AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=-1),
+                loop_order=forward,
+                sections__0__interval__start=common.AxisBound.from_start(1),
+            ),
+        ]
+    )
+    transformed = VerticalLoopFusion().visit(testee)
+    assert len(transformed.vertical_loops) == 1
+    fused = transformed.vertical_loops[0]
+    assert fused.loop_order == forward
+    assert [section.interval for section in fused.sections] == [
+        IntervalFactory(end=common.AxisBound.from_start(1)),
+        IntervalFactory(start=common.AxisBound.from_start(1)),
+    ]
+    assert [len(section.horizontal_executions) for section in fused.sections] == [1, 2]
+    # Horizontal executions of split sections are distinct nodes
+    first, second = (section.horizontal_executions[0] for section in fused.sections)
+    assert first == second and first is not second
+
+    backward = StencilFactory(
+        vertical_loops=[
+            testee.vertical_loops[0],
+            loop(
+                AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=1),
+                loop_order=common.LoopOrder.BACKWARD,
+                sections__0__interval__end=common.AxisBound.from_end(-1),
+            ),
+        ]
+    )
+    (fused,) = VerticalLoopFusion().visit(backward).vertical_loops
+    assert [section.interval for section in fused.sections] == [
+        IntervalFactory(start=common.AxisBound.from_end(-1)),
+        IntervalFactory(end=common.AxisBound.from_end(-1)),
+    ]
+
+
+def test_no_fusion():
+    forward = common.LoopOrder.FORWARD
+    read_not_computed = [
+        loop(AssignStmtFactory(left__name="tmp", right__name="in")),
+        loop(
+            AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=1),
+            loop_order=forward,
+        ),
+    ]
+    overwritten_before_read = [
+        loop(AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=-1)),
+        loop(AssignStmtFactory(left__name="tmp", right__name="in"), loop_order=forward),
+    ]
+    parallel_offset_read = [
+        loop(
+            AssignStmtFactory(left__name="tmp", right__name="in"),
+            AssignStmtFactory(left__name="out", right__name="tmp", right__offset__k=1),
+        ),
+        loop(AssignStmtFactory(left__name="out2", right__name="in"), loop_order=forward),
+    ]
+    opposite_orders = [
+        loop(AssignStmtFactory(left__name="out", right__name="in"), loop_order=forward),
+        loop(
+            AssignStmtFactory(left__name="out2", right__name="in"),
+            loop_order=common.LoopOrder.BACKWARD,
+        ),
+    ]
+    disjoint_intervals = [
+        loop(
+            AssignStmtFactory(left__name="out", right__name="in"),
+            sections__0__interval__end=common.AxisBound.from_start(1),
+        ),
+        loop(
+            AssignStmtFactory(left__name="out2", right__name="in"),
+            sections__0__interval__start=common.AxisBound.from_start(2),
+        ),
+    ]
+    conflicting_caches = [
+        loop(
+            AssignStmtFactory(left__name="out", right__name="in"),
+            caches=[IJCacheFactory(name="in")],
+        ),
+        loop(
+            AssignStmtFactory(left__name="out2", right__name="in"),
+            caches=[KCacheFactory(name="in", fill=True, flush=False)],
+        ),
+    ]
+    dependent_columns = [
+        loop(AssignStmtFactory(left__name="tmp", right__name="in")),
+        loop(
+            AssignStmtFactory(left__name="out", right__name="tmp", right__offset__i=1),
+            loop_order=forward,
+        ),
+    ]
+    for vertical_loops in (
+        read_not_computed,
+        overwritten_before_read,
+        parallel_offset_read,
+        opposite_orders,
+        disjoint_intervals,
+        conflicting_caches,
+        dependent_columns,
+    ):
+        testee = StencilFactory(vertical_loops=vertical_loops)
+        assert VerticalLoopFusion().visit(testee) == testee
+
+
+def test_non_adjacent_fusion():
+    forward = common.LoopOrder.FORWARD
+    first = loop(AssignStmtFactory(left__name="tmp", right__name="in"), loop_order=forward)
+    independent = loop(
+        AssignStmtFactory(left__name="out2", right__name="in", right__offset__k=1),
+        loop_order=common.LoopOrder.BACKWARD,
+    )
+    last = loop(AssignStmtFactory(left__name="out", right__name="tmp"), loop_order=forward)
+    transformed = VerticalLoopFusion().visit(
+        StencilFactory(vertical_loops=[first, independent, last])
+    )
+    assert len(transformed.vertical_loops) == 2
+    assert len(transformed.vertical_loops[0].sections[0].horizontal_executions) == 2
+    assert transformed.vertical_loops[1] == independent
+
+    dependent = loop(
+        AssignStmtFactory(left__name="tmp", right__name="in", right__offset__k=1),
+        loop_order=common.LoopOrder.BACKWARD,
+    )
+    testee = StencilFactory(vertical_loops=[first, dependent, last])
+    assert len(VerticalLoopFusion().visit(testee).vertical_loops) == 3
+
+
+def test_cache_merging():
+    testee = StencilFactory(
+        vertical_loops=[
+            loop(
+                AssignStmtFactory(left__name="out", right__name="in"),
+                caches=[KCacheFactory(name="in", fill=True, flush=False)],
+            ),
+            loop(
+                AssignStmtFactory(left__name="out2", right__name="in"),
+                caches=[
+                    KCacheFactory(name="in", fill=False, flush=True),
+                    IJCacheFactory(name="out2"),
+                ],
+            ),
+        ]
+    )
+    (fused,) = VerticalLoopFusion().visit(testee).vertical_loops
+    assert fused.caches == [
+        oir.KCache(name="in", fill=True, flush=True),
+        oir.IJCache(name="out2"),
+    ]
@@ -124,3 +124,25 @@ def test_regression_run_analysis_twice(tmp_path):
     ir = builder.implementation_ir
     # this raises an error if the analysis pipeline is reevaluated:
     assert ir is builder.implementation_ir
+
+
+def test_build_info_passes(tmp_path):
+    build_info = {}
+    builder = (
+        StencilBuilder(simple_stencil)
+        .with_backend("gtc:numpy")
+        .with_externals({"a": 1.0})
+        .with_caching("nocaching", output_path=tmp_path)
+        .with_options(name="simple_stencil", module="", build_info=build_info)
+    )
+
+    builder.generate_computation()
+    names = [record.name for record in build_info["passes"]]
+    assert "fold_constants" in names
+    assert "GreedyMerging" in names
+    assert all(record.peak_memory is None for record in build_info["passes"])
+
+    # Memory is only traced on request
+    build_info = {"trace_memory": True}
+    builder.with_changed_options(build_info=build_info).generate_computation()
+    assert all(record.peak_memory > 0 for record in build_info["passes"])
@@ -632,6 +632,53 @@ def test_transpose(backend="gtmc"):
     assert not transposed.is_stencil_view
 
 
+@pytest.mark.parametrize(
+    ["shape", "dst_axes", "src_axes"],
+    [
+        ((5, 7, 9), (0, 1, 2), (0, 1, 2)),
+        ((130, 70, 9), (2, 1, 0), (0, 1, 2)),
+        ((70, 3, 130), (1, 2, 0), (2, 0, 1)),
+        ((3, 200), (1, 0), (0, 1)),
+    ],
+)
+def test_blocked_copy(shape, dst_axes, src_axes):
+    src = np.random.randn(*(shape[axis] for axis in src_axes)).transpose(np.argsort(src_axes))
+    dst = np.empty([shape[axis] for axis in dst_axes]).transpose(np.argsort(dst_axes))
+    assert src.shape == dst.shape == shape
+    gt_storage_utils.blocked_copy(dst, src, block_edge=16, block_bytes=16 * 16 * 8 * 4)
+    np.testing.assert_equal(dst, src)
+
+    with pytest.raises(ValueError):
+        gt_storage_utils.blocked_copy(dst, src[1:])
+
+
+@pytest.mark.parametrize(
+    ["backend", "other_backend"],
+    [("gtc:gt:cpu_kfirst", "gtc:gt:cpu_ifirst"), ("gtc:gt:cpu_ifirst", "gtc:numpy")],
+)
+def test_to_backend(backend, other_backend):
+    array = np.random.randn(20, 30, 10)
+    stor = gt_store.from_array(array, default_origin=(3, 3, 0), backend=backend, dtype=np.float64)
+
+    res = stor.to_backend(other_backend)
+    assert res.backend == other_backend
+    assert res.default_origin == stor.default_origin
+    assert gt_backend.from_name(other_backend).storage_info["is_compatible_layout"](res)
+    assert res.is_stencil_view
+    np.testing.assert_equal(np.asarray(res), array)
+
+    pooled = gt_store.zeros(
+        backend=backend, default_origin=(3, 3, 0), shape=(20, 30, 10), dtype=np.float64
+    )
+    assert res.to_backend(backend, out=pooled) is pooled
+    np.testing.assert_equal(np.asarray(pooled), array)
+
+    with pytest.raises(ValueError):
+        stor.to_backend(other_backend, out=pooled)
+    with pytest.raises(ValueError):
+        stor[1:].to_backend(backend, out=pooled)
+
+
 @pytest.mark.parametrize("backend", CPU_BACKENDS)
 @pytest.mark.parametrize(
     "method",
@@ -1012,3 +1059,244 @@ def test_auto_sync_storage():
     swap_stencil(q0, q1)
     q0.device_to_host()
     assert not gt_store.storage.GPUStorage.get_modified_storages()
+
+
+def test_halo_slices():
+    shape = (10, 8, 5)
+    halo = (2, 3)
+    assert gt_store.halo_slices(shape, halo, 0) == (slice(0, 2), slice(3, 5), slice(0, 5))
+    assert gt_store.halo_slices(shape, halo, 0, upper=True, interior=True) == (
+        slice(6, 8),
+        slice(3, 5),
+        slice(0, 5),
+    )
+    assert gt_store.halo_slices(shape, halo, 1, upper=True, corners=True) == (
+        slice(0, 10),
+        slice(5, 8),
+        slice(0, 5),
+    )
+    with pytest.raises(ValueError):
+        gt_store.halo_slices(shape, (6, 0, 0), 0)
+    with pytest.raises(ValueError):
+        gt_store.halo_slices(shape, halo, 3)
+
+
+@pytest.mark.parametrize("backend", CPU_BACKENDS)
+def test_halo_packer_loopback(backend):
+    shape = (12, 10, 4)
+    halo = (3, 3, 0)
+    fields = [
+        gt_store.from_array(
+            np.random.randn(*shape), backend=backend, default_origin=halo, dtype=np.float64
+        )
+        for _ in range(3)
+    ]
+    expected = [np.asarray(field).copy() for field in fields]
+
+    # Periodic exchange along I: the upper interior is received in the lower halo and viceversa
+    send_regions = [
+        gt_store.halo_slices(shape, halo, 0, upper=True, interior=True),
+        gt_store.halo_slices(shape, halo, 0, upper=False, interior=True),
+    ]
+    recv_regions = [
+        gt_store.halo_slices(shape, halo, 0, upper=False),
+        gt_store.halo_slices(shape, halo, 0, upper=True),
+    ]
+    sender = gt_store.HaloPacker(fields, send_regions)
+    receiver = gt_store.HaloPacker(fields, recv_regions)
+    assert sender.size == receiver.size == 3 * 2 * 3 * 4 * 4
+    assert sender.nbytes == sender.size * 8
+
+    send_buffer = sender.pack()
+    assert send_buffer is sender.buffer
+    np.testing.assert_equal(
+        np.sort(sender.region_buffer(0)[: 3 * 4 * 4]),
+        np.sort(expected[0][6:9, 3:7, :], axis=None),
+    )
+
+    # Loopback "communication"
+    recv_buffer = receiver.empty_buffer()
+    recv_buffer[...] = send_buffer
+    receiver.unpack(recv_buffer)
+
+    for field, ref in zip(fields, expected):
+        ref[0:3, 3:7, :] = ref[6:9, 3:7, :]
+        ref[9:12, 3:7, :] = ref[3:6, 3:7, :]
+        np.testing.assert_equal(np.asarray(field), ref)
+
+
+def test_halo_packer_asserts():
+    field = gt_store.zeros(
+        backend="numpy", default_origin=(1, 1, 0), shape=(4, 4, 2), dtype=np.float64
+    )
+    field_32 = gt_store.zeros(
+        backend="numpy", default_origin=(1, 1, 0), shape=(4, 4, 2), dtype=np.float32
+    )
+    region = gt_store.halo_slices(field.shape, (1, 1), 0)
+    with pytest.raises(ValueError):
+        gt_store.HaloPacker([], [region])
+    with pytest.raises(TypeError):
+        gt_store.HaloPacker([field, field_32], [region])
+    packer = gt_store.HaloPacker([field, field_32], [region], dtype=np.float64)
+    with pytest.raises(ValueError):
+        packer.pack(np.empty(packer.size + 1))
+    with pytest.raises(TypeError):
+        packer.pack(np.empty(packer.size, dtype=np.float32))
+    with pytest.raises(ValueError):
+        gt_store.HaloPacker([field], [([0, 1], slice(None), slice(None))])
+
+
+def test_halo_packer_empty_region():
+    field = gt_store.from_array(
+        np.random.randn(4, 4, 2), backend="numpy", default_origin=(1, 1, 0), dtype=np.float64
+    )
+    expected = np.asarray(field).copy()
+    # No halo along K: the K region has zero width
+    regions = [gt_store.halo_slices(field.shape, (1, 1, 0), axis) for axis in range(3)]
+    packer = gt_store.HaloPacker([field], regions)
+    assert packer.size == 2 * 2 * 2
+    assert packer.region_buffer(2).size == 0
+    packer.unpack(packer.pack())
+    np.testing.assert_equal(np.asarray(field), expected)
+
+
+@pytest.fixture
+def storage_tracking():
+    from gt4py.storage import tracking
+
+    was_enabled = tracking.is_enabled()
+    tracking.clear()
+    tracking.enable()
+    yield tracking
+    if not was_enabled:
+        tracking.disable()
+    tracking.clear()
+
+
+def _allocate_tracked_storage(backend, shape):
+    return gt_store.zeros(backend=backend, default_origin=(1, 1, 1), shape=shape, dtype=np.float64)
+
+
+@pytest.mark.parametrize("backend", CPU_BACKENDS)
+def test_storage_tracking(storage_tracking, backend):
+    import gc
+
+    shape = (5, 7, 3)
+    stor = _allocate_tracked_storage(backend, shape)
+    (record,) = storage_tracking.live_storages()
+    assert record.backend == backend
+    assert record.shape == shape
+    assert record.nbytes == np.prod(shape) * 8
+    assert record.nbytes <= record.padded_nbytes <= record.allocated_nbytes
+    assert record.padding_nbytes == record.allocated_nbytes - record.nbytes
+    assert record.module == __name__
+    assert record.function == "_allocate_tracked_storage"
+    assert record.traceback[-1].name == "_allocate_tracked_storage"
+
+    copy = stor.copy()
+    assert [r.function for r in storage_tracking.live_storages()] == [
+        "_allocate_tracked_storage",
+        "test_storage_tracking",
+    ]
+    del copy
+    gc.collect()
+    assert len(storage_tracking.live_storages()) == 1
+
+    # views keep the memory alive
+    view = stor[1:, :, 1]
+    del stor
+    gc.collect()
+    assert len(storage_tracking.live_storages()) == 1
+    del view
+    gc.collect()
+    assert not storage_tracking.live_storages()
+
+    storage_tracking.disable()
+    _allocate_tracked_storage(backend, shape)
+    assert not storage_tracking.live_storages()
+
+
+def test_storage_tracking_summaries(storage_tracking):
+    import io
+
+    storages = [
+        _allocate_tracked_storage("numpy", (5, 7, 3)),
+        _allocate_tracked_storage("gtc:numpy", (5, 7, 3)),
+        gt_store.ones(backend="numpy", default_origin=(0, 0, 0), shape=(4, 4, 4), dtype=np.int32),
+    ]
+
+    by_function = storage_tracking.memory_summary(group_by="function")
+    assert by_function["_allocate_tracked_storage"]["count"] == 2
+    assert by_function["test_storage_tracking_summaries"]["count"] == 1
+    assert sum(group["nbytes"] for group in by_function.values()) == sum(
+        stor.nbytes for stor in storages
+    )
+    by_backend = storage_tracking.memory_summary(group_by="backend")
+    assert by_backend["numpy"]["count"] == 2
+    with pytest.raises(ValueError):
+        storage_tracking.memory_summary(group_by="stencil_name")
+
+    padding = storage_tracking.padding_summary()
+    assert set(padding) == {"numpy", "gtc:numpy"}
+    for backend, group in padding.items():
+        records = storage_tracking.live_storages(backend=backend)
+        assert group["padding_nbytes"] == sum(r.padding_nbytes for r in records)
+        assert group["padded_nbytes"] >= group["nbytes"]
+
+    report = io.StringIO()
+    storage_tracking.dump(group_by="module", file=report, tracebacks=True)
+    assert __name__ in report.getvalue()
+    assert "gtc:numpy" in report.getvalue()
+    assert "_allocate_tracked_storage" in report.getvalue()
+
+
+@pytest.mark.parametrize("shape", [(), (13,), (3, 5), (7, 4, 6), (2, 9, 3, 2)])
+@pytest.mark.parametrize("num_threads", [1, 4, 8, 100])
+def test_first_touch_regions(shape, num_threads):
+    regions = gt_storage_utils.first_touch_regions(shape, num_threads)
+    assert len(regions) == num_threads
+    touched = np.zeros(shape, dtype=np.int32)
+    previous_stop = 0
+    for thread_regions in regions:
+        for region in thread_regions:
+            touched[region] += 1
+        # each thread gets a contiguous chunk of the flattened I and J indices, in thread order
+        flat = touched.reshape(*shape[:2], -1).sum(axis=-1).ravel() if shape else touched.ravel()
+        assert flat[:previous_stop].all()
+        previous_stop = int(np.count_nonzero(flat))
+    assert (touched == 1).all()
+
+
+@pytest.mark.parametrize("backend", CPU_BACKENDS)
+@pytest.mark.parametrize("alloc_fun, value", [("empty", 0), ("zeros", 0), ("ones", 1)])
+def test_first_touch(monkeypatch, backend, alloc_fun, value):
+    import gt4py.config as gt_config
+
+    monkeypatch.setitem(gt_config.storage_settings, "first_touch_min_bytes", 0)
+    monkeypatch.setitem(gt_config.storage_settings, "first_touch_threads", 4)
+    touched = []
+    original_fill = gt_storage_utils.first_touch_fill
+
+    def first_touch_fill(array, value, *, num_threads):
+        touched.append(num_threads)
+        original_fill(array, value, num_threads=num_threads)
+
+    monkeypatch.setattr(gt_storage_utils, "first_touch_fill", first_touch_fill)
+
+    stor = getattr(gt_store, alloc_fun)(
+        backend=backend,
+        default_origin=(1, 2, 0),
+        shape=(9, 5, 7),
+        dtype=np.float64,
+        mask=(True, True, True),
+        first_touch=True,
+    )
+    assert touched == [4]
+    assert isinstance(stor, gt_store.Storage)
+    assert (stor.view(np.ndarray) == value).all()
+
+    touched.clear()
+    stor = getattr(gt_store, alloc_fun)(
+        backend=backend, default_origin=(1, 2, 0), shape=(9, 5, 7), dtype=np.float64
+    )
+    assert not touched